@@ -1,8 +1,13 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
+
+if TYPE_CHECKING:
+    # 동기 모드에서는 sqlalchemy.ext.asyncio를 불러오지 않습니다.
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -11,3 +16,10 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async session requested but DB_ASYNC_MODE is disabled")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,34 @@
+import hashlib
+from collections.abc import Iterable
+
+from fastapi import Response, status
+
+
+def entity_etag(entity_id: int, version: int) -> str:
+    return f'"{entity_id}-{version}"'
+
+
+def list_etag(keys: Iterable[tuple[int, int]], *extra: str) -> str:
+    """Strong ETag for a page: digest of its (id, version) pairs plus extra parts."""
+
+    digest = hashlib.sha1()
+    for entity_id, version in keys:
+        digest.update(f"{entity_id}:{version},".encode())
+    for part in extra:
+        digest.update(part.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix is ignored."""
+
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
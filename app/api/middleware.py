@@ -0,0 +1,173 @@
+import json
+import logging
+import random
+import time
+import uuid
+from pathlib import Path
+
+import anyio
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiling import RequestProfile
+from app.core.prometheus import request_metrics
+from app.db.query_stats import RequestDBStats, begin_request, end_request, route_db_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing(stats: RequestDBStats, total_ms: float) -> str:
+    parts = [
+        f'db;dur={stats.db_ms:.2f};desc="{stats.statements} stmt"',
+        f"db-slowest;dur={stats.slowest_ms:.2f}",
+        f"db-pool;dur={stats.pool_wait_ms:.2f}",
+        f"app;dur={total_ms:.2f}",
+    ]
+    return ", ".join(parts)
+
+
+def _route_path(scope: Scope) -> str:
+    # 라우팅 후 Starlette가 scope["route"]를 채웁니다. 매칭되지 않은 경로는 하나로 묶습니다.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+def _warn_if_excessive(method: str, route: str, stats: RequestDBStats) -> None:
+    threshold = settings.db_statement_warn_threshold
+    if threshold and stats.statements > threshold:
+        logger.warning(
+            "%s %s issued %d SQL statements (threshold %d, %.1f ms); slowest: %s",
+            method,
+            route,
+            stats.statements,
+            threshold,
+            stats.db_ms,
+            (stats.slowest_statement or "")[:200],
+        )
+    repeated = stats.most_repeated()
+    repeat_threshold = settings.db_repeated_statement_warn_threshold
+    if repeated and repeat_threshold and repeated[1] >= repeat_threshold:
+        logger.warning(
+            "%s %s: possible N+1, same statement executed %d times: %s",
+            method,
+            route,
+            repeated[1],
+            repeated[0][:200],
+        )
+
+
+class DBStatsMiddleware:
+    """Attach per-request SQL count/time to `Server-Timing` and per-route histograms."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats, token = begin_request()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", server_timing(stats, total_ms).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
+            method, route = scope["method"], _route_path(scope)
+            route_db_metrics.observe(method, route, stats)
+            _warn_if_excessive(method, route, stats)
+
+
+class MetricsMiddleware:
+    """Count requests per route template and status, with latency and in-flight gauges."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        # 응답을 시작하기 전에 예외가 나면 500으로 집계합니다.
+        status = 500
+        request_metrics.started()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.finished(
+                scope["method"], _route_path(scope), status, time.perf_counter() - started
+            )
+
+
+def _write_profile(path: Path, document: dict[str, object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+
+class ProfilingMiddleware:
+    """Sample one request's stacks when `X-Profile: <token>` is sent or by sampling rate.
+
+    The profile is stored as `<PROFILING_DIR>/<id>.speedscope.json`, the id is
+    returned in `X-Profile-Id` and the file served from /internal/profiles/<id>.
+    """
+
+    # 샘플러가 모든 스레드를 훑으므로 동시에 하나의 요청만 프로파일링합니다.
+    _active = False
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _wanted(self, scope: Scope) -> bool:
+        token = settings.profiling_token
+        if token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile" and value.decode("latin-1") == token:
+                    return True
+        rate = settings.profiling_sample_rate
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or ProfilingMiddleware._active or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        ProfilingMiddleware._active = True
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with RequestProfile(settings.profiling_interval_ms / 1000) as profile:
+                await self.app(scope, receive, send_with_id)
+        finally:
+            ProfilingMiddleware._active = False
+        name = f"{scope['method']} {_route_path(scope)} ({profile.elapsed_s * 1000:.1f} ms)"
+        path = Path(settings.profiling_dir) / f"{profile_id}.speedscope.json"
+        await anyio.to_thread.run_sync(_write_profile, path, profile.speedscope(name))
+        logger.info("stored request profile %s for %s", path, name)
@@ -0,0 +1,45 @@
+import json
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 동작합니다.
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    """JSON response for pre-shaped payloads; skips response_model validation entirely."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            # Pydantic과 같은 형식(UTC는 "Z")으로 datetime을 직렬화합니다.
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def rows_payload(rows: Iterable[Sequence[Any]], schema: type[BaseModel]) -> list[dict]:
+    """Map projected rows (schema fields first, in order) to plain dicts."""
+
+    fields = tuple(schema.model_fields)
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def fast_list_response(
+    rows: Iterable[Sequence[Any]], schema: type[BaseModel], response: Response
+) -> FastJSONResponse:
+    # 반환한 Response에는 주입된 response의 헤더가 합쳐지지 않으므로 직접 옮깁니다.
+    return FastJSONResponse(rows_payload(rows, schema), headers=dict(response.headers))
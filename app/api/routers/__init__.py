@@ -1,9 +1,20 @@
 from fastapi import APIRouter
 
-from .customers import router as customers_router
-from .product_orders import router as product_orders_router
+from app.core.config import settings
+
+from .internal import router as internal_router
+from .metrics import router as metrics_router
+
+if settings.db_async_mode:
+    from .customers_async import router as customers_router
+    from .product_orders_async import router as product_orders_router
+else:
+    from .customers import router as customers_router
+    from .product_orders import router as product_orders_router
 
 ROUTERS: list[APIRouter] = [
     customers_router,
     product_orders_router,
+    internal_router,
+    metrics_router,
 ]
@@ -1,9 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_db
+from app.api.etag import entity_etag, etag_matches, list_etag, not_modified
+from app.api.responses import fast_list_response
+from app.core.config import settings
+from app.core.pagination import InvalidCursor
+from app.schemas.bulk_import import ImportReport
 from app.schemas.customer import CustomerCreate, CustomerRead, CustomerUpdate
+from app.services import bulk_import, export
 from app.services import customer as service
+from app.services.bulk_import import ImportFormat, ImportMode
+from app.services.export import ExportFormat
 
 
 router = APIRouter(prefix="/customers", tags=["customers"])
@@ -13,43 +34,105 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 def create_customer(
     customer_in: CustomerCreate, db: Session = Depends(get_db)
 ) -> CustomerRead:
-    existing = service.get_customer_by_email(db, customer_in.email)
-    if existing:
+    customer = service.create_customer(db, customer_in)
+    if customer is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already exists",
         )
-    return service.create_customer(db, customer_in)
+    return customer
+
+
+@router.post("/import", response_model=ImportReport)
+def import_customers(
+    file: UploadFile,
+    fmt: ImportFormat = Query("csv", alias="format"),
+    mode: ImportMode = "skip",
+) -> ImportReport:
+    return bulk_import.import_records("customer", file.file, fmt=fmt, mode=mode)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_customers(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> StreamingResponse:
+    statement = export.customer_export_statement(created_from, created_to)
+    return StreamingResponse(
+        export.stream_export(statement, fmt),
+        media_type=export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="customers.{fmt}"'},
+    )
 
 
 @router.get("/{customer_id}", response_model=CustomerRead)
-def read_customer(customer_id: int, db: Session = Depends(get_db)) -> CustomerRead:
+def read_customer(
+    customer_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> CustomerRead:
+    if if_none_match:
+        version = service.get_customer_version(db, customer_id)
+        if version is not None:
+            etag = entity_etag(customer_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
     customer = service.get_customer(db, customer_id)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+    response.headers["ETag"] = entity_etag(customer.id, customer.version)
     return customer
 
 
 @router.get("/", response_model=list[CustomerRead])
 def list_customers(
-    skip: int = 0, limit: int = 50, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
 ) -> list[CustomerRead]:
-    return list(service.list_customers(db, skip=skip, limit=limit))
+    if cursor is not None:
+        try:
+            after = service.decode_customer_cursor(cursor)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        customers = service.list_customers_after(db, after, limit=limit)
+    else:
+        customers = service.list_customers(db, skip=skip, limit=limit)
+    next_cursor = None
+    if customers and len(customers) == limit:
+        next_cursor = service.encode_customer_cursor(customers[-1])
+        response.headers["X-Next-Cursor"] = next_cursor
+    etag = list_etag(((row.id, row.version) for row in customers), next_cursor or "")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if settings.fast_json_responses:
+        return fast_list_response(customers, CustomerRead, response)
+    return list(customers)
 
 
 @router.put("/{customer_id}", response_model=CustomerRead)
 def update_customer(
     customer_id: int, customer_in: CustomerUpdate, db: Session = Depends(get_db)
 ) -> CustomerRead:
-    customer = service.get_customer(db, customer_id)
+    try:
+        customer = service.update_customer(db, customer_id, customer_in)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already exists",
+        )
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
-    return service.update_customer(db, customer, customer_in)
+    return customer
 
 
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_customer(customer_id: int, db: Session = Depends(get_db)) -> None:
-    customer = service.get_customer(db, customer_id)
-    if not customer:
+    if not service.delete_customer(db, customer_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
-    service.delete_customer(db, customer)
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_async_db
+from app.api.etag import entity_etag, etag_matches, list_etag, not_modified
+from app.api.responses import fast_list_response
+from app.core.config import settings
+from app.core.pagination import InvalidCursor
+from app.schemas.bulk_import import ImportReport
+from app.schemas.customer import CustomerCreate, CustomerRead, CustomerUpdate
+from app.services import bulk_import, export
+from app.services import customer_async as service
+from app.services.bulk_import import ImportFormat, ImportMode
+from app.services.export import ExportFormat
+
+
+router = APIRouter(prefix="/customers", tags=["customers"])
+
+
+@router.post("/", response_model=CustomerRead, status_code=status.HTTP_201_CREATED)
+async def create_customer(
+    customer_in: CustomerCreate, db: AsyncSession = Depends(get_async_db)
+) -> CustomerRead:
+    customer = await service.create_customer(db, customer_in)
+    if customer is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already exists",
+        )
+    return customer
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_customers(
+    file: UploadFile,
+    fmt: ImportFormat = Query("csv", alias="format"),
+    mode: ImportMode = "skip",
+) -> ImportReport:
+    return await run_in_threadpool(
+        bulk_import.import_records, "customer", file.file, fmt, mode
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_customers(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> StreamingResponse:
+    statement = export.customer_export_statement(created_from, created_to)
+    return StreamingResponse(
+        export.stream_export_async(statement, fmt),
+        media_type=export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="customers.{fmt}"'},
+    )
+
+
+@router.get("/{customer_id}", response_model=CustomerRead)
+async def read_customer(
+    customer_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> CustomerRead:
+    if if_none_match:
+        version = await service.get_customer_version(db, customer_id)
+        if version is not None:
+            etag = entity_etag(customer_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    customer = await service.get_customer(db, customer_id)
+    if not customer:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+    response.headers["ETag"] = entity_etag(customer.id, customer.version)
+    return customer
+
+
+@router.get("/", response_model=list[CustomerRead])
+async def list_customers(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[CustomerRead]:
+    if cursor is not None:
+        try:
+            after = service.decode_customer_cursor(cursor)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        customers = await service.list_customers_after(db, after, limit=limit)
+    else:
+        customers = await service.list_customers(db, skip=skip, limit=limit)
+    next_cursor = None
+    if customers and len(customers) == limit:
+        next_cursor = service.encode_customer_cursor(customers[-1])
+        response.headers["X-Next-Cursor"] = next_cursor
+    etag = list_etag(((row.id, row.version) for row in customers), next_cursor or "")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if settings.fast_json_responses:
+        return fast_list_response(customers, CustomerRead, response)
+    return list(customers)
+
+
+@router.put("/{customer_id}", response_model=CustomerRead)
+async def update_customer(
+    customer_id: int, customer_in: CustomerUpdate, db: AsyncSession = Depends(get_async_db)
+) -> CustomerRead:
+    try:
+        customer = await service.update_customer(db, customer_id, customer_in)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already exists",
+        )
+    if not customer:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+    return customer
+
+
+@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_customer(customer_id: int, db: AsyncSession = Depends(get_async_db)) -> None:
+    if not await service.delete_customer(db, customer_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
@@ -0,0 +1,84 @@
+import re
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import folded, route_profiler
+from app.db.query_stats import route_db_metrics
+from app.db.session import pool_status
+from app.services.cache import get_cache
+from app.services.embedding import embeddings_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/pool")
+def read_pool_stats() -> dict[str, dict[str, object]]:
+    return pool_status()
+
+
+@router.get("/cache")
+def read_cache_stats() -> dict[str, object]:
+    return get_cache().stats()
+
+
+@router.get("/embeddings")
+def read_embedding_cache_stats() -> dict[str, object]:
+    """Embedding cache hit rate; empty until the first embedding request in this worker."""
+
+    return embeddings_stats() or {}
+
+
+@router.get("/db")
+def read_db_stats() -> dict[str, dict[str, object]]:
+    """Per-route histograms of SQL statements, DB time and pool wait per request."""
+
+    return route_db_metrics.snapshot()
+
+
+_PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+_PROFILE_SUFFIX = ".speedscope.json"
+
+
+@router.get("/profiles")
+def list_profiles() -> list[dict[str, object]]:
+    """Stored single-request profiles, newest first (open them in speedscope.app)."""
+
+    directory = Path(settings.profiling_dir)
+    if not directory.is_dir():
+        return []
+    files = sorted(directory.glob(f"*{_PROFILE_SUFFIX}"), reverse=True)
+    return [
+        {"id": path.name.removesuffix(_PROFILE_SUFFIX), "bytes": path.stat().st_size}
+        for path in files
+    ]
+
+
+@router.get("/profiles/{profile_id}", response_class=FileResponse)
+def read_profile(profile_id: str) -> FileResponse:
+    path = Path(settings.profiling_dir) / f"{profile_id}{_PROFILE_SUFFIX}"
+    # id 형식을 검사해 경로 조작을 막습니다.
+    if not _PROFILE_ID.match(profile_id) or not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=path.name)
+
+
+@router.get("/profile/routes")
+def read_route_profile(top: int = 5) -> dict[str, dict[str, object]]:
+    """Continuous sampling: samples per route by db/orm/serialization/app and hot functions."""
+
+    return route_profiler.summary(top=top)
+
+
+@router.get("/profile/folded", response_class=PlainTextResponse)
+def read_route_profile_folded(route: str | None = None) -> str:
+    """Collapsed stacks (all routes or one `METHOD /path`) for flamegraph tools."""
+
+    return folded(route_profiler.stacks(route))
+
+
+@router.delete("/profile/routes", status_code=status.HTTP_204_NO_CONTENT)
+def reset_route_profile() -> None:
+    route_profiler.reset()
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from app.services.metrics_export import collect_threadpool, scrape
+
+router = APIRouter(tags=["internal"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics() -> PlainTextResponse:
+    # 스레드풀 지표는 이벤트 루프에서 읽고, 파일·Redis I/O가 있는 나머지는 스레드에서 모읍니다.
+    body = await run_in_threadpool(scrape, collect_threadpool())
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
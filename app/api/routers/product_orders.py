@@ -1,13 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_db
+from app.api.etag import entity_etag, etag_matches, list_etag, not_modified
+from app.api.responses import fast_list_response
+from app.core.config import settings
+from app.core.pagination import InvalidCursor
+from app.schemas.bulk_import import ImportReport
 from app.schemas.product_order import (
+    ProductOrderBulkItemResult,
+    ProductOrderBulkUpdate,
     ProductOrderCreate,
+    ProductOrderFilter,
     ProductOrderRead,
     ProductOrderUpdate,
 )
+from app.services import bulk_import, export
 from app.services import product_order as service
+from app.services.bulk_import import ImportFormat, ImportMode
+from app.services.export import ExportFormat
 
 router = APIRouter(prefix="/product-orders", tags=["product-orders"])
 
@@ -16,43 +38,149 @@ router = APIRouter(prefix="/product-orders", tags=["product-orders"])
 def create_product_order(
     order_in: ProductOrderCreate, db: Session = Depends(get_db)
 ) -> ProductOrderRead:
-    existing = service.get_order_by_number(db, order_in.order_number)
-    if existing:
+    order = service.create_order(db, order_in)
+    if order is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order number already exists",
+        )
+    return order
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} items per bulk request",
+        )
+
+
+# 벌크 라우트는 /{order_id} 보다 먼저 등록해야 "bulk"가 경로 파라미터로 잡히지 않습니다.
+@router.post("/bulk", response_model=list[ProductOrderBulkItemResult])
+def bulk_create_product_orders(
+    orders_in: list[ProductOrderCreate], db: Session = Depends(get_db)
+) -> list[ProductOrderBulkItemResult]:
+    _check_batch_size(len(orders_in))
+    return service.bulk_create_orders(db, orders_in)
+
+
+@router.patch("/bulk", response_model=list[ProductOrderBulkItemResult])
+def bulk_update_product_orders(
+    items: list[ProductOrderBulkUpdate], db: Session = Depends(get_db)
+) -> list[ProductOrderBulkItemResult]:
+    _check_batch_size(len(items))
+    if len({item.id for item in items}) != len(items):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate order ids in bulk update",
+        )
+    try:
+        return service.bulk_update_orders(db, items)
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Order number already exists",
         )
-    return service.create_order(db, order_in)
+
+
+@router.delete("/bulk", response_model=list[ProductOrderBulkItemResult])
+def bulk_delete_product_orders(
+    order_ids: list[int], db: Session = Depends(get_db)
+) -> list[ProductOrderBulkItemResult]:
+    _check_batch_size(len(order_ids))
+    return service.bulk_delete_orders(db, order_ids)
+
+
+@router.post("/import", response_model=ImportReport)
+def import_product_orders(
+    file: UploadFile,
+    fmt: ImportFormat = Query("csv", alias="format"),
+    mode: ImportMode = "skip",
+) -> ImportReport:
+    return bulk_import.import_records("product_order", file.file, fmt=fmt, mode=mode)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_product_orders(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    shipping_status: str | None = None,
+) -> StreamingResponse:
+    statement = export.order_export_statement(shipping_status=shipping_status)
+    return StreamingResponse(
+        export.stream_export(statement, fmt),
+        media_type=export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="product_orders.{fmt}"'},
+    )
 
 
 @router.get("/{order_id}", response_model=ProductOrderRead)
-def read_product_order(order_id: int, db: Session = Depends(get_db)) -> ProductOrderRead:
+def read_product_order(
+    order_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> ProductOrderRead:
+    if if_none_match:
+        version = service.get_order_version(db, order_id)
+        if version is not None:
+            etag = entity_etag(order_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
     order = service.get_order(db, order_id)
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    response.headers["ETag"] = entity_etag(order.id, order.version)
     return order
 
 
 @router.get("/", response_model=list[ProductOrderRead])
 def list_product_orders(
-    skip: int = 0, limit: int = 50, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    filters: ProductOrderFilter = Depends(),
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
 ) -> list[ProductOrderRead]:
-    return list(service.list_orders(db, skip=skip, limit=limit))
+    if cursor is not None:
+        try:
+            after = service.decode_order_cursor(cursor, filters.sort)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        orders = service.list_orders_after(db, after, limit=limit, filters=filters)
+    else:
+        orders = service.list_orders(db, skip=skip, limit=limit, filters=filters)
+    next_cursor = None
+    if orders and len(orders) == limit:
+        next_cursor = service.encode_order_cursor(orders[-1], filters.sort)
+        response.headers["X-Next-Cursor"] = next_cursor
+    etag = list_etag(((row.id, row.version) for row in orders), next_cursor or "")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if settings.fast_json_responses:
+        return fast_list_response(orders, ProductOrderRead, response)
+    return list(orders)
 
 
 @router.put("/{order_id}", response_model=ProductOrderRead)
 def update_product_order(
     order_id: int, order_in: ProductOrderUpdate, db: Session = Depends(get_db)
 ) -> ProductOrderRead:
-    order = service.get_order(db, order_id)
+    try:
+        order = service.update_order(db, order_id, order_in)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order number already exists",
+        )
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    return service.update_order(db, order, order_in)
+    return order
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_product_order(order_id: int, db: Session = Depends(get_db)) -> None:
-    order = service.get_order(db, order_id)
-    if not order:
+    if not service.delete_order(db, order_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    service.delete_order(db, order)
@@ -0,0 +1,191 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_async_db
+from app.api.etag import entity_etag, etag_matches, list_etag, not_modified
+from app.api.responses import fast_list_response
+from app.core.config import settings
+from app.core.pagination import InvalidCursor
+from app.schemas.bulk_import import ImportReport
+from app.schemas.product_order import (
+    ProductOrderBulkItemResult,
+    ProductOrderBulkUpdate,
+    ProductOrderCreate,
+    ProductOrderFilter,
+    ProductOrderRead,
+    ProductOrderUpdate,
+)
+from app.services import bulk_import, export
+from app.services import product_order_async as service
+from app.services.bulk_import import ImportFormat, ImportMode
+from app.services.export import ExportFormat
+
+router = APIRouter(prefix="/product-orders", tags=["product-orders"])
+
+
+@router.post("/", response_model=ProductOrderRead, status_code=status.HTTP_201_CREATED)
+async def create_product_order(
+    order_in: ProductOrderCreate, db: AsyncSession = Depends(get_async_db)
+) -> ProductOrderRead:
+    order = await service.create_order(db, order_in)
+    if order is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order number already exists",
+        )
+    return order
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} items per bulk request",
+        )
+
+
+# 벌크 라우트는 /{order_id} 보다 먼저 등록해야 "bulk"가 경로 파라미터로 잡히지 않습니다.
+@router.post("/bulk", response_model=list[ProductOrderBulkItemResult])
+async def bulk_create_product_orders(
+    orders_in: list[ProductOrderCreate], db: AsyncSession = Depends(get_async_db)
+) -> list[ProductOrderBulkItemResult]:
+    _check_batch_size(len(orders_in))
+    return await service.bulk_create_orders(db, orders_in)
+
+
+@router.patch("/bulk", response_model=list[ProductOrderBulkItemResult])
+async def bulk_update_product_orders(
+    items: list[ProductOrderBulkUpdate], db: AsyncSession = Depends(get_async_db)
+) -> list[ProductOrderBulkItemResult]:
+    _check_batch_size(len(items))
+    if len({item.id for item in items}) != len(items):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate order ids in bulk update",
+        )
+    try:
+        return await service.bulk_update_orders(db, items)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order number already exists",
+        )
+
+
+@router.delete("/bulk", response_model=list[ProductOrderBulkItemResult])
+async def bulk_delete_product_orders(
+    order_ids: list[int], db: AsyncSession = Depends(get_async_db)
+) -> list[ProductOrderBulkItemResult]:
+    _check_batch_size(len(order_ids))
+    return await service.bulk_delete_orders(db, order_ids)
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_product_orders(
+    file: UploadFile,
+    fmt: ImportFormat = Query("csv", alias="format"),
+    mode: ImportMode = "skip",
+) -> ImportReport:
+    return await run_in_threadpool(
+        bulk_import.import_records, "product_order", file.file, fmt, mode
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_product_orders(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    shipping_status: str | None = None,
+) -> StreamingResponse:
+    statement = export.order_export_statement(shipping_status=shipping_status)
+    return StreamingResponse(
+        export.stream_export_async(statement, fmt),
+        media_type=export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="product_orders.{fmt}"'},
+    )
+
+
+@router.get("/{order_id}", response_model=ProductOrderRead)
+async def read_product_order(
+    order_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> ProductOrderRead:
+    if if_none_match:
+        version = await service.get_order_version(db, order_id)
+        if version is not None:
+            etag = entity_etag(order_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    order = await service.get_order(db, order_id)
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    response.headers["ETag"] = entity_etag(order.id, order.version)
+    return order
+
+
+@router.get("/", response_model=list[ProductOrderRead])
+async def list_product_orders(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    filters: ProductOrderFilter = Depends(),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[ProductOrderRead]:
+    if cursor is not None:
+        try:
+            after = service.decode_order_cursor(cursor, filters.sort)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        orders = await service.list_orders_after(db, after, limit=limit, filters=filters)
+    else:
+        orders = await service.list_orders(db, skip=skip, limit=limit, filters=filters)
+    next_cursor = None
+    if orders and len(orders) == limit:
+        next_cursor = service.encode_order_cursor(orders[-1], filters.sort)
+        response.headers["X-Next-Cursor"] = next_cursor
+    etag = list_etag(((row.id, row.version) for row in orders), next_cursor or "")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if settings.fast_json_responses:
+        return fast_list_response(orders, ProductOrderRead, response)
+    return list(orders)
+
+
+@router.put("/{order_id}", response_model=ProductOrderRead)
+async def update_product_order(
+    order_id: int, order_in: ProductOrderUpdate, db: AsyncSession = Depends(get_async_db)
+) -> ProductOrderRead:
+    try:
+        order = await service.update_order(db, order_id, order_in)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order number already exists",
+        )
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    return order
+
+
+@router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_product_order(
+    order_id: int, db: AsyncSession = Depends(get_async_db)
+) -> None:
+    if not await service.delete_order(db, order_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
@@ -0,0 +1,27 @@
+"""Apply pending schema migrations once per deploy.
+
+    python -m app.cli.bootstrap            # migrate to the latest version
+    python -m app.cli.bootstrap --check    # exit 1 if the database is behind
+"""
+import argparse
+import json
+import logging
+import sys
+
+from app.db.bootstrap import SCHEMA_VERSION, current_version, migrate
+from app.db.session import engine
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only report the version")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    version = current_version(engine) if args.check else migrate(engine)
+    print(json.dumps({"version": version, "expected": SCHEMA_VERSION}))
+    return 0 if version >= SCHEMA_VERSION else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
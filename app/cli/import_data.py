@@ -0,0 +1,35 @@
+"""Bulk import CSV/NDJSON files through PostgreSQL COPY.
+
+    python -m app.cli.import_data product_order orders.csv --mode upsert
+    python -m app.cli.import_data customer customers.ndjson --format ndjson
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.services.bulk_import import IMPORT_SPECS, import_records
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("resource", choices=sorted(IMPORT_SPECS))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None)
+    parser.add_argument("--mode", choices=("skip", "upsert"), default="skip")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if args.path.suffix in (".ndjson", ".jsonl") else "csv")
+    with args.path.open("rb") as stream:
+        report = import_records(
+            args.resource,
+            stream,
+            fmt=fmt,
+            mode=args.mode,
+            progress=lambda rows: print(f"... {rows} rows read", file=sys.stderr),
+        )
+    print(report.model_dump_json(indent=2))
+    return 1 if report.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
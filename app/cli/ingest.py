@@ -0,0 +1,73 @@
+"""Stream PDF/text files into a PGVector collection, resuming from the last checkpoint.
+
+    python -m app.cli.ingest docs/ manual.pdf --collection manuals
+    python -m app.cli.ingest docs/ --collection manuals --restart
+    python -m app.cli.ingest docs/ --collection manuals --incremental
+
+A collection filled without --incremental has no chunk manifest. Migrate it
+once with --incremental --recreate, which empties it and re-ingests
+everything (unchanged texts come from the embedding cache).
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.ingestion import build_ingestor
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("--collection", required=True)
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument(
+        "--source-root",
+        type=Path,
+        default=settings.ingestion_source_root,
+        help="documents are identified by their path relative to this directory",
+    )
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="re-embed only new or changed chunks of changed files and delete removed ones",
+    )
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="empty the collection, its manifest and the checkpoint before ingesting",
+    )
+    parser.add_argument("--embed-batch-size", type=int, default=settings.ingestion_embed_batch_size)
+    parser.add_argument(
+        "--upsert-batch-size", type=int, default=settings.ingestion_upsert_batch_size
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    checkpoint = args.checkpoint or (
+        Path(settings.ingestion_checkpoint_dir) / f"{args.collection}.json"
+    )
+    if args.restart:
+        checkpoint.unlink(missing_ok=True)
+    try:
+        ingestor = build_ingestor(
+            args.collection,
+            checkpoint,
+            incremental=args.incremental,
+            recreate=args.recreate,
+            root=args.source_root,
+            embed_batch_size=args.embed_batch_size,
+            upsert_batch_size=args.upsert_batch_size,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    stats = ingestor.run(args.paths)
+    print(json.dumps(stats.as_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Refresh class catalog snapshots.
+
+    python -m app.cli.refresh_class_catalog                 # stale/outdated classes
+    python -m app.cli.refresh_class_catalog 101 102         # specific classes
+    python -m app.cli.refresh_class_catalog --fixture rows.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.db.base import Base
+from app.db.session import engine, get_session
+from app.services.class_catalog_snapshot import (
+    live_fetcher,
+    load_fixture,
+    refresh_snapshots,
+    static_fetcher,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("class_seqs", nargs="*", type=int)
+    parser.add_argument(
+        "--fixture",
+        type=Path,
+        help="JSON list of flat class rows to use instead of the yanadoo_master tables",
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="refresh every due class, not just one batch"
+    )
+    args = parser.parse_args(argv)
+
+    fetch = live_fetcher
+    class_seqs = args.class_seqs or None
+    if args.fixture is not None:
+        payloads = load_fixture(args.fixture)
+        fetch = static_fetcher(payloads)
+        # 픽스처만 지정하면 픽스처에 있는 클래스를 모두 적재합니다.
+        class_seqs = class_seqs or list(payloads)
+
+    Base.metadata.create_all(bind=engine)
+    total = {"refreshed": 0, "removed": 0}
+    with get_session() as db:
+        while True:
+            result = refresh_snapshots(db, fetch, class_seqs=class_seqs)
+            for key, value in result.items():
+                total[key] += value
+            if class_seqs is not None or not args.all or not any(result.values()):
+                break
+    print(json.dumps(total))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
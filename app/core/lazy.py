@@ -0,0 +1,19 @@
+import importlib
+from types import ModuleType
+
+
+def require(module: str, package: str | None = None) -> ModuleType:
+    """Import a heavy optional dependency at first use instead of at startup.
+
+    AI/vector libraries (langchain, openai, faiss, pypdf) cost seconds of import
+    time per worker. Services call this inside the functions that need them;
+    `benchmarks/import_time.py` fails if `import main` loads one eagerly.
+    """
+
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        requirement = package or module.split(".")[0].replace("_", "-")
+        raise ImportError(
+            f"'{module}' is required for this feature; install '{requirement}'"
+        ) from exc
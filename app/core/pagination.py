@@ -0,0 +1,48 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+
+from app.core.config import settings
+
+
+class InvalidCursor(ValueError):
+    """Raised when a page cursor is malformed, tampered with or for another resource."""
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(body: str) -> str:
+    digest = hmac.new(settings.cursor_secret.encode(), body.encode(), hashlib.sha256)
+    return _b64encode(digest.digest()[:16])
+
+
+def encode_cursor(kind: str, key: list[object]) -> str:
+    """Encode the last seen sort key of a page as an opaque, signed token."""
+
+    payload = json.dumps({"k": kind, "v": key}, separators=(",", ":"))
+    body = _b64encode(payload.encode())
+    return f"{body}.{_sign(body)}"
+
+
+def decode_cursor(token: str, kind: str) -> list[object]:
+    body, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(signature, _sign(body)):
+        raise InvalidCursor("Invalid cursor signature")
+    try:
+        payload = json.loads(_b64decode(body))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise InvalidCursor("Cursor belongs to another resource")
+    key = payload.get("v")
+    if not isinstance(key, list):
+        raise InvalidCursor("Malformed cursor")
+    return key
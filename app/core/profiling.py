@@ -0,0 +1,290 @@
+"""Stack-sampling profiler for single requests and continuous per-route hot stacks.
+
+Sync handlers, response validation and SQLAlchemy calls run in anyio worker
+threads, which cProfile (per-thread) would not see, so both modes sample
+`sys._current_frames()` from a background thread instead.
+
+* `RequestProfile` samples every busy thread while one request runs and
+  exports a speedscope file with one profile per thread. Other requests in
+  flight at the same time show up too; profile on a quiet instance when the
+  distinction matters.
+* `RouteProfiler` samples continuously at a low rate and attributes each busy
+  stack to the route whose endpoint function is on it (`<other>` for
+  middleware, serialization outside the endpoint and background tasks).
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from types import CodeType, FrameType
+
+# (함수 이름, 파일, 시작 줄)
+FrameKey = tuple[str, str, int]
+Stack = tuple[FrameKey, ...]
+
+MAX_STACK_DEPTH = 128
+# 라우트별로 보관하는 서로 다른 스택 수 상한(메모리 제한)
+MAX_STACKS_PER_ROUTE = 2000
+OTHER_ROUTE = "<other>"
+# 이 모듈들로만 이루어진 스택은 작업을 기다리는 스레드풀 워커입니다.
+_IDLE_FILES = (
+    "threading.py",
+    "queue.py",
+    "concurrent/futures/thread.py",
+    "anyio/_backends/_asyncio.py",
+)
+# 가장 안쪽의 해당 경로 프레임으로 샘플을 분류합니다(DB 드라이버 > ORM > 직렬화 > 프레임워크).
+CATEGORIES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("db", ("/psycopg/", "/psycopg2/", "/psycopg_pool/", "/asyncpg/", "/sqlite3/")),
+    ("orm", ("/sqlalchemy/",)),
+    (
+        "serialization",
+        ("/pydantic/", "/pydantic_core/", "/json/", "fastapi/encoders.py", "app/api/responses.py"),
+    ),
+    ("framework", ("/starlette/", "/fastapi/", "/anyio/", "/uvicorn/", "/asyncio/")),
+)
+# 샘플러 스레드 자신은 수집 대상에서 뺍니다.
+_sampler_threads: set[int] = set()
+
+
+def capture_stack(frame: FrameType | None) -> Stack:
+    """Root-to-leaf stack of `frame`, truncated to the innermost MAX_STACK_DEPTH frames."""
+
+    frames: list[FrameKey] = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+def is_idle(stack: Stack) -> bool:
+    if not stack:
+        return True
+    # 이벤트 루프가 select에서 다음 이벤트를 기다리는 중
+    if stack[-1][1].endswith("selectors.py") and len(stack) > 1 and stack[-2][0] == "_run_once":
+        return True
+    return all(filename.endswith(_IDLE_FILES) for _, filename, _ in stack)
+
+
+def categorize(stack: Stack) -> str:
+    """`db`, `orm`, `serialization`, `framework` or `app`, by the innermost matching frame."""
+
+    for _, filename, _ in reversed(stack):
+        for category, markers in CATEGORIES:
+            if any(marker in filename for marker in markers):
+                return category
+    return "app"
+
+
+def folded(stacks: Counter[Stack]) -> str:
+    """Brendan Gregg's collapsed format (`a;b;c count`), for flamegraph.pl / speedscope."""
+
+    lines = [
+        ";".join(f"{name} ({filename}:{line})" for name, filename, line in stack) + f" {count}"
+        for stack, count in stacks.most_common()
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(
+    profiles: dict[str, Counter[Stack]], name: str, interval_s: float
+) -> dict[str, object]:
+    """Speedscope file with one sampled profile per entry; weights are seconds."""
+
+    frame_index: dict[FrameKey, int] = {}
+    frames: list[dict[str, object]] = []
+    documents = []
+    for profile_name, stacks in profiles.items():
+        samples, weights = [], []
+        for stack, count in stacks.items():
+            indices = []
+            for key in stack:
+                index = frame_index.get(key)
+                if index is None:
+                    index = frame_index[key] = len(frames)
+                    frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                indices.append(index)
+            samples.append(indices)
+            weights.append(count * interval_s)
+        documents.append(
+            {
+                "type": "sampled",
+                "name": profile_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        )
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "app.core.profiling",
+        "shared": {"frames": frames},
+        "profiles": documents,
+    }
+
+
+class StackSampler:
+    """Background thread calling `on_sample(thread_id, frame, stack)` for every busy thread."""
+
+    def __init__(
+        self, interval_s: float, on_sample: Callable[[int, FrameType, Stack], None]
+    ) -> None:
+        self.interval_s = interval_s
+        self.on_sample = on_sample
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def sample_once(self) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in _sampler_threads:
+                continue
+            stack = capture_stack(frame)
+            if not is_idle(stack):
+                self.on_sample(thread_id, frame, stack)
+        self.samples += 1
+
+    def _run(self) -> None:
+        ident = threading.get_ident()
+        _sampler_threads.add(ident)
+        try:
+            while not self._stop.wait(self.interval_s):
+                self.sample_once()
+        finally:
+            _sampler_threads.discard(ident)
+
+
+class RequestProfile:
+    """Samples all busy threads while one request is handled."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = interval_s
+        self.threads: dict[int, Counter[Stack]] = {}
+        self._lock = threading.Lock()
+        self._sampler = StackSampler(interval_s, self._record)
+        self.started = 0.0
+        self.elapsed_s = 0.0
+
+    def _record(self, thread_id: int, _frame: FrameType, stack: Stack) -> None:
+        with self._lock:
+            self.threads.setdefault(thread_id, Counter())[stack] += 1
+
+    def __enter__(self) -> "RequestProfile":
+        self.started = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._sampler.stop()
+        self.elapsed_s = time.perf_counter() - self.started
+
+    def speedscope(self, name: str) -> dict[str, object]:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        with self._lock:
+            profiles = {
+                f"{names.get(thread_id, 'thread')} ({thread_id})": stacks
+                for thread_id, stacks in self.threads.items()
+            }
+        return to_speedscope(profiles, name, self.interval_s)
+
+
+class RouteProfiler:
+    """Continuous low-rate sampler aggregating hot stacks per route."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: dict[CodeType, str] = {}
+        self._routes: dict[str, Counter[Stack]] = {}
+        self._sampler: StackSampler | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None
+
+    def register_endpoints(self, endpoints: Iterable[tuple[Callable, str]]) -> None:
+        for endpoint, route in endpoints:
+            # functools.wraps로 감싼 경우 원래 함수의 코드 객체를 찾습니다.
+            while hasattr(endpoint, "__wrapped__"):
+                endpoint = endpoint.__wrapped__
+            code = getattr(endpoint, "__code__", None)
+            if code is not None:
+                self._endpoints[code] = route
+
+    def route_of(self, frame: FrameType | None) -> str:
+        while frame is not None:
+            route = self._endpoints.get(frame.f_code)
+            if route is not None:
+                return route
+            frame = frame.f_back
+        return OTHER_ROUTE
+
+    def _record(self, _thread_id: int, frame: FrameType, stack: Stack) -> None:
+        route = self.route_of(frame)
+        with self._lock:
+            stacks = self._routes.setdefault(route, Counter())
+            if stack in stacks or len(stacks) < MAX_STACKS_PER_ROUTE:
+                stacks[stack] += 1
+
+    def start(self, interval_s: float) -> None:
+        if self._sampler is None:
+            self._sampler = StackSampler(interval_s, self._record)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def stacks(self, route: str | None = None) -> Counter[Stack]:
+        with self._lock:
+            if route is not None:
+                return Counter(self._routes.get(route, ()))
+            merged: Counter[Stack] = Counter()
+            for stacks in self._routes.values():
+                merged.update(stacks)
+            return merged
+
+    def summary(self, top: int = 5) -> dict[str, dict[str, object]]:
+        """Samples per route split by category, with the hottest leaf functions (self time)."""
+
+        with self._lock:
+            routes = {route: Counter(stacks) for route, stacks in self._routes.items()}
+        result = {}
+        for route, stacks in sorted(routes.items()):
+            leaves: Counter[str] = Counter()
+            categories: Counter[str] = Counter()
+            for stack, count in stacks.items():
+                name, filename, line = stack[-1]
+                leaves[f"{name} ({filename}:{line})"] += count
+                categories[categorize(stack)] += count
+            result[route] = {
+                "samples": sum(stacks.values()),
+                "categories": dict(categories.most_common()),
+                "hot_functions": [
+                    {"function": function, "samples": count}
+                    for function, count in leaves.most_common(top)
+                ],
+            }
+        return result
+
+
+route_profiler = RouteProfiler()
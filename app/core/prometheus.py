@@ -0,0 +1,272 @@
+"""Prometheus text-format metrics, aggregated across worker processes.
+
+Each worker keeps its own counters and periodically writes a JSON snapshot to
+METRICS_DIR (one file per pid, replaced atomically). A scrape lands on one
+worker, which refreshes its own file and sums every live snapshot, so the
+result covers all gunicorn workers. When a worker exits, its counters and
+histograms are folded into a persisted aggregate and only its gauges are
+dropped, as in prometheus_client's multiprocess mode; cluster-wide counters
+therefore never go backwards when gunicorn recycles a worker. Without
+METRICS_DIR only the local worker is reported.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.core.metrics import Histogram
+
+# 요청 지연(초) 버킷
+LATENCY_BUCKETS_S: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+# family 이름 -> {"type", "help", "agg", "samples": {라벨 JSON: 값 또는 히스토그램 스냅샷}}
+Families = dict[str, dict[str, object]]
+
+
+class MetricFamilies:
+    """Builder for one snapshot: counters, gauges and histogram snapshots keyed by labels."""
+
+    def __init__(self) -> None:
+        self.families: Families = {}
+
+    def _family(self, name: str, kind: str, help_text: str, agg: str) -> dict:
+        family = self.families.get(name)
+        if family is None:
+            family = self.families[name] = {
+                "type": kind,
+                "help": help_text,
+                "agg": agg,
+                "samples": {},
+            }
+        return family
+
+    def add(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        value: float | dict,
+        agg: str = "sum",
+        **labels: str,
+    ) -> None:
+        key = json.dumps(labels, sort_keys=True)
+        self._family(name, kind, help_text, agg)["samples"][key] = value
+
+
+def scaled_histogram(snapshot: dict, factor: float) -> dict:
+    """Histogram snapshot with bucket bounds and sum multiplied by `factor` (e.g. ms -> s)."""
+
+    buckets = {
+        bound if bound == "+Inf" else repr(round(float(bound) * factor, 9)): count
+        for bound, count in snapshot["buckets"].items()
+    }
+    return {"count": snapshot["count"], "sum": snapshot["sum"] * factor, "buckets": buckets}
+
+
+def merge(snapshots: Iterable[Families]) -> Families:
+    merged: Families = {}
+    for families in snapshots:
+        for name, family in families.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            samples = target["samples"]
+            for key, value in family["samples"].items():
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = value
+                elif family["type"] == "histogram":
+                    buckets = dict(current["buckets"])
+                    for bound, count in value["buckets"].items():
+                        buckets[bound] = buckets.get(bound, 0) + count
+                    samples[key] = {
+                        "count": current["count"] + value["count"],
+                        "sum": current["sum"] + value["sum"],
+                        "buckets": buckets,
+                    }
+                elif family["agg"] == "max":
+                    samples[key] = max(current, value)
+                else:
+                    samples[key] = current + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str], **extra: str) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in items.items()) + "}"
+
+
+def _bound_sort_key(bound: str) -> float:
+    return float("inf") if bound == "+Inf" else float(bound)
+
+
+def render(families: Families) -> str:
+    lines: list[str] = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for key, value in sorted(family["samples"].items()):
+            labels = json.loads(key)
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(labels)} {value}")
+                continue
+            for bound in sorted(value["buckets"], key=_bound_sort_key):
+                lines.append(
+                    f"{name}_bucket{_labels(labels, le=bound)} {value['buckets'][bound]}"
+                )
+            lines.append(f"{name}_sum{_labels(labels)} {value['sum']}")
+            lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class RequestMetrics:
+    """Worker-local HTTP counters, latency histograms and in-flight gauge."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: dict[tuple[str, str, str], int] = {}
+        self._latency: dict[tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._latency.get((method, route))
+            if histogram is None:
+                histogram = self._latency[(method, route)] = Histogram(LATENCY_BUCKETS_S)
+        histogram.observe(seconds)
+
+    def collect(self, out: MetricFamilies) -> None:
+        with self._lock:
+            requests = dict(self._requests)
+            latency = dict(self._latency)
+            in_flight = self.in_flight
+        for (method, route, status), count in requests.items():
+            out.add(
+                "http_requests_total",
+                "counter",
+                "HTTP requests by route template and status.",
+                count,
+                method=method,
+                route=route,
+                status=status,
+            )
+        for (method, route), histogram in latency.items():
+            out.add(
+                "http_request_duration_seconds",
+                "histogram",
+                "HTTP request latency until the response completed.",
+                histogram.snapshot(),
+                method=method,
+                route=route,
+            )
+        out.add(
+            "http_requests_in_flight",
+            "gauge",
+            "Requests currently being handled.",
+            in_flight,
+        )
+
+
+request_metrics = RequestMetrics()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SnapshotStore:
+    """One JSON snapshot per live worker in `directory` plus the totals of exited workers."""
+
+    def __init__(self, directory: str | Path, stale_after: float) -> None:
+        self.directory = Path(directory)
+        self.stale_after = stale_after
+        self.path = self.directory / f"worker-{os.getpid()}.json"
+        self.aggregate_path = self.directory / "aggregate.json"
+        self.lock_path = self.directory / "aggregate.lock"
+
+    @contextmanager
+    def _locked(self, mode: int) -> Iterator[None]:
+        # 워커 파일을 합산본에 옮기는 동안 다른 워커가 양쪽을 모두 읽지 않게 합니다.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read(path: Path) -> Families | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _replace(self, path: Path, families: Families) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(families), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def write(self, families: Families) -> None:
+        self._replace(self.path, families)
+
+    def retire(self, path: Path | None = None) -> None:
+        """Fold a worker's counters and histograms into the aggregate and remove its file.
+
+        Gauges describe a live process and are dropped.
+        """
+
+        path = path or self.path
+        with self._locked(fcntl.LOCK_EX):
+            snapshot = self._read(path)
+            if snapshot:
+                totals = {
+                    name: family for name, family in snapshot.items() if family["type"] != "gauge"
+                }
+                aggregate = self._read(self.aggregate_path) or {}
+                self._replace(self.aggregate_path, merge([aggregate, totals]))
+            path.unlink(missing_ok=True)
+
+    def _is_dead(self, path: Path, now: float) -> bool:
+        try:
+            stale = now - path.stat().st_mtime > self.stale_after
+            pid = int(path.stem.removeprefix("worker-"))
+        except (OSError, ValueError):
+            return False
+        # 오래 멈춘(기록이 밀린) 살아 있는 워커는 합산본으로 옮기지 않습니다(이중 집계 방지).
+        return stale and not _pid_alive(pid)
+
+    def read_all(self) -> list[Families]:
+        now = time.time()
+        for path in self.directory.glob("worker-*.json"):
+            if self._is_dead(path, now):
+                self.retire(path)
+        with self._locked(fcntl.LOCK_SH):
+            paths = [*self.directory.glob("worker-*.json"), self.aggregate_path]
+            snapshots = [self._read(path) for path in paths]
+        return [snapshot for snapshot in snapshots if snapshot]
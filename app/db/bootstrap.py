@@ -0,0 +1,150 @@
+import logging
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String, Table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.db.base import Base
+from app.models import (  # noqa: F401  메타데이터 등록
+    class_catalog,
+    customer,
+    embedding_cache,
+    ingestion_manifest,
+    product_order,
+)
+
+logger = logging.getLogger(__name__)
+
+schema_version = Table(
+    "schema_version",
+    Base.metadata,
+    # 항상 id = 1인 한 행만 둡니다.
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("version", Integer, nullable=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+# 여러 워커/파드가 동시에 마이그레이션하지 않도록 잡는 pg_advisory_lock 키
+ADVISORY_LOCK_KEY = 7_250_001
+
+
+def _create_tables(conn: Connection) -> None:
+    Base.metadata.create_all(bind=conn)
+
+
+def _add_row_versions(conn: Connection) -> None:
+    # create_all은 기존 테이블에 컬럼을 추가하지 않으므로, 이전에 만든 DB를 맞춰 줍니다.
+    if conn.dialect.name != "postgresql":
+        return
+    for table in ("customer", "product_order"):
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} "
+                "ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1, "
+                "ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()"
+            )
+        )
+
+
+def _add_search_indexes(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql" and conn.scalar(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ):
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table in (customer.Customer.__table__, product_order.ProductOrder.__table__):
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _create_embedding_cache(conn: Connection) -> None:
+    embedding_cache.EmbeddingCacheEntry.__table__.create(conn, checkfirst=True)
+
+
+def _create_ingestion_manifest(conn: Connection) -> None:
+    ingestion_manifest.IngestionManifestEntry.__table__.create(conn, checkfirst=True)
+
+
+# (버전, 설명, 적용 함수). 모델을 바꾸면 끝에 항목을 추가하세요; 각 단계는 재실행해도 안전해야 합니다.
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create tables", _create_tables),
+    (2, "row version columns", _add_row_versions),
+    (3, "keyset and search indexes", _add_search_indexes),
+    (4, "embedding cache table", _create_embedding_cache),
+    (5, "ingestion manifest table", _create_ingestion_manifest),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(engine: Engine) -> int:
+    """Applied schema version from the single schema_version row; 0 if never bootstrapped."""
+
+    try:
+        with engine.connect() as conn:
+            version = conn.scalar(text("SELECT version FROM schema_version WHERE id = 1"))
+    except DBAPIError:
+        # 테이블이 없는 새 DB
+        return 0
+    return version or 0
+
+
+def migrate(engine: Engine) -> int:
+    """Apply pending migrations once, serialized across processes; returns the new version."""
+
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # 트랜잭션 단위 잠금: 커밋/롤백 시 자동으로 풀립니다.
+            conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            )
+        schema_version.create(conn, checkfirst=True)
+        # 잠금을 기다리는 동안 다른 프로세스가 이미 올렸을 수 있습니다.
+        version = conn.scalar(text("SELECT version FROM schema_version WHERE id = 1")) or 0
+        for target, description, apply in MIGRATIONS:
+            if target <= version:
+                continue
+            logger.info("applying schema migration %s: %s", target, description)
+            apply(conn)
+            version = target
+            values = {
+                "version": version,
+                "description": description,
+                "applied_at": datetime.now(timezone.utc),
+            }
+            updated = conn.execute(
+                schema_version.update().where(schema_version.c.id == 1), values
+            )
+            if updated.rowcount == 0:
+                conn.execute(schema_version.insert(), {"id": 1, **values})
+    return version
+
+
+def bootstrap_schema(engine: Engine, mode: str) -> int | None:
+    """Bring the schema up to date at startup according to DB_SCHEMA_BOOTSTRAP.
+
+    - "check": one SELECT of the version row; migrate only if it is behind.
+    - "migrate": always take the lock and apply pending migrations.
+    - "create_all": legacy behaviour, full metadata introspection on every boot.
+    - "skip": do nothing (migrations run by `python -m app.cli.bootstrap`).
+    """
+
+    if mode == "skip":
+        return None
+    if mode == "create_all":
+        Base.metadata.create_all(bind=engine)
+        return None
+    if mode == "check":
+        version = current_version(engine)
+        if version >= SCHEMA_VERSION:
+            if version > SCHEMA_VERSION:
+                logger.warning(
+                    "database schema version %s is newer than this build (%s)",
+                    version,
+                    SCHEMA_VERSION,
+                )
+            return version
+    elif mode != "migrate":
+        raise ValueError(f"Unknown schema bootstrap mode: {mode}")
+    return migrate(engine)
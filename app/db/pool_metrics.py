@@ -0,0 +1,87 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.core.metrics import Histogram
+from app.db.query_stats import record_pool_wait
+
+
+class PoolMetrics:
+    """Counters and latency histograms for one engine's connection pool."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # 풀에서 커넥션을 얻는 시간: 대기열 대기 + (여유가 있으면) 신규 연결 생성
+        self.wait_ms = Histogram()
+        # pool.connect() 전체 시간: 대기 + 신규 연결 + pre-ping
+        self.checkout_ms = Histogram()
+        self._lock = threading.Lock()
+        self._counters = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+            "timeouts": 0,
+        }
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", lambda *_: self.incr("connects"))
+        event.listen(engine, "checkout", lambda *_: self.incr("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self.incr("checkins"))
+        event.listen(engine, "invalidate", lambda *_: self.incr("invalidations"))
+
+    def snapshot(self, pool: Pool) -> dict[str, object]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            **counters,
+            "wait_ms": self.wait_ms.snapshot(),
+            "checkout_ms": self.checkout_ms.snapshot(),
+        }
+
+
+class _TimedCheckoutMixin:
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.metrics.checkout_ms.observe((time.perf_counter() - start) * 1000)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            wait_ms = (time.perf_counter() - start) * 1000
+            self.metrics.wait_ms.observe(wait_ms)
+            record_pool_wait(wait_ms)
+
+
+def instrumented_pool_class(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """Return a subclass of `base` that records checkout timings into `metrics`.
+
+    The metrics live on the class so they survive `Pool.recreate()` after
+    invalidation.
+    """
+
+    return type(
+        f"Instrumented{base.__name__}", (_TimedCheckoutMixin, base), {"metrics": metrics}
+    )
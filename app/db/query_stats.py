@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import DEFAULT_LATENCY_BUCKETS_MS, Histogram
+
+STATEMENT_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+@dataclass
+class RequestDBStats:
+    """SQL activity of one request, filled in by engine/pool event hooks."""
+
+    statements: int = 0
+    db_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: str | None = None
+    pool_wait_ms: float = 0.0
+    # 같은 SQL이 반복 실행된 횟수(N+1 탐지용)
+    repeats: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        if not self.repeats:
+            return None
+        return self.repeats.most_common(1)[0]
+
+
+# 요청마다 미들웨어가 새 객체를 넣습니다. 동기 라우트는 스레드풀로 컨텍스트가 복사되지만
+# 같은 객체를 가리키므로 그대로 누적됩니다.
+_current: ContextVar[RequestDBStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def begin_request() -> tuple[RequestDBStats, object]:
+    stats = RequestDBStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token: object) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> RequestDBStats | None:
+    return _current.get()
+
+
+def record_pool_wait(wait_ms: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_ms += wait_ms
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.db_ms += elapsed_ms
+    stats.repeats[statement] += 1
+    if elapsed_ms > stats.slowest_ms:
+        stats.slowest_ms = elapsed_ms
+        stats.slowest_statement = statement
+
+
+def _handle_error(context) -> None:
+    # 실패한 문장의 시작 시각이 스택에 남지 않도록 정리합니다.
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def attach_query_stats(engine: Engine) -> None:
+    """Count and time every statement executed on `engine` inside a tracked request."""
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class RouteDBMetrics:
+    """Per-route histograms of statement count, DB time and pool wait."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], dict[str, Histogram]] = {}
+
+    def observe(self, method: str, route: str, stats: RequestDBStats) -> None:
+        key = (method, route)
+        with self._lock:
+            histograms = self._routes.get(key)
+            if histograms is None:
+                histograms = self._routes[key] = {
+                    "statements": Histogram(STATEMENT_COUNT_BUCKETS),
+                    "db_ms": Histogram(DEFAULT_LATENCY_BUCKETS_MS),
+                    "pool_wait_ms": Histogram(DEFAULT_LATENCY_BUCKETS_MS),
+                }
+        histograms["statements"].observe(stats.statements)
+        histograms["db_ms"].observe(stats.db_ms)
+        histograms["pool_wait_ms"].observe(stats.pool_wait_ms)
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        with self._lock:
+            routes = dict(self._routes)
+        return {
+            f"{method} {route}": {name: hist.snapshot() for name, hist in histograms.items()}
+            for (method, route), histograms in sorted(routes.items())
+        }
+
+
+route_db_metrics = RouteDBMetrics()
@@ -1,11 +1,89 @@
+from typing import TYPE_CHECKING
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class
+from app.db.query_stats import attach_query_stats
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+def _engine_options(url: str) -> dict[str, object]:
+    options: dict[str, object] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if settings.db_statement_timeout_ms > 0:
+        timeout = str(settings.db_statement_timeout_ms)
+        if make_url(url).drivername.endswith("asyncpg"):
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+pool_metrics = PoolMetrics("sync")
+engine = create_engine(
+    settings.database_url,
+    echo=False,
+    future=True,
+    poolclass=instrumented_pool_class(QueuePool, pool_metrics),
+    **_engine_options(settings.database_url),
+)
+pool_metrics.attach(engine)
+attach_query_stats(engine)
+# RETURNING으로 받은 객체를 커밋 후 다시 SELECT 하지 않도록 만료시키지 않습니다.
+SessionLocal = sessionmaker(
+    bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
+)
 
-engine = create_engine(settings.database_url, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+def _async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+psycopg")
+    return url.render_as_string(hide_password=False)
+
+
+async_pool_metrics: PoolMetrics | None = None
+async_engine: "AsyncEngine | None" = None
+AsyncSessionLocal: "async_sessionmaker[AsyncSession] | None" = None
+if settings.db_async_mode:
+    # 비동기 모드에서만 불러와 동기 워커의 기동 시간을 줄입니다.
+    from sqlalchemy.ext import asyncio as sqlalchemy_asyncio
+
+    async_pool_metrics = PoolMetrics("async")
+    async_engine = sqlalchemy_asyncio.create_async_engine(
+        _async_database_url(),
+        echo=False,
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+        **_engine_options(_async_database_url()),
+    )
+    async_pool_metrics.attach(async_engine.sync_engine)
+    attach_query_stats(async_engine.sync_engine)
+    AsyncSessionLocal = sqlalchemy_asyncio.async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
 
 
 def get_session() -> Session:
     return SessionLocal()
+
+
+def pool_status() -> dict[str, dict[str, object]]:
+    status = {pool_metrics.name: pool_metrics.snapshot(engine.pool)}
+    if async_engine is not None and async_pool_metrics is not None:
+        status[async_pool_metrics.name] = async_pool_metrics.snapshot(
+            async_engine.sync_engine.pool
+        )
+    return status
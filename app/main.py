@@ -1,20 +1,55 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
+from fastapi.routing import APIRoute
 
+from app.api.middleware import DBStatsMiddleware, MetricsMiddleware, ProfilingMiddleware
 from app.api.routers import ROUTERS as API_ROUTERS
-from app.db.base import Base
-from app.db.session import engine
-from app.models import customer, product_order  # noqa: F401
+from app.core.config import settings
+from app.core.profiling import route_profiler
+from app.db.bootstrap import bootstrap_schema
+from app.db.session import async_engine, engine
+from app.services.class_catalog_snapshot import run_refresher
+from app.services.metrics_export import run_metrics_flusher
+
+
+def _endpoint_routes(application: FastAPI):
+    # 포함된 라우터는 app.routes에 펼쳐지지 않으므로 원래 라우터 목록을 함께 훑습니다.
+    for routes in (application.routes, *(router.routes for router in API_ROUTERS)):
+        for route in routes:
+            if isinstance(route, APIRoute):
+                yield route.endpoint, f"{','.join(sorted(route.methods))} {route.path}"
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
-    Base.metadata.create_all(bind=engine)
+async def lifespan(application: FastAPI):
+    bootstrap_schema(engine, settings.db_schema_bootstrap)
+    if settings.profiling_continuous_interval_ms > 0:
+        route_profiler.register_endpoints(_endpoint_routes(application))
+        route_profiler.start(settings.profiling_continuous_interval_ms / 1000)
+    tasks = []
+    if settings.class_catalog_refresh_interval > 0:
+        tasks.append(asyncio.create_task(run_refresher(settings.class_catalog_refresh_interval)))
+    if settings.metrics_dir:
+        tasks.append(asyncio.create_task(run_metrics_flusher(settings.metrics_flush_interval)))
     yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    route_profiler.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(title="FastAPI Application", lifespan=lifespan)
+if settings.db_request_stats:
+    app.add_middleware(DBStatsMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.profiling_token or settings.profiling_sample_rate > 0:
+    app.add_middleware(ProfilingMiddleware)
 
 for router in API_ROUTERS:
     app.include_router(router)
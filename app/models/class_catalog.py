@@ -0,0 +1,17 @@
+from sqlalchemy import JSON, Column, DateTime, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.base import Base
+
+
+class ClassCatalogSnapshot(Base):
+    """Denormalized class payload (see app.services.class_catalog), one row per class."""
+
+    __tablename__ = "class_catalog_snapshot"
+
+    class_seq = Column(Integer, primary_key=True, autoincrement=False)
+    # 아직 한 번도 계산되지 않은 클래스는 NULL입니다.
+    payload = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+    # 원본이 바뀌었다고 표시된 시각; NULL이면 마지막 갱신 이후 변경 없음
+    stale_since = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
 
 from app.db.base import Base
 
@@ -11,3 +11,13 @@ class Customer(Base):
     email = Column(String(255), nullable=False, unique=True, index=True)
     phone = Column(String(50), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # 모든 쓰기 경로에서 1씩 증가시키며 ETag의 기준이 됩니다.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # 키셋 페이지네이션 (created_at, id) 정렬/탐색용
+        Index("ix_customer_created_at_id", "created_at", "id"),
+    )
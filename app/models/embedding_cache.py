@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.db.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Embedding vector keyed by (model, dimensions, sha256(text)); see app.services.embedding."""
+
+    __tablename__ = "embedding_cache"
+
+    model = Column(String(100), primary_key=True)
+    # 0이면 모델 기본 차원
+    dimensions = Column(Integer, primary_key=True, autoincrement=False)
+    text_sha256 = Column(LargeBinary(32), primary_key=True)
+    # float32 리틀 엔디언 배열 (1536차원 = 6 KiB)
+    vector = Column(LargeBinary, nullable=False)
+    # LRU 축출 기준
+    last_used_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.db.base import Base
+
+
+class IngestionManifestEntry(Base):
+    """One chunk of an ingested document; see app.services.ingestion.ManifestStore."""
+
+    __tablename__ = "ingestion_manifest"
+
+    collection = Column(String(200), primary_key=True)
+    # 적재할 때 넘긴 경로(posix)
+    source = Column(String(1000), primary_key=True)
+    # 벡터 스토어의 문서 id (본문 해시와 소스 안 순번에서 만든 uuid5)
+    chunk_id = Column(String(36), primary_key=True)
+    content_sha256 = Column(LargeBinary(32), nullable=False)
+    # 마지막으로 쓴 위치; 달라지면 메타데이터를 고치려고 다시 씁니다.
+    page = Column(Integer, nullable=False)
+    chunk = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,8 +1,27 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DateTime, DDL, Index, Integer, String, event, func, text
 
 from app.db.base import Base
 
 
+def _pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    return bind is not None and bool(
+        bind.scalar(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"))
+    )
+
+
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    return bind is not None and bool(
+        bind.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+    )
+
+
+def _trigram_index(name: str, column: str) -> Index:
+    # pg_trgm을 쓸 수 없는 서버에서는 trigram 인덱스만 건너뜁니다(필터는 순차 스캔으로 동작).
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql", callable_=_pg_trgm_installed)
+
+
 class ProductOrder(Base):
     __tablename__ = "product_order"
 
@@ -12,3 +31,33 @@ class ProductOrder(Base):
     shipping_address = Column(String(255), nullable=False)
     shipping_status = Column(String(50), nullable=False, default="pending")
     remark = Column(String(255), nullable=True)
+    # 모든 쓰기 경로에서 1씩 증가시키며 ETag의 기준이 됩니다.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # shipping_status 필터 + id 정렬/키셋
+        Index("ix_product_order_status_id", "shipping_status", "id"),
+        # product_name 정렬/키셋
+        Index("ix_product_order_product_name_id", "product_name", "id"),
+        # product_name LIKE 'prefix%' — 기본 collation에서도 인덱스를 타도록 text_pattern_ops
+        Index(
+            "ix_product_order_product_name_pattern",
+            "product_name",
+            postgresql_ops={"product_name": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # product_name / shipping_address ILIKE '%text%'
+        _trigram_index("ix_product_order_product_name_trgm", "product_name"),
+        _trigram_index("ix_product_order_shipping_address_trgm", "shipping_address"),
+    )
+
+
+event.listen(
+    ProductOrder.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql", callable_=_pg_trgm_available
+    ),
+)
@@ -0,0 +1,23 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ImportReject(BaseModel):
+    line: int
+    reason: str
+
+
+class ImportReport(BaseModel):
+    resource: str
+    mode: Literal["skip", "upsert"]
+    rows_read: int
+    staged: int
+    inserted: int
+    updated: int
+    conflicts: int
+    duplicates: int
+    rejected: int
+    # 응답 크기를 제한하기 위해 앞부분만 담습니다. 전체 개수는 rejected를 보세요.
+    rejects: list[ImportReject]
+    elapsed_ms: float
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -25,3 +27,25 @@ class ProductOrderRead(ProductOrderBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductOrderBulkUpdate(ProductOrderUpdate):
+    id: int
+
+
+class ProductOrderBulkItemResult(BaseModel):
+    index: int
+    status: Literal["created", "updated", "deleted", "conflict", "not_found"]
+    id: int | None = None
+    order: ProductOrderRead | None = None
+
+
+ProductOrderSort = Literal["id", "-id", "product_name", "-product_name"]
+
+
+class ProductOrderFilter(BaseModel):
+    shipping_status: str | None = None
+    product_name_prefix: str | None = None
+    product_name_contains: str | None = None
+    shipping_address: str | None = None
+    sort: ProductOrderSort = "id"
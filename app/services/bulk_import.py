@@ -0,0 +1,269 @@
+import csv
+import io
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO, Any, Literal
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection
+
+from app.db.session import engine
+from app.models.customer import Customer
+from app.models.product_order import ProductOrder
+from app.schemas.bulk_import import ImportReject, ImportReport
+from app.schemas.customer import CustomerCreate
+from app.schemas.product_order import ProductOrderCreate
+from app.services.customer import invalidate_customer
+from app.services.product_order import invalidate_order
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+ImportMode = Literal["skip", "upsert"]
+
+MAX_REPORTED_REJECTS = 1000
+PROGRESS_EVERY = 50_000
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    table: Table
+    key: str
+    schema: type[BaseModel]
+    columns: tuple[str, ...]
+    invalidate: Callable[..., None]
+
+
+IMPORT_SPECS: dict[str, ImportSpec] = {
+    "product_order": ImportSpec(
+        table=ProductOrder.__table__,
+        key="order_number",
+        schema=ProductOrderCreate,
+        columns=(
+            "order_number",
+            "product_name",
+            "shipping_address",
+            "shipping_status",
+            "remark",
+        ),
+        invalidate=invalidate_order,
+    ),
+    "customer": ImportSpec(
+        table=Customer.__table__,
+        key="email",
+        schema=CustomerCreate,
+        columns=("name", "email", "phone"),
+        invalidate=invalidate_customer,
+    ),
+}
+
+
+def _read_records(stream: IO[bytes], fmt: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, raw record) lazily from a binary upload."""
+
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text_stream)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_number, line in enumerate(text_stream, start=1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield line_number, exc
+    finally:
+        # 업로드 파일은 호출자가 닫도록 래퍼만 분리합니다.
+        text_stream.detach()
+
+
+def _copy_value(value: object) -> str:
+    if value is None:
+        return r"\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _CopyStream(io.RawIOBase):
+    """File-like view over an iterator of COPY text lines (for psycopg2 copy_expert)."""
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        parts = [self._pending]
+        filled = len(self._pending)
+        while size < 0 or filled < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            encoded = line.encode()
+            parts.append(encoded)
+            filled += len(encoded)
+        data = b"".join(parts)
+        if size < 0:
+            size = len(data)
+        self._pending = data[size:]
+        return data[:size]
+
+
+def _copy_rows(connection: Connection, sql: str, rows: Iterable[tuple[object, ...]]) -> None:
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            lines = ("\t".join(map(_copy_value, row)) + "\n" for row in rows)
+            cursor.copy_expert(sql, _CopyStream(lines), size=64 * 1024)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+    finally:
+        cursor.close()
+
+
+def _staging_ddl(connection: Connection, spec: ImportSpec, staging: str) -> str:
+    dialect = connection.dialect
+    columns = ", ".join(
+        f"{name} {spec.table.c[name].type.compile(dialect=dialect)}" for name in spec.columns
+    )
+    return f"CREATE TEMPORARY TABLE {staging} (line integer NOT NULL, {columns}) ON COMMIT DROP"
+
+
+def _merge_sql(spec: ImportSpec, staging: str, mode: ImportMode) -> str:
+    table = spec.table.name
+    columns = ", ".join(spec.columns)
+    if mode == "upsert":
+        assignments = ", ".join(
+            f"{name} = EXCLUDED.{name}" for name in spec.columns if name != spec.key
+        )
+        conflict = (
+            f"DO UPDATE SET {assignments}, version = {table}.version + 1, updated_at = now()"
+        )
+    else:
+        conflict = "DO NOTHING"
+    # 파일 안에서 같은 키가 반복되면 첫 줄만 반영합니다.
+    return (
+        f"INSERT INTO {table} ({columns}) "
+        f"SELECT DISTINCT ON ({spec.key}) {columns} FROM {staging} "
+        f"ORDER BY {spec.key}, line "
+        f"ON CONFLICT ({spec.key}) {conflict} "
+        f"RETURNING id, (xmax = 0) AS inserted"
+    )
+
+
+def import_records(
+    resource: str,
+    stream: IO[bytes],
+    fmt: ImportFormat = "csv",
+    mode: ImportMode = "skip",
+    progress: Callable[[int], None] | None = None,
+) -> ImportReport:
+    """Validate rows while streaming them into a temp table via COPY, then merge.
+
+    Rows failing schema or length validation are rejected individually
+    (COPY itself would abort the whole batch). Everything after COPY runs
+    in the same transaction, so a failed merge leaves the table untouched.
+    """
+
+    spec = IMPORT_SPECS[resource]
+    started = time.perf_counter()
+    lengths = {
+        name: getattr(spec.table.c[name].type, "length", None) for name in spec.columns
+    }
+    rejects: list[ImportReject] = []
+    counts = {"read": 0, "staged": 0, "rejected": 0}
+
+    def reject(line: int, reason: str) -> None:
+        counts["rejected"] += 1
+        if len(rejects) < MAX_REPORTED_REJECTS:
+            rejects.append(ImportReject(line=line, reason=reason))
+
+    def valid_rows() -> Iterator[tuple[object, ...]]:
+        for line, record in _read_records(stream, fmt):
+            counts["read"] += 1
+            if progress is not None and counts["read"] % PROGRESS_EVERY == 0:
+                progress(counts["read"])
+            if not isinstance(record, dict):
+                reject(line, f"Invalid record: {record}")
+                continue
+            if fmt == "csv":
+                # CSV의 빈 칸은 NULL로 취급합니다.
+                record = {key: value for key, value in record.items() if value != ""}
+            try:
+                item = spec.schema.model_validate(record).model_dump()
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                location = ".".join(str(part) for part in error["loc"])
+                reject(line, f"{location}: {error['msg']}")
+                continue
+            too_long = next(
+                (
+                    name
+                    for name, limit in lengths.items()
+                    if limit and item[name] is not None and len(str(item[name])) > limit
+                ),
+                None,
+            )
+            if too_long is not None:
+                reject(line, f"{too_long}: longer than {lengths[too_long]} characters")
+                continue
+            counts["staged"] += 1
+            yield (line, *(item[name] for name in spec.columns))
+
+    staging = f"_import_{spec.table.name}"
+    with engine.begin() as connection:
+        connection.execute(text(_staging_ddl(connection, spec, staging)))
+        _copy_rows(
+            connection,
+            f"COPY {staging} (line, {', '.join(spec.columns)}) FROM STDIN",
+            valid_rows(),
+        )
+        distinct = connection.execute(
+            text(f"SELECT count(DISTINCT {spec.key}) FROM {staging}")
+        ).scalar_one()
+        merged = connection.execute(text(_merge_sql(spec, staging, mode))).all()
+
+    inserted = sum(1 for row in merged if row.inserted)
+    updated = len(merged) - inserted
+    if updated:
+        spec.invalidate(*(row.id for row in merged if not row.inserted))
+    if progress is not None:
+        progress(counts["read"])
+    report = ImportReport(
+        resource=resource,
+        mode=mode,
+        rows_read=counts["read"],
+        staged=counts["staged"],
+        inserted=inserted,
+        updated=updated,
+        conflicts=distinct - len(merged),
+        duplicates=counts["staged"] - distinct,
+        rejected=counts["rejected"],
+        rejects=rejects,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    logger.info(
+        "import %s: read=%d inserted=%d updated=%d rejected=%d in %.0fms",
+        resource,
+        report.rows_read,
+        report.inserted,
+        report.updated,
+        report.rejected,
+        report.elapsed_ms,
+    )
+    return report
@@ -0,0 +1,190 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Protocol
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> dict[str, Any] | None: ...
+
+    def set(self, key: str, value: Mapping[str, Any], ttl: float) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def stats(self) -> dict[str, object]: ...
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.values = dict.fromkeys(
+            ("hits", "misses", "sets", "invalidations", "evictions", "expired"), 0
+        )
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.values[name] += amount
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.values)
+
+
+class MemoryCache:
+    """In-process LRU cache with per-entry TTL.
+
+    Each worker process keeps its own copy, so invalidation is local: other
+    workers may serve an entry until its TTL expires. Use the Redis backend
+    when running several workers and staleness matters.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = _Counters()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self._counters.incr("expired")
+                entry = None
+            if entry is None:
+                self._counters.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+        self._counters.incr("hits")
+        return dict(entry[1])
+
+    def set(self, key: str, value: Mapping[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, dict(value))
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        self._counters.incr("sets")
+        if evicted:
+            self._counters.incr("evictions", evicted)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        self._counters.incr("invalidations", len(keys))
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "backend": "memory",
+            "size": size,
+            "max_entries": self.max_entries,
+            **self._counters.snapshot(),
+        }
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _json_object_hook(value: dict[str, Any]) -> object:
+    if value.keys() == {"$dt"}:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+class RedisCache:
+    """Redis-protocol backend; `client` needs only get / set(px=) / delete."""
+
+    def __init__(self, client: Any, prefix: str = "fastai:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self._counters = _Counters()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self._counters.incr("misses")
+            return None
+        self._counters.incr("hits")
+        return json.loads(raw, object_hook=_json_object_hook)
+
+    def set(self, key: str, value: Mapping[str, Any], ttl: float) -> None:
+        payload = json.dumps(dict(value), default=_json_default, separators=(",", ":"))
+        self.client.set(self.prefix + key, payload, px=max(int(ttl * 1000), 1))
+        self._counters.incr("sets")
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+        self._counters.incr("invalidations", len(keys))
+
+    def stats(self) -> dict[str, object]:
+        # 축출은 Redis 서버가 수행하므로 카운터 대신 서버 통계를 읽습니다.
+        counters = self._counters.snapshot()
+        info = getattr(self.client, "info", None)
+        if info is not None:
+            try:
+                counters["evictions"] = int(info("stats").get("evicted_keys", 0))
+            except Exception:  # pragma: no cover - 통계 조회 실패는 무시
+                pass
+        return {"backend": "redis", **counters}
+
+
+class NullCache:
+    def get(self, key: str) -> dict[str, Any] | None:
+        return None
+
+    def set(self, key: str, value: Mapping[str, Any], ttl: float) -> None:
+        return None
+
+    def delete(self, *keys: str) -> None:
+        return None
+
+    def stats(self) -> dict[str, object]:
+        return {"backend": "none"}
+
+
+@lru_cache
+def get_cache() -> CacheBackend:
+    if settings.cache_backend == "redis":
+        return RedisCache.from_url(settings.cache_redis_url)
+    if settings.cache_backend == "memory":
+        return MemoryCache(max_entries=settings.cache_max_entries)
+    return NullCache()
+
+
+def entity_to_dict(entity: object) -> dict[str, Any]:
+    """Column values of an ORM entity (or a RETURNING row) as a plain dict."""
+
+    if isinstance(entity, Mapping):
+        return dict(entity)
+    mapping = getattr(entity, "_mapping", None)
+    if mapping is not None:
+        return dict(mapping)
+    return {
+        attr.key: getattr(entity, attr.key) for attr in inspect(entity).mapper.column_attrs
+    }
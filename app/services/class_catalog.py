@@ -0,0 +1,258 @@
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.cache import get_cache
+
+# SQL Server 파라미터 한도(2100)보다 충분히 작게 나눠 조회합니다.
+BATCH_SIZE = 500
+# 페이로드 구조가 바뀌면 올려서 이전 형식의 캐시 항목을 읽지 않도록 합니다.
+PAYLOAD_FORMAT = 1
+
+# fetch_complex_class_payload의 배치 버전입니다. 해시태그/강사 목록(STUFF ... FOR XML PATH)은
+# 클래스/강의 단위 CTE에서 한 번씩만 계산하고, 팬아웃 행에는 키만 남깁니다.
+CLASS_PAYLOAD_SQL = text(
+    """
+    WITH classes AS (
+        SELECT c.classSeq,
+               c.className,
+               STUFF((SELECT ',' + ha.hashTagName
+                      FROM HASHTAG ha
+                               JOIN yanadoo_master..HASHTAG_RELATION hr
+                                    ON hr.typeCode = 'CLASS'
+                                        AND hr.relationSeq = c.classSeq
+                                        AND ha.hashTagSeq = hr.hashTagSeq
+                      FOR XML PATH('')), 1, 1, '') AS hashTags
+        FROM yanadoo_master..CLASS c
+        WHERE c.classSeq IN :class_seqs
+    ),
+    lectures AS (
+        SELECT DISTINCT ctc.classSeq,
+               l.lectureSeq,
+               l.title,
+               cp.seq AS cpSeq,
+               cp.name AS cpName,
+               STUFF((SELECT ',' + t.teacherName
+                      FROM LECTURE_TO_TEACHER ltt
+                               JOIN yanadoo_master..TEACHER t
+                                    ON l.lectureSeq = ltt.lectureSeq AND ltt.teacherSeq = t.teacherSeq
+                      FOR XML PATH('')), 1, 1, '') AS teacherNames
+        FROM classes c
+                 JOIN yanadoo_master..CLASS_TO_COURSE ctc ON c.classSeq = ctc.classSeq
+                 JOIN yanadoo_master..COURSE co ON ctc.courseSeq = co.courseSeq
+                 JOIN yanadoo_master..COURSE_TO_LECTURE ctl ON ctc.courseSeq = ctl.courseSeq
+                 JOIN yanadoo_master..LECTURE l ON ctl.lectureSeq = l.lectureSeq
+                 LEFT JOIN yanadoo_master..CONTENT_PROVIDER cp ON l.contentProviderSeq = cp.seq
+    )
+    SELECT c.classSeq AS class_seq,
+           c.className AS class_name,
+           c.hashTags AS class_hashtags,
+           comm.communitySeq AS community_seq,
+           comm.title AS community_title,
+           le.lectureSeq AS lecture_seq,
+           le.title AS lecture_title,
+           le.cpSeq AS content_provider_seq,
+           le.cpName AS content_provider_name,
+           le.teacherNames AS teacher_names,
+           lta.assetType AS asset_type,
+           lta.relationSeq AS asset_seq,
+           kmi.mediaContentKey AS media_content_key,
+           at.assetTrainingFileName AS training_file_name,
+           kmi2.mediaContentKey AS expression_media_content_key,
+           mi.missionName AS mission_name,
+           att.assetTutorSeq AS tutor_seq,
+           att.assetTutorFileName AS tutor_file_name,
+           laf.seq AS attach_file_seq,
+           laf.attachFileName AS attach_file_name
+    FROM classes c
+             LEFT JOIN yanadoo_master..CLASS_TO_COMMUNITY ctco ON c.classSeq = ctco.classSeq
+             LEFT JOIN yanadoo_master..COMMUNITY_V2 comm ON ctco.communitySeq = comm.communitySeq
+             JOIN lectures le ON c.classSeq = le.classSeq
+             JOIN yanadoo_master..LECTURE_TO_ASSET lta ON le.lectureSeq = lta.lectureSeq
+             LEFT JOIN yanadoo_master..ASSET_MEDIA am
+                       ON lta.relationSeq = am.assetMediaSeq AND lta.assetType = 'MEDIA'
+             LEFT JOIN yanadoo_master..KOLLUS_MEDIA_INFO kmi ON am.uploadFileKey = kmi.uploadFileKey
+             LEFT JOIN yanadoo_master..ASSET_TRAINING at
+                       ON lta.relationSeq = at.assetTrainingSeq AND lta.assetType = 'TRAINING'
+             LEFT JOIN yanadoo_master..ASSET_EXPRESSION ae
+                       ON lta.relationSeq = ae.assetExpressionSeq AND lta.assetType = 'EXPRESSION'
+             LEFT JOIN yanadoo_master..KOLLUS_MEDIA_INFO kmi2 ON ae.uploadFileKey = kmi2.uploadFileKey
+             LEFT JOIN yanadoo_master..MISSION mi
+                       ON lta.relationSeq = mi.missionSeq AND lta.assetType = 'MISSION'
+             LEFT JOIN yanadoo_master..ASSET_TUTOR att ON le.lectureSeq = att.lectureSeq
+             LEFT JOIN yanadoo_master..LECTURE_ATTACH_FILE laf ON le.lectureSeq = laf.lectureSeq
+    ORDER BY c.classSeq, le.lectureSeq
+    """
+).bindparams(bindparam("class_seqs", expanding=True))
+
+_ASSET_FIELDS = {
+    "MEDIA": ("media_content_key",),
+    "TRAINING": ("training_file_name",),
+    "EXPRESSION": ("expression_media_content_key",),
+    "MISSION": ("mission_name",),
+}
+
+
+def _split(value: str | None) -> list[str]:
+    return [part for part in (value or "").split(",") if part]
+
+
+def _append_once(items: list[dict[str, Any]], seen: set, key: object, item: dict) -> None:
+    if key is not None and key not in seen:
+        seen.add(key)
+        items.append(item)
+
+
+def _new_lecture(row: Mapping[str, Any]) -> dict[str, Any]:
+    provider = None
+    if row["content_provider_seq"] is not None:
+        provider = {"seq": row["content_provider_seq"], "name": row["content_provider_name"]}
+    return {
+        "lecture_seq": row["lecture_seq"],
+        "title": row["lecture_title"],
+        "content_provider": provider,
+        "teachers": _split(row["teacher_names"]),
+        "assets": [],
+        "tutors": [],
+        "attachments": [],
+    }
+
+
+def fold_class_rows(rows: Iterable[Mapping[str, Any]]) -> dict[int, dict[str, Any]]:
+    """Fold flat class x lecture x asset x attachment rows into one nested payload per class.
+
+    The join fans out every lecture into (assets x tutors x attachments) rows;
+    each child is kept once, in first-seen order.
+    """
+
+    classes: dict[int, dict[str, Any]] = {}
+    communities_seen: dict[int, set] = {}
+    lectures: dict[tuple[int, int], tuple[dict[str, Any], set]] = {}
+    for row in rows:
+        class_seq = row["class_seq"]
+        payload = classes.get(class_seq)
+        if payload is None:
+            payload = classes[class_seq] = {
+                "class_seq": class_seq,
+                "class_name": row["class_name"],
+                "hashtags": _split(row["class_hashtags"]),
+                "communities": [],
+                "lectures": [],
+            }
+            communities_seen[class_seq] = set()
+        _append_once(
+            payload["communities"],
+            communities_seen[class_seq],
+            row["community_seq"],
+            {"community_seq": row["community_seq"], "title": row["community_title"]},
+        )
+
+        entry = lectures.get((class_seq, row["lecture_seq"]))
+        if entry is None:
+            entry = lectures[(class_seq, row["lecture_seq"])] = (_new_lecture(row), set())
+            payload["lectures"].append(entry[0])
+        lecture, lecture_seen = entry
+
+        asset_type = row["asset_type"]
+        asset = {"type": asset_type, "seq": row["asset_seq"]}
+        asset.update({field: row[field] for field in _ASSET_FIELDS.get(asset_type, ())})
+        _append_once(
+            lecture["assets"], lecture_seen, ("asset", asset_type, row["asset_seq"]), asset
+        )
+        if row["tutor_seq"] is not None:
+            _append_once(
+                lecture["tutors"],
+                lecture_seen,
+                ("tutor", row["tutor_seq"]),
+                {"seq": row["tutor_seq"], "file_name": row["tutor_file_name"]},
+            )
+        if row["attach_file_seq"] is not None:
+            _append_once(
+                lecture["attachments"],
+                lecture_seen,
+                ("attachment", row["attach_file_seq"]),
+                {"seq": row["attach_file_seq"], "file_name": row["attach_file_name"]},
+            )
+    return classes
+
+
+def fetch_class_payloads(db: Session, class_seqs: Sequence[int]) -> dict[int, dict[str, Any]]:
+    """Nested payloads for many classes, one round trip per BATCH_SIZE class_seqs.
+
+    Classes without any lecture asset are absent from the result, as they are
+    from the single-class query.
+    """
+
+    # NOTE: 외부(SQL Server) 스키마를 참조하므로 실제 실행 환경에 따라 실패할 수 있습니다.
+    unique = list(dict.fromkeys(class_seqs))
+    payloads: dict[int, dict[str, Any]] = {}
+    for start in range(0, len(unique), BATCH_SIZE):
+        batch = unique[start : start + BATCH_SIZE]
+        rows = db.execute(CLASS_PAYLOAD_SQL, {"class_seqs": batch}).mappings()
+        payloads.update(fold_class_rows(rows))
+    return payloads
+
+
+# 캐시 키에 카탈로그 버전을 넣어, 전체 무효화는 버전만 바꾸는 것으로 끝냅니다.
+_VERSION_KEY = "class_catalog:version"
+
+
+def _catalog_version() -> str:
+    cache = get_cache()
+    data = cache.get(_VERSION_KEY)
+    if data is None:
+        data = {"version": str(time.time_ns())}
+        cache.set(_VERSION_KEY, data, settings.class_catalog_cache_ttl * 24)
+    return data["version"]
+
+
+def _cache_key(version: str, class_seq: int) -> str:
+    return f"class_catalog:{PAYLOAD_FORMAT}:{version}:{class_seq}"
+
+
+def get_class_payloads(db: Session, class_seqs: Sequence[int]) -> dict[int, dict[str, Any]]:
+    """Read-through cached `fetch_class_payloads`; only cache misses hit the database."""
+
+    cache = get_cache()
+    version = _catalog_version()
+    payloads: dict[int, dict[str, Any]] = {}
+    missing: list[int] = []
+    for class_seq in dict.fromkeys(class_seqs):
+        cached = cache.get(_cache_key(version, class_seq))
+        if cached is None:
+            missing.append(class_seq)
+        else:
+            payloads[class_seq] = cached
+    if missing:
+        fetched = fetch_class_payloads(db, missing)
+        for class_seq, payload in fetched.items():
+            cache.set(_cache_key(version, class_seq), payload, settings.class_catalog_cache_ttl)
+        payloads.update(fetched)
+    return {seq: payloads[seq] for seq in dict.fromkeys(class_seqs) if seq in payloads}
+
+
+def get_class_payload(db: Session, class_seq: int) -> dict[str, Any] | None:
+    return get_class_payloads(db, [class_seq]).get(class_seq)
+
+
+def invalidate_class(*class_seqs: int) -> None:
+    """Drop cached payloads of specific classes after their catalog data changed."""
+
+    version = _catalog_version()
+    get_cache().delete(*(_cache_key(version, class_seq) for class_seq in class_seqs))
+
+
+def invalidate_catalog() -> None:
+    """Invalidate every cached class payload at once by starting a new catalog version.
+
+    Shared entities (lectures, teachers, assets) belong to many classes, so a
+    change to one of them is handled here rather than by tracking dependents.
+    """
+
+    get_cache().set(
+        _VERSION_KEY, {"version": str(time.time_ns())}, settings.class_catalog_cache_ttl * 24
+    )
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import case, delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import get_session
+from app.models.class_catalog import ClassCatalogSnapshot
+from app.services import class_catalog
+
+logger = logging.getLogger(__name__)
+
+# class_seq 목록 -> {class_seq: payload}; 원본에 없는 클래스는 결과에서 빠집니다.
+PayloadFetcher = Callable[[Sequence[int]], dict[int, dict[str, Any]]]
+
+REFRESH_BATCH_SIZE = class_catalog.BATCH_SIZE
+
+
+def live_fetcher(class_seqs: Sequence[int]) -> dict[int, dict[str, Any]]:
+    """Compute payloads from the yanadoo_master tables (one batched query)."""
+
+    with get_session() as source:
+        return class_catalog.fetch_class_payloads(source, class_seqs)
+
+
+def load_fixture(path: Path) -> dict[int, dict[str, Any]]:
+    """Payloads folded from a JSON file of flat class rows (the live query's row shape)."""
+
+    return class_catalog.fold_class_rows(json.loads(Path(path).read_text("utf-8")))
+
+
+def static_fetcher(payloads: dict[int, dict[str, Any]]) -> PayloadFetcher:
+    """Fetcher over precomputed payloads, for databases without the source schema."""
+
+    def fetch(class_seqs: Sequence[int]) -> dict[int, dict[str, Any]]:
+        return {seq: payloads[seq] for seq in class_seqs if seq in payloads}
+
+    return fetch
+
+
+def _insert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        # 로컬/테스트용 SQLite에서만 필요하므로 기동 시 불러오지 않습니다.
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert
+    return pg_insert
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def get_class_snapshot(db: Session, class_seq: int) -> dict[str, Any] | None:
+    """Stored payload of one class by primary key; None if it was never computed."""
+
+    return db.scalar(
+        select(ClassCatalogSnapshot.payload).where(ClassCatalogSnapshot.class_seq == class_seq)
+    )
+
+
+def get_class_snapshots(db: Session, class_seqs: Sequence[int]) -> dict[int, dict[str, Any]]:
+    rows = db.execute(
+        select(ClassCatalogSnapshot.class_seq, ClassCatalogSnapshot.payload).where(
+            ClassCatalogSnapshot.class_seq.in_(class_seqs),
+            ClassCatalogSnapshot.payload.is_not(None),
+        )
+    )
+    return dict(rows.tuples().all())
+
+
+def mark_stale(db: Session, *class_seqs: int) -> None:
+    """Flag classes whose source rows changed; unknown classes are added as pending."""
+
+    if not class_seqs:
+        return
+    insert = _insert(db)
+    now = _now()
+    statement = insert(ClassCatalogSnapshot).values(
+        [{"class_seq": seq, "stale_since": now} for seq in dict.fromkeys(class_seqs)]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ClassCatalogSnapshot.class_seq],
+            # 이미 표시된 행은 가장 이른 변경 시각을 유지합니다.
+            set_={
+                "stale_since": case(
+                    (ClassCatalogSnapshot.stale_since.is_(None), statement.excluded.stale_since),
+                    else_=ClassCatalogSnapshot.stale_since,
+                )
+            },
+        )
+    )
+    db.commit()
+
+
+def _due_class_seqs(db: Session, max_staleness: float, limit: int) -> list[int]:
+    cutoff = _now() - timedelta(seconds=max_staleness)
+    statement = (
+        select(ClassCatalogSnapshot.class_seq)
+        .where(
+            or_(
+                ClassCatalogSnapshot.stale_since.is_not(None),
+                ClassCatalogSnapshot.refreshed_at.is_(None),
+                ClassCatalogSnapshot.refreshed_at < cutoff,
+            )
+        )
+        # 변경 표시된 클래스 먼저(오래된 순), 그다음 한 번도 계산되지 않았거나 오래된 스냅샷
+        .order_by(
+            ClassCatalogSnapshot.stale_since.asc().nulls_last(),
+            ClassCatalogSnapshot.refreshed_at.asc().nulls_first(),
+        )
+        .limit(limit)
+        # 여러 워커가 동시에 갱신해도 같은 클래스를 두 번 계산하지 않도록 합니다.
+        .with_for_update(skip_locked=True)
+    )
+    return list(db.scalars(statement))
+
+
+def refresh_snapshots(
+    db: Session,
+    fetch: PayloadFetcher = live_fetcher,
+    class_seqs: Sequence[int] | None = None,
+    max_staleness: float | None = None,
+    limit: int = REFRESH_BATCH_SIZE,
+) -> dict[str, int]:
+    """Recompute snapshots of `class_seqs`, or of up to `limit` stale/outdated classes.
+
+    Only the selected classes are fetched from the source, in one batch. Classes
+    the source no longer returns are removed from the snapshot table.
+    """
+
+    started = _now()
+    if class_seqs is None:
+        if max_staleness is None:
+            max_staleness = settings.class_catalog_max_staleness
+        class_seqs = _due_class_seqs(db, max_staleness, limit)
+    class_seqs = list(dict.fromkeys(class_seqs))
+    if not class_seqs:
+        db.rollback()
+        return {"refreshed": 0, "removed": 0}
+
+    payloads = fetch(class_seqs)
+    if payloads:
+        insert = _insert(db)
+        statement = insert(ClassCatalogSnapshot).values(
+            [
+                {"class_seq": seq, "payload": payload, "refreshed_at": started}
+                for seq, payload in payloads.items()
+            ]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ClassCatalogSnapshot.class_seq],
+                set_={
+                    "payload": statement.excluded.payload,
+                    "refreshed_at": statement.excluded.refreshed_at,
+                    # 계산 도중 새로 표시된 변경은 다음 갱신에서 처리되도록 남겨 둡니다.
+                    "stale_since": case(
+                        (
+                            ClassCatalogSnapshot.stale_since > started,
+                            ClassCatalogSnapshot.stale_since,
+                        ),
+                        else_=None,
+                    ),
+                },
+            )
+        )
+    removed = [seq for seq in class_seqs if seq not in payloads]
+    if removed:
+        db.execute(
+            delete(ClassCatalogSnapshot).where(ClassCatalogSnapshot.class_seq.in_(removed))
+        )
+    db.commit()
+    class_catalog.invalidate_class(*class_seqs)
+    return {"refreshed": len(payloads), "removed": len(removed)}
+
+
+async def run_refresher(interval: float, fetch: PayloadFetcher = live_fetcher) -> None:
+    """Refresh due snapshots every `interval` seconds until cancelled.
+
+    Together with CLASS_CATALOG_MAX_STALENESS this bounds how old a served
+    snapshot can be: marked classes are picked up within one interval, and
+    unmarked ones are recomputed once they exceed the staleness bound.
+    """
+
+    def _refresh_due() -> dict[str, int]:
+        with get_session() as db:
+            return refresh_snapshots(db, fetch)
+
+    while True:
+        try:
+            result = await run_in_threadpool(_refresh_due)
+            if result["refreshed"] or result["removed"]:
+                logger.info("class catalog snapshots refreshed: %s", result)
+        except Exception:
+            logger.exception("class catalog snapshot refresh failed")
+        await asyncio.sleep(interval)
@@ -1,42 +1,156 @@
 from collections.abc import Sequence
+from datetime import datetime
 
+from sqlalchemy import Select, delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
 from app.models.customer import Customer
 from app.schemas.customer import CustomerCreate, CustomerRead, CustomerUpdate
+from app.services.cache import entity_to_dict, get_cache
+from app.services.projection import read_columns
 
 
-def create_customer(db: Session, customer_in: CustomerCreate) -> Customer:
-    customer = Customer(**customer_in.model_dump())
-    db.add(customer)
+def _cache_key(customer_id: int) -> str:
+    return f"customer:{customer_id}"
+
+
+def cached_customer(customer_id: int) -> Customer | None:
+    """Detached `Customer` built from the cache, or None on a miss."""
+
+    data = get_cache().get(_cache_key(customer_id))
+    return Customer(**data) if data is not None else None
+
+
+def cache_customer(customer: Customer) -> None:
+    get_cache().set(
+        _cache_key(customer.id), entity_to_dict(customer), settings.customer_cache_ttl
+    )
+
+
+def invalidate_customer(*customer_ids: int) -> None:
+    get_cache().delete(*(_cache_key(customer_id) for customer_id in customer_ids))
+
+
+def create_customer(db: Session, customer_in: CustomerCreate) -> Customer | None:
+    """INSERT ... ON CONFLICT (email) DO NOTHING RETURNING *; None if the email exists."""
+
+    customer = db.scalars(
+        pg_insert(Customer)
+        .values(**customer_in.model_dump())
+        .on_conflict_do_nothing(index_elements=[Customer.email])
+        .returning(Customer)
+    ).first()
     db.commit()
-    db.refresh(customer)
     return customer
 
 
 def get_customer(db: Session, customer_id: int) -> Customer | None:
-    return db.query(Customer).filter(Customer.id == customer_id).first()
+    customer = cached_customer(customer_id)
+    if customer is not None:
+        return customer
+    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    if customer is not None:
+        cache_customer(customer)
+    return customer
+
+
+def get_customer_version(db: Session, customer_id: int) -> int | None:
+    """Row version for conditional GETs, from the cache or a single-column lookup."""
+
+    customer = cached_customer(customer_id)
+    if customer is not None:
+        return customer.version
+    return db.query(Customer.version).filter(Customer.id == customer_id).scalar()
 
 
 def get_customer_by_email(db: Session, email: str) -> Customer | None:
     return db.query(Customer).filter(Customer.email == email).first()
 
 
-def list_customers(db: Session, skip: int = 0, limit: int = 50) -> Sequence[Customer]:
-    return db.query(Customer).offset(skip).limit(limit).all()
+CURSOR_KIND = "customer"
+
+
+def encode_customer_cursor(customer: Customer) -> str:
+    return encode_cursor(CURSOR_KIND, [customer.created_at.isoformat(), customer.id])
+
+
+def decode_customer_cursor(token: str) -> tuple[datetime, int]:
+    key = decode_cursor(token, CURSOR_KIND)
+    try:
+        created_at, customer_id = key
+        return datetime.fromisoformat(created_at), int(customer_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+
+
+# 목록 조회용 투영: CustomerRead 필드 + ETag 계산에 쓰는 version.
+# 식별자 맵/변경 추적 없이 가벼운 Row 튜플만 만들어집니다.
+CUSTOMER_ROW_COLUMNS = read_columns(Customer, CustomerRead, Customer.version)
+
+
+def customer_list_statement(
+    after: tuple[datetime, int] | None = None, projected: bool = False
+) -> Select:
+    """Customers ordered by (created_at, id); plain rows of CUSTOMER_ROW_COLUMNS if projected."""
+
+    statement = select(*CUSTOMER_ROW_COLUMNS) if projected else select(Customer)
+    if after is not None:
+        statement = statement.where(tuple_(Customer.created_at, Customer.id) > after)
+    return statement.order_by(Customer.created_at, Customer.id)
+
+
+def list_customers(
+    db: Session, skip: int = 0, limit: int = 50, projected: bool = True
+) -> Sequence[Customer] | Sequence[Row]:
+    """Page of customers as plain rows; pass projected=False for tracked entities."""
+
+    statement = customer_list_statement(projected=projected).offset(skip).limit(limit)
+    return db.execute(statement).all() if projected else db.scalars(statement).all()
+
+
+def list_customers_after(
+    db: Session,
+    after: tuple[datetime, int] | None,
+    limit: int = 50,
+    projected: bool = True,
+) -> Sequence[Customer] | Sequence[Row]:
+    """Keyset page ordered by (created_at, id), starting after the given key."""
+
+    statement = customer_list_statement(after, projected).limit(limit)
+    return db.execute(statement).all() if projected else db.scalars(statement).all()
 
 
 def update_customer(
-    db: Session, customer: Customer, customer_in: CustomerUpdate
-) -> Customer:
+    db: Session, customer_id: int, customer_in: CustomerUpdate
+) -> Customer | None:
+    """UPDATE ... WHERE id = :id RETURNING *; None if the customer does not exist.
+
+    A duplicate email surfaces as IntegrityError from the UPDATE itself.
+    """
+
     payload = customer_in.model_dump(exclude_unset=True, exclude_none=True)
-    for field, value in payload.items():
-        setattr(customer, field, value)
+    if not payload:
+        return get_customer(db, customer_id)
+    customer = db.scalars(
+        update(Customer)
+        .where(Customer.id == customer_id)
+        .values(**payload, version=Customer.version + 1)
+        .returning(Customer)
+        .execution_options(synchronize_session=False)
+    ).first()
     db.commit()
-    db.refresh(customer)
+    invalidate_customer(customer_id)
     return customer
 
 
-def delete_customer(db: Session, customer: Customer) -> None:
-    db.delete(customer)
+def delete_customer(db: Session, customer_id: int) -> bool:
+    deleted = db.execute(
+        delete(Customer).where(Customer.id == customer_id).returning(Customer.id)
+    ).first()
     db.commit()
+    invalidate_customer(customer_id)
+    return deleted is not None
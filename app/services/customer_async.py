@@ -0,0 +1,104 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.customer import Customer
+from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.services.customer import (  # noqa: F401  커서/캐시 처리는 동기 서비스와 공유
+    cache_customer,
+    cached_customer,
+    customer_list_statement,
+    decode_customer_cursor,
+    encode_customer_cursor,
+    invalidate_customer,
+)
+
+
+async def create_customer(
+    db: AsyncSession, customer_in: CustomerCreate
+) -> Customer | None:
+    result = await db.scalars(
+        pg_insert(Customer)
+        .values(**customer_in.model_dump())
+        .on_conflict_do_nothing(index_elements=[Customer.email])
+        .returning(Customer)
+    )
+    customer = result.first()
+    await db.commit()
+    return customer
+
+
+async def get_customer(db: AsyncSession, customer_id: int) -> Customer | None:
+    customer = cached_customer(customer_id)
+    if customer is not None:
+        return customer
+    customer = await db.get(Customer, customer_id)
+    if customer is not None:
+        cache_customer(customer)
+    return customer
+
+
+async def get_customer_version(db: AsyncSession, customer_id: int) -> int | None:
+    customer = cached_customer(customer_id)
+    if customer is not None:
+        return customer.version
+    return await db.scalar(select(Customer.version).where(Customer.id == customer_id))
+
+
+async def get_customer_by_email(db: AsyncSession, email: str) -> Customer | None:
+    result = await db.execute(select(Customer).where(Customer.email == email))
+    return result.scalars().first()
+
+
+async def list_customers(
+    db: AsyncSession, skip: int = 0, limit: int = 50, projected: bool = True
+) -> Sequence[Customer] | Sequence[Row]:
+    statement = customer_list_statement(projected=projected).offset(skip).limit(limit)
+    if projected:
+        return (await db.execute(statement)).all()
+    return (await db.scalars(statement)).all()
+
+
+async def list_customers_after(
+    db: AsyncSession,
+    after: tuple[datetime, int] | None,
+    limit: int = 50,
+    projected: bool = True,
+) -> Sequence[Customer] | Sequence[Row]:
+    statement = customer_list_statement(after, projected).limit(limit)
+    if projected:
+        return (await db.execute(statement)).all()
+    return (await db.scalars(statement)).all()
+
+
+async def update_customer(
+    db: AsyncSession, customer_id: int, customer_in: CustomerUpdate
+) -> Customer | None:
+    payload = customer_in.model_dump(exclude_unset=True, exclude_none=True)
+    if not payload:
+        return await get_customer(db, customer_id)
+    result = await db.scalars(
+        update(Customer)
+        .where(Customer.id == customer_id)
+        .values(**payload, version=Customer.version + 1)
+        .returning(Customer)
+        .execution_options(synchronize_session=False)
+    )
+    customer = result.first()
+    await db.commit()
+    invalidate_customer(customer_id)
+    return customer
+
+
+async def delete_customer(db: AsyncSession, customer_id: int) -> bool:
+    result = await db.execute(
+        delete(Customer).where(Customer.id == customer_id).returning(Customer.id)
+    )
+    deleted = result.first()
+    await db.commit()
+    invalidate_customer(customer_id)
+    return deleted is not None
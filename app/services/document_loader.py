@@ -0,0 +1,183 @@
+"""Parallel PDF text extraction over a process pool.
+
+pypdf's `extract_text` is pure Python and CPU-bound, so a large PDF keeps a
+single core busy for minutes. Here page ranges are split across worker
+processes. Each worker opens the file by path and maps it with mmap, so only
+(path, start, stop) is pickled. The OS page cache is shared between workers,
+and every worker process keeps the file open across the ranges it is given.
+The calling process (API, ingestion) opens a reader per call and closes it
+when done, so threads never share one and no PDF stays mapped. Results
+come back in page order. At most a few ranges per worker are in flight, so
+streaming a huge file does not buffer its whole text.
+"""
+import mmap
+import multiprocessing
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.lazy import require
+
+# 워커마다 동시에 맡겨 두는 페이지 범위 수(순서대로 내보내는 동안 놀지 않을 만큼)
+RANGES_IN_FLIGHT_PER_WORKER = 2
+
+# 풀 워커 프로세스에서만 씁니다: 마지막으로 연 PDF (경로, (크기, 수정 시각), 파일, mmap, PdfReader)
+_open_pdf: tuple[str, tuple[int, int], Any, mmap.mmap, Any] | None = None
+_in_worker = False
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _mark_worker() -> None:
+    global _in_worker
+    _in_worker = True
+
+
+@contextmanager
+def open_pdf(path: str | Path) -> Iterator[Any]:
+    """PdfReader over a read-only mmap of `path`, closed on exit."""
+
+    with open(path, "rb") as stream:
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield require("pypdf").PdfReader(mapped)
+
+
+def _reader(path: str) -> Any:
+    global _open_pdf
+    stat = os.stat(path)
+    version = (stat.st_size, stat.st_mtime_ns)
+    if _open_pdf is not None and _open_pdf[:2] == (path, version):
+        return _open_pdf[4]
+    close_reader()
+    stream = open(path, "rb")
+    mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    _open_pdf = (path, version, stream, mapped, require("pypdf").PdfReader(mapped))
+    return _open_pdf[4]
+
+
+def close_reader() -> None:
+    global _open_pdf
+    if _open_pdf is not None:
+        _, _, stream, mapped, _ = _open_pdf
+        _open_pdf = None
+        mapped.close()
+        stream.close()
+
+
+def page_count(path: str | Path) -> int:
+    with open_pdf(path) as reader:
+        return len(reader.pages)
+
+
+def _extract(reader: Any, start: int, stop: int) -> list[str]:
+    texts = []
+    for number in range(start, stop):
+        texts.append(reader.pages[number - 1].extract_text() or "")
+        # 해석한 객체(디코딩된 콘텐츠 스트림 포함) 캐시가 페이지마다 쌓이지 않게 비웁니다.
+        reader.resolved_objects.clear()
+    return texts
+
+
+def extract_page_range(path: str, start: int, stop: int) -> list[str]:
+    """Texts of pages `start`..`stop - 1` (1-based); runs in the worker processes."""
+
+    if _in_worker:
+        return _extract(_reader(path), start, stop)
+    # 풀 밖(예: 호출자가 준 스레드 executor)에서는 캐시를 공유하지 않고 매번 엽니다.
+    with open_pdf(path) as reader:
+        return _extract(reader, start, stop)
+
+
+def _worker_count(workers: int | None) -> int:
+    workers = workers if workers is not None else settings.pdf_extract_workers
+    return workers or os.cpu_count() or 1
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process-wide pool of `workers` processes, started on first use."""
+
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # fork는 스레드(anyio 스레드풀, 적재 프리페치)가 도는 프로세스에서 안전하지 않습니다.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            pool = _pools[workers] = ProcessPoolExecutor(
+                workers, mp_context=context, initializer=_mark_worker
+            )
+        return pool
+
+
+def shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+def iter_pdf_pages(
+    path: str | Path,
+    *,
+    start: int = 1,
+    workers: int | None = None,
+    pages_per_task: int | None = None,
+    executor: Executor | None = None,
+) -> Iterator[tuple[int, str]]:
+    """(page number, text) in page order from `start` on.
+
+    Files shorter than `pdf_parallel_min_pages` pages, or `workers=1`, are read
+    in this process because starting workers would cost more than it saves.
+    """
+
+    path = str(Path(path).resolve())
+    workers = _worker_count(workers)
+    size = pages_per_task or settings.pdf_pages_per_task
+    with open_pdf(path) as reader:
+        total = len(reader.pages)
+        serial = workers == 1 or total - start + 1 < settings.pdf_parallel_min_pages
+        if executor is None and serial:
+            for first in range(start, total + 1, size):
+                last = min(first + size, total + 1)
+                yield from zip(range(first, last), _extract(reader, first, last))
+            return
+
+    pool = executor or get_pool(workers)
+    ranges = ((first, min(first + size, total + 1)) for first in range(start, total + 1, size))
+    pending: deque[tuple[int, Future[list[str]]]] = deque()
+
+    def submit() -> None:
+        task = next(ranges, None)
+        if task is not None:
+            pending.append((task[0], pool.submit(extract_page_range, path, *task)))
+
+    try:
+        for _ in range(workers * RANGES_IN_FLIGHT_PER_WORKER):
+            submit()
+        while pending:
+            first, future = pending.popleft()
+            texts = future.result()
+            submit()
+            yield from enumerate(texts, start=first)
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def load_pdf(path: str | Path, **kwargs: Any) -> list[Any]:
+    """LangChain Documents, one per page, with `source` (file name) and `page` metadata."""
+
+    document = require("langchain_core.documents", "langchain-core").Document
+    name = Path(path).name
+    return [
+        document(page_content=text, metadata={"source": name, "page": number})
+        for number, text in iter_pdf_pages(path, **kwargs)
+    ]
@@ -0,0 +1,334 @@
+"""Content-addressed embedding cache in front of an embeddings client.
+
+Vectors are keyed by (model, dimensions, sha256(text)), so re-ingesting an
+unchanged chunk never reaches the API again. Lookups go through a small
+in-process LRU and then one batched query against the `embedding_cache`
+table. That table lives in Postgres, or in a local SQLite file with
+EMBEDDING_CACHE_BACKEND=disk. Vectors are stored as float32 (4 bytes per
+dimension), which is well inside the precision the models return.
+"""
+import asyncio
+import hashlib
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+
+from sqlalchemy import create_engine, delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+# IN 목록 하나에 넣는 키 수
+LOOKUP_CHUNK_SIZE = 500
+# 적중한 행의 last_used_at은 이 간격보다 오래됐을 때만 갱신해 읽기마다 쓰지 않게 합니다.
+TOUCH_INTERVAL = timedelta(hours=1)
+
+_table = EmbeddingCacheEntry.__table__
+
+
+class EmbeddingsClient(Protocol):
+    """The part of LangChain's `Embeddings` interface the cache needs."""
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]: ...
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    packed = array("f", vector)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_vector(data: bytes) -> list[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    if sys.byteorder == "big":
+        vector.byteswap()
+    return vector.tolist()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _insert(engine: Engine):
+    if engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert
+    return pg_insert
+
+
+class EmbeddingStore:
+    """`embedding_cache` table access with batched lookup and LRU trimming."""
+
+    def __init__(self, engine: Engine, max_entries: int) -> None:
+        self.engine = engine
+        self.max_entries = max_entries
+        self.evictions = 0
+        # 저장할 때마다 정리 쿼리를 돌리지 않도록, 이만큼 새로 저장한 뒤에 상한을 검사합니다.
+        self._evict_every = max(100, max_entries // 100)
+        self._stored_since_evict = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path: str | Path, max_entries: int) -> "EmbeddingStore":
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        engine = create_engine(f"sqlite:///{path}")
+        _table.create(engine, checkfirst=True)
+        return cls(engine, max_entries)
+
+    def get_many(
+        self, model: str, dimensions: int, digests: Sequence[bytes]
+    ) -> dict[bytes, bytes]:
+        found: dict[bytes, bytes] = {}
+        stale: list[bytes] = []
+        touch_before = _now() - TOUCH_INTERVAL
+        with self.engine.begin() as conn:
+            for start in range(0, len(digests), LOOKUP_CHUNK_SIZE):
+                chunk = digests[start : start + LOOKUP_CHUNK_SIZE]
+                rows = conn.execute(
+                    select(_table.c.text_sha256, _table.c.vector, _table.c.last_used_at).where(
+                        _table.c.model == model,
+                        _table.c.dimensions == dimensions,
+                        _table.c.text_sha256.in_(chunk),
+                    )
+                )
+                for digest, vector, last_used_at in rows:
+                    found[digest] = vector
+                    if last_used_at.tzinfo is None:
+                        # SQLite는 시간대 정보를 돌려주지 않습니다.
+                        last_used_at = last_used_at.replace(tzinfo=timezone.utc)
+                    if last_used_at < touch_before:
+                        stale.append(digest)
+            for start in range(0, len(stale), LOOKUP_CHUNK_SIZE):
+                conn.execute(
+                    update(_table)
+                    .where(
+                        _table.c.model == model,
+                        _table.c.dimensions == dimensions,
+                        _table.c.text_sha256.in_(stale[start : start + LOOKUP_CHUNK_SIZE]),
+                    )
+                    .values(last_used_at=_now())
+                )
+        return found
+
+    def put_many(self, model: str, dimensions: int, vectors: dict[bytes, bytes]) -> None:
+        if not vectors:
+            return
+        now = _now()
+        rows = [
+            {
+                "model": model,
+                "dimensions": dimensions,
+                "text_sha256": digest,
+                "vector": vector,
+                "last_used_at": now,
+            }
+            for digest, vector in vectors.items()
+        ]
+        insert = _insert(self.engine)
+        with self.engine.begin() as conn:
+            # 다른 워커가 같은 텍스트를 먼저 저장했으면 그대로 둡니다.
+            conn.execute(insert(_table).on_conflict_do_nothing(), rows)
+        with self._lock:
+            self._stored_since_evict += len(rows)
+            due = self._stored_since_evict >= self._evict_every
+            if due:
+                self._stored_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete the least recently used rows beyond `max_entries`; returns rows removed."""
+
+        key = tuple_(_table.c.model, _table.c.dimensions, _table.c.text_sha256)
+        removed = 0
+        with self.engine.begin() as conn:
+            while True:
+                victims = conn.execute(
+                    select(_table.c.model, _table.c.dimensions, _table.c.text_sha256)
+                    .order_by(_table.c.last_used_at.desc())
+                    .offset(self.max_entries)
+                    .limit(LOOKUP_CHUNK_SIZE)
+                ).all()
+                if not victims:
+                    break
+                conn.execute(delete(_table).where(key.in_([tuple(row) for row in victims])))
+                removed += len(victims)
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+
+class CachedEmbeddings:
+    """Embeddings client wrapper that only sends texts it has never embedded before.
+
+    Implements `embed_documents` / `embed_query` (and the async variants), so
+    it can be passed wherever LangChain expects an `Embeddings` object, e.g.
+    `PGVector(embeddings=...)`.
+    """
+
+    def __init__(
+        self,
+        client: EmbeddingsClient,
+        model: str,
+        dimensions: int | None = None,
+        store: EmbeddingStore | None = None,
+        memory_entries: int = 2000,
+        batch_size: int | None = 256,
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.dimensions = dimensions or 0
+        self.store = store
+        self.memory_entries = memory_entries
+        self.batch_size = batch_size
+        self._memory: OrderedDict[bytes, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("texts", "memory_hits", "store_hits", "misses", "api_calls", "memory_evictions"), 0
+        )
+
+    def _incr(self, **amounts: int) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                self._counters[name] += amount
+
+    def _remember(self, vectors: dict[bytes, bytes]) -> None:
+        evicted = 0
+        with self._lock:
+            for digest, vector in vectors.items():
+                self._memory[digest] = vector
+                self._memory.move_to_end(digest)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+                evicted += 1
+            self._counters["memory_evictions"] += evicted
+
+    def _lookup_memory(self, digests: Sequence[bytes]) -> dict[bytes, bytes]:
+        found = {}
+        with self._lock:
+            for digest in digests:
+                vector = self._memory.get(digest)
+                if vector is not None:
+                    self._memory.move_to_end(digest)
+                    found[digest] = vector
+        return found
+
+    def _embed_missing(self, texts: dict[bytes, str]) -> dict[bytes, bytes]:
+        digests = list(texts)
+        vectors: dict[bytes, bytes] = {}
+        # batch_size가 None이면 클라이언트(EmbeddingPipeline)가 직접 배치를 나눕니다.
+        batch_size = self.batch_size or len(digests)
+        for start in range(0, len(digests), batch_size):
+            batch = digests[start : start + batch_size]
+            embedded = self.client.embed_documents([texts[digest] for digest in batch])
+            self._incr(api_calls=1)
+            vectors.update(zip(batch, map(pack_vector, embedded)))
+        return vectors
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        digests = [text_digest(text) for text in texts]
+        # 같은 배치 안의 중복 텍스트는 한 번만 조회·요청합니다.
+        unique = dict(zip(digests, texts))
+        vectors = self._lookup_memory(list(unique))
+        memory_hits = len(vectors)
+
+        pending = [digest for digest in unique if digest not in vectors]
+        store_hits = 0
+        if pending and self.store is not None:
+            stored = self.store.get_many(self.model, self.dimensions, pending)
+            store_hits = len(stored)
+            vectors.update(stored)
+            self._remember(stored)
+
+        missing = {digest: unique[digest] for digest in unique if digest not in vectors}
+        if missing:
+            embedded = self._embed_missing(missing)
+            if self.store is not None:
+                self.store.put_many(self.model, self.dimensions, embedded)
+            vectors.update(embedded)
+            self._remember(embedded)
+
+        self._incr(
+            texts=len(texts), memory_hits=memory_hits, store_hits=store_hits, misses=len(missing)
+        )
+        return [unpack_vector(vectors[digest]) for digest in digests]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await asyncio.to_thread(self.embed_query, text)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._memory)
+        lookups = counters["memory_hits"] + counters["store_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["store_hits"]
+        return {
+            "model": self.model,
+            "dimensions": self.dimensions,
+            "backend": self.store.engine.dialect.name if self.store is not None else "none",
+            "memory_size": size,
+            **counters,
+            "store_evictions": self.store.evictions if self.store is not None else 0,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+def _default_store() -> EmbeddingStore | None:
+    backend = settings.embedding_cache_backend
+    if backend == "postgres":
+        from app.db.session import engine
+
+        return EmbeddingStore(engine, settings.embedding_cache_max_entries)
+    if backend == "disk":
+        return EmbeddingStore.for_path(
+            settings.embedding_cache_path, settings.embedding_cache_max_entries
+        )
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown embedding cache backend: {backend}")
+
+
+def embeddings_stats() -> dict[str, object] | None:
+    """Counters of the process-wide client, without creating it just to report."""
+
+    if get_embeddings.cache_info().currsize == 0:
+        return None
+    return get_embeddings().stats()
+
+
+@lru_cache
+def get_embeddings() -> CachedEmbeddings:
+    """Process-wide cached `text_embedding_model` client."""
+
+    from app.services.embedding_pipeline import build_pipeline
+
+    return CachedEmbeddings(
+        build_pipeline(settings.text_embedding_model),
+        model=settings.text_embedding_model,
+        dimensions=settings.embedding_dimensions,
+        store=_default_store(),
+        memory_entries=settings.embedding_cache_memory_entries,
+        batch_size=None,
+    )
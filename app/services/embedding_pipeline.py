@@ -0,0 +1,469 @@
+"""Batched, concurrent, rate-limit-aware client for the OpenAI embeddings API.
+
+Texts are packed into batches under the per-request limits (inputs, total
+tokens, tokens per input). Batches are sent with bounded asyncio
+concurrency. Before each request, admission checks the remaining
+request/token budget taken from the `x-ratelimit-*` headers of the previous
+responses. When the budget is spent, all workers wait until it has refilled
+instead of collecting 429s. A 429 or 5xx response is retried with
+backoff. The whole pipeline pauses on a 429 so it does not keep hammering.
+
+The limiter and HTTP connections belong to the pipeline, not to one call, so
+many small calls (cache misses, ingestion micro-batches) still start from
+the budget the previous responses reported. Sync callers share one
+background event loop for the same reason.
+"""
+import asyncio
+import base64
+import email.utils
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.config import settings
+from app.core.lazy import require
+from app.services.embedding import unpack_vector
+
+logger = logging.getLogger(__name__)
+
+# OpenAI 임베딩 API의 요청당 상한
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+MAX_TOKENS_PER_INPUT = 8191
+
+TokenCounter = Callable[[str], int]
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def utf8_token_bound(text: str) -> int:
+    """Upper bound on BPE tokens: every token covers at least one UTF-8 byte."""
+
+    return max(1, len(text.encode("utf-8")))
+
+
+def default_token_counter(model: str) -> TokenCounter:
+    """tiktoken counter for `model`; falls back to the UTF-8 byte bound if unavailable."""
+
+    try:
+        tiktoken = require("tiktoken")
+        encoding = tiktoken.encoding_for_model(model)
+    except Exception as exc:  # 미설치, 알 수 없는 모델, 인코딩 파일 다운로드 실패
+        logger.warning("tiktoken unavailable for %s (%s); using UTF-8 byte bound", model, exc)
+        return utf8_token_bound
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def parse_reset(value: str | None) -> float | None:
+    """Seconds in an `x-ratelimit-reset-*` value such as `1s`, `6m0s` or `20ms`."""
+
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds in a `Retry-After` value: delta-seconds or an HTTP-date; None if unparsable."""
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+@dataclass
+class Batch:
+    indices: list[int]
+    texts: list[str]
+    tokens: int
+
+
+def pack_batches(
+    texts: Sequence[str],
+    count_tokens: TokenCounter,
+    max_inputs: int = MAX_INPUTS_PER_REQUEST,
+    max_tokens: int = MAX_TOKENS_PER_REQUEST,
+) -> list[Batch]:
+    """Greedy, order-preserving packing of texts into request-sized batches."""
+
+    batches: list[Batch] = []
+    current = Batch([], [], 0)
+    for index, text in enumerate(texts):
+        tokens = count_tokens(text)
+        if tokens > MAX_TOKENS_PER_INPUT:
+            raise ValueError(
+                f"input {index} has {tokens} tokens (limit {MAX_TOKENS_PER_INPUT}); split it first"
+            )
+        if current.texts and (
+            len(current.texts) >= max_inputs or current.tokens + tokens > max_tokens
+        ):
+            batches.append(current)
+            current = Batch([], [], 0)
+        current.indices.append(index)
+        current.texts.append(text)
+        current.tokens += tokens
+    if current.texts:
+        batches.append(current)
+    return batches
+
+
+class RateLimiter:
+    """Admission control from the server's remaining request/token budget.
+
+    The budget is unknown until the first response arrives. After that, every
+    admitted request subtracts its estimate locally, so concurrent workers do
+    not all spend the same remaining tokens. Each response header then
+    replaces the estimate. With `x-ratelimit-limit-*` known, the budget refills
+    continuously at limit/60 per second like the server's; otherwise it is
+    assumed full again at the advertised reset.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.clock = clock
+        self.sleep = sleep
+        self.paused_until = 0.0
+        self.waited_s = 0.0
+        # 종류("requests"/"tokens")별 (남은 양, 분당 한도, 갱신 시각, 리셋 시각)
+        self._budget: dict[str, list] = {}
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        now = self.clock()
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            reset = parse_reset(headers.get(f"x-ratelimit-reset-{kind}"))
+            self._budget[kind] = [
+                float(remaining),
+                float(limit) if limit else None,
+                now,
+                now + reset if reset is not None else now,
+            ]
+
+    def remaining(self, kind: str) -> float | None:
+        """Estimated budget right now; None while unknown."""
+
+        budget = self._budget.get(kind)
+        if budget is None:
+            return None
+        remaining, limit, updated_at, reset_at = budget
+        now = self.clock()
+        if limit:
+            return min(limit, remaining + (now - updated_at) * limit / 60)
+        return None if now >= reset_at else remaining
+
+    def pause(self, seconds: float) -> None:
+        # 429를 받으면 다른 워커도 함께 멈춥니다.
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+    def _delay(self, kind: str, amount: float) -> float:
+        available = self.remaining(kind)
+        if available is None or available >= amount:
+            return 0.0
+        _, limit, _, reset_at = self._budget[kind]
+        if limit:
+            # 한 요청이 한도보다 크면 가득 찰 때까지만 기다립니다.
+            return (min(amount, limit) - available) / (limit / 60)
+        return reset_at - self.clock()
+
+    def delay(self, tokens: int) -> float:
+        now = self.clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+        return max(self._delay("requests", 1), self._delay("tokens", tokens))
+
+    def _spend(self, kind: str, amount: float) -> None:
+        available = self.remaining(kind)
+        if available is not None:
+            budget = self._budget[kind]
+            budget[0] = available - amount
+            budget[2] = self.clock()
+
+    def _loop_lock(self) -> asyncio.Lock:
+        # asyncio.Lock은 처음 쓴 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듭니다.
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self, tokens: int) -> None:
+        # 잠금을 쥔 채로 기다려 요청이 도착 순서대로 들어가게 합니다.
+        async with self._loop_lock():
+            while (delay := self.delay(tokens)) > 0:
+                self.waited_s += delay
+                await self.sleep(delay)
+            self._spend("requests", 1)
+            self._spend("tokens", tokens)
+
+
+class EmbeddingAPIError(RuntimeError):
+    pass
+
+
+@dataclass
+class PipelineStats:
+    texts: int = 0
+    tokens: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    elapsed_s: float = 0.0
+    waited_s: float = 0.0
+    # 프로세스 수명 동안 쌓이지 않도록 배치별 값 대신 개수와 최댓값만 둡니다.
+    batches: int = 0
+    max_batch_tokens: int = 0
+
+    @property
+    def tokens_per_minute(self) -> float:
+        return self.tokens / self.elapsed_s * 60 if self.elapsed_s else 0.0
+
+
+class EmbeddingPipeline:
+    """Embeds any number of texts through token-budgeted, concurrent API batches.
+
+    `embed` is the async entry point. `embed_documents` runs it on a background
+    event loop from sync code (any thread), so the pipeline can be the client
+    behind `CachedEmbeddings`. The rate-limit budget and connection pool are
+    kept across calls; `close()` releases them.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        api_key: str | None = None,
+        base_url: str = "https://api.openai.com/v1",
+        dimensions: int | None = None,
+        concurrency: int = 4,
+        max_batch_inputs: int = MAX_INPUTS_PER_REQUEST,
+        max_batch_tokens: int = MAX_TOKENS_PER_REQUEST,
+        max_retries: int = 6,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 60.0,
+        timeout_s: float = 60.0,
+        token_counter: TokenCounter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.dimensions = dimensions
+        self.concurrency = concurrency
+        self.max_batch_inputs = min(max_batch_inputs, MAX_INPUTS_PER_REQUEST)
+        self.max_batch_tokens = min(max_batch_tokens, MAX_TOKENS_PER_REQUEST)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.timeout_s = timeout_s
+        self.count_tokens = token_counter or default_token_counter(model)
+        self.transport = transport
+        self.stats = PipelineStats()
+        self.limiter = limiter or RateLimiter()
+        # httpx 연결 풀은 이벤트 루프에 묶이므로 루프별로 하나씩 재사용합니다.
+        self._clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._runner: asyncio.AbstractEventLoop | None = None
+        self._runner_lock = threading.Lock()
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            for stale in [other for other in self._clients if other.is_closed()]:
+                del self._clients[stale]
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            client = self._clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout_s,
+                transport=self.transport,
+            )
+        return client
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        if response is not None:
+            headers = response.headers
+            retry_after_ms = parse_retry_after(headers.get("retry-after-ms"))
+            if retry_after_ms is not None:
+                return retry_after_ms / 1000
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            if retry_after is not None:
+                return retry_after
+            reset = parse_reset(headers.get("x-ratelimit-reset-tokens"))
+            if reset:
+                return reset
+        # 지수 백오프 + 지터(동시에 깨어난 워커가 한꺼번에 재시도하지 않게)
+        delay = min(self.backoff_max_s, self.backoff_base_s * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _send(self, client: httpx.AsyncClient, batch: Batch) -> list[bytes]:
+        payload: dict[str, object] = {
+            "model": self.model,
+            "input": batch.texts,
+            "encoding_format": "base64",
+        }
+        if self.dimensions:
+            payload["dimensions"] = self.dimensions
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(batch.tokens)
+            response = None
+            try:
+                response = await client.post("/embeddings", json=payload)
+            except httpx.TransportError as exc:
+                error: object = exc
+            else:
+                self.stats.requests += 1
+                self.limiter.update(response.headers)
+                if response.status_code == 200:
+                    data = sorted(response.json()["data"], key=lambda item: item["index"])
+                    return [base64.b64decode(item["embedding"]) for item in data]
+                if response.status_code == 429:
+                    self.stats.throttled += 1
+                elif response.status_code < 500:
+                    raise EmbeddingAPIError(
+                        f"embeddings request failed ({response.status_code}): {response.text}"
+                    )
+                error = response.status_code
+            if attempt == self.max_retries:
+                raise EmbeddingAPIError(f"embeddings request failed after retries: {error}")
+            delay = self._backoff(attempt, response)
+            self.stats.retries += 1
+            logger.info("embedding batch retry %d in %.2fs (%s)", attempt + 1, delay, error)
+            if response is not None and response.status_code == 429:
+                # 다음 acquire가 모든 워커와 함께 멈춘 시간만큼 기다립니다.
+                self.limiter.pause(delay)
+            else:
+                await self.limiter.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def embed_packed(self, texts: Sequence[str]) -> list[bytes]:
+        """float32 little-endian vectors (the API's base64 payload) in input order."""
+
+        started = time.perf_counter()
+        waited = self.limiter.waited_s
+        batches = pack_batches(
+            texts, self.count_tokens, self.max_batch_inputs, self.max_batch_tokens
+        )
+        results: list[bytes | None] = [None] * len(texts)
+        queue: asyncio.Queue[Batch] = asyncio.Queue()
+        for batch in batches:
+            queue.put_nowait(batch)
+        client = self._client()
+
+        async def worker() -> None:
+            while not queue.empty():
+                batch = queue.get_nowait()
+                vectors = await self._send(client, batch)
+                for index, vector in zip(batch.indices, vectors):
+                    results[index] = vector
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(min(self.concurrency, len(batches))):
+                    group.create_task(worker())
+        except ExceptionGroup as errors:
+            # 첫 실패를 그대로 올려 호출자가 EmbeddingAPIError로 처리할 수 있게 합니다.
+            raise errors.exceptions[0] from None
+
+        self.stats.texts += len(texts)
+        self.stats.tokens += sum(batch.tokens for batch in batches)
+        self.stats.batches += len(batches)
+        self.stats.max_batch_tokens = max(
+            self.stats.max_batch_tokens, *(batch.tokens for batch in batches), 0
+        )
+        self.stats.elapsed_s += time.perf_counter() - started
+        self.stats.waited_s += self.limiter.waited_s - waited
+        return results  # type: ignore[return-value]
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        return [unpack_vector(vector) for vector in await self.embed_packed(texts)]
+
+    def _run(self, coroutine):
+        with self._runner_lock:
+            if self._runner is None:
+                loop = asyncio.new_event_loop()
+
+                def serve() -> None:
+                    loop.run_forever()
+                    loop.close()
+
+                threading.Thread(target=serve, name="embedding-pipeline", daemon=True).start()
+                self._runner = loop
+            runner = self._runner
+        return asyncio.run_coroutine_threadsafe(coroutine, runner).result()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._run(self.embed(texts))
+        raise RuntimeError("embed_documents() called from a running event loop; await embed()")
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.embed(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.embed([text]))[0]
+
+    async def aclose(self) -> None:
+        """Closes the connections opened on the running event loop."""
+
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Closes the background loop used by the sync methods and its connections."""
+
+        with self._runner_lock:
+            runner, self._runner = self._runner, None
+        if runner is not None:
+            asyncio.run_coroutine_threadsafe(self.aclose(), runner).result()
+            runner.call_soon_threadsafe(runner.stop)
+
+
+def build_pipeline(model: str | None = None) -> EmbeddingPipeline:
+    """Pipeline configured from settings (OPENAI_BASE_URL, EMBEDDING_* limits)."""
+
+    return EmbeddingPipeline(
+        model or settings.text_embedding_model,
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        dimensions=settings.embedding_dimensions,
+        concurrency=settings.embedding_concurrency,
+        max_batch_inputs=settings.embedding_batch_size,
+        max_batch_tokens=settings.embedding_max_batch_tokens,
+        max_retries=settings.embedding_max_retries,
+    )
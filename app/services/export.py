@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import Select, select
+
+from app.db.session import AsyncSessionLocal, get_session
+from app.models.customer import Customer
+from app.models.product_order import ProductOrder
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# 서버 측 커서에서 한 번에 가져오는 행 수와 네트워크로 내보내는 청크 크기
+FETCH_SIZE = 2000
+CHUNK_BYTES = 64 * 1024
+
+ORDER_EXPORT_COLUMNS = (
+    ProductOrder.id,
+    ProductOrder.order_number,
+    ProductOrder.product_name,
+    ProductOrder.shipping_address,
+    ProductOrder.shipping_status,
+    ProductOrder.remark,
+)
+CUSTOMER_EXPORT_COLUMNS = (
+    Customer.id,
+    Customer.name,
+    Customer.email,
+    Customer.phone,
+    Customer.created_at,
+)
+
+
+def order_export_statement(shipping_status: str | None = None) -> Select:
+    statement = select(*ORDER_EXPORT_COLUMNS).order_by(ProductOrder.id)
+    if shipping_status is not None:
+        statement = statement.where(ProductOrder.shipping_status == shipping_status)
+    return statement
+
+
+def customer_export_statement(
+    created_from: datetime | None = None, created_to: datetime | None = None
+) -> Select:
+    statement = select(*CUSTOMER_EXPORT_COLUMNS).order_by(Customer.created_at, Customer.id)
+    if created_from is not None:
+        statement = statement.where(Customer.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Customer.created_at < created_to)
+    return statement
+
+
+def _plain(value: object) -> object:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class _RowEncoder:
+    """Encodes plain row tuples into NDJSON or CSV byte chunks of ~CHUNK_BYTES."""
+
+    def __init__(self, fmt: ExportFormat, names: Sequence[str]) -> None:
+        self.fmt = fmt
+        self.names = tuple(names)
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer) if fmt == "csv" else None
+
+    def header(self) -> None:
+        if self._csv is not None:
+            self._csv.writerow(self.names)
+
+    def write(self, row: Sequence[object]) -> bytes | None:
+        if self._csv is not None:
+            self._csv.writerow([_plain(value) for value in row])
+        else:
+            record = {name: _plain(value) for name, value in zip(self.names, row)}
+            self._buffer.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            self._buffer.write("\n")
+        if self._buffer.tell() >= CHUNK_BYTES:
+            return self.flush()
+        return None
+
+    def flush(self) -> bytes:
+        chunk = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+def encode_rows(
+    rows: Iterable[Sequence[object]], names: Sequence[str], fmt: ExportFormat
+) -> Iterator[bytes]:
+    encoder = _RowEncoder(fmt, names)
+    encoder.header()
+    for row in rows:
+        chunk = encoder.write(row)
+        if chunk:
+            yield chunk
+    tail = encoder.flush()
+    if tail:
+        yield tail
+
+
+def stream_export(statement: Select, fmt: ExportFormat) -> Iterator[bytes]:
+    """Run `statement` on its own session through a server-side cursor.
+
+    The session lives as long as the generator, so it can back a
+    StreamingResponse after the request's dependencies have been closed.
+    """
+
+    with get_session() as db:
+        result = db.execute(statement.execution_options(yield_per=FETCH_SIZE))
+        rows = (row for partition in result.partitions() for row in partition)
+        yield from encode_rows(rows, list(result.keys()), fmt)
+
+
+async def stream_export_async(statement: Select, fmt: ExportFormat) -> AsyncIterator[bytes]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async export requested but DB_ASYNC_MODE is disabled")
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=FETCH_SIZE))
+        encoder = _RowEncoder(fmt, list(result.keys()))
+        encoder.header()
+        async for partition in result.partitions():
+            for row in partition:
+                chunk = encoder.write(row)
+                if chunk:
+                    yield chunk
+        tail = encoder.flush()
+        if tail:
+            yield tail
@@ -0,0 +1,762 @@
+"""Streaming document ingestion: load → split → embed → upsert.
+
+Each stage is a generator that pulls from the previous one. At any time only
+one page, one embedding micro-batch being filled, `embed_concurrency`
+micro-batches being embedded, `prefetch` embedded batches and one upsert
+batch are in memory, however large the input is. Micro-batches are embedded
+concurrently while the next pages are split, so the embeddings client keeps
+several requests in flight. Embedding runs in a worker thread ahead of the
+writer through a bounded queue. When writes fall behind, the queue fills and
+embedding blocks (backpressure) instead of buffering more chunks.
+
+Chunk ids come from (source key, page, chunk index), so a re-run upserts
+rather than duplicates. The source key is the resolved path, relative to
+`root` when the file is under it, so `docs`, `./docs` and `/abs/docs` name the
+same document. After each upsert batch, the last committed position per
+source is saved to a checkpoint file. A resumed run skips finished sources,
+and it skips committed pages without extracting them.
+
+Incremental mode (`manifest=`) re-indexes changed documents at chunk level.
+Chunk ids come from the chunk text's sha256 instead, and the
+`ingestion_manifest` table remembers every chunk written per document. On
+re-ingest, unchanged chunks are neither embedded nor written. Chunks that
+only moved (same text, other page) are rewritten so their metadata is right;
+their vectors come from the embedding cache. Chunks no longer present are
+deleted from the vector store in one batch once the document is done. In
+this mode a changed document is always re-read from its first page; the
+manifest, not the checkpoint, makes that cheap.
+
+The two modes use different chunk ids, so one collection must be written by
+only one of them. `build_ingestor` refuses incremental mode on a collection
+that already holds vectors but has no manifest. To migrate, rebuild it once
+with `recreate=True` (CLI: `--incremental --recreate`). That empties the
+collection and re-ingests everything. Unchanged texts are served by the
+embedding cache, so the rebuild costs the writes, not the API calls.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.lazy import require
+from app.models.ingestion_manifest import IngestionManifestEntry
+from app.services.document_loader import iter_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SUFFIXES = (".pdf", ".txt", ".md")
+# 텍스트 파일은 이 글자 수에서 두 배 사이의 줄 단위 블록을 한 "페이지"로 읽습니다.
+TEXT_PAGE_CHARS = 100_000
+CHUNK_NAMESPACE = uuid.UUID("5b0f6d1e-3c1a-4e55-9a57-3f0f4c2b8e11")
+
+# IN 목록 하나에 넣는 id 수
+DELETE_CHUNK_SIZE = 500
+
+T = TypeVar("T")
+
+_manifest = IngestionManifestEntry.__table__
+
+
+class Splitter(Protocol):
+    """LangChain `TextSplitter` subset (TokenTextSplitter, RecursiveCharacterTextSplitter)."""
+
+    def split_text(self, text: str) -> list[str]: ...
+
+
+class EmbeddingsClient(Protocol):
+    def embed_documents(self, texts: list[str]) -> list[list[float]]: ...
+
+
+class VectorSink(Protocol):
+    """`VectorStore.add_embeddings`, e.g. PGVector, which upserts by id."""
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict] | None = None,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]: ...
+
+    def delete(self, ids: list[str] | None = None, **kwargs: Any) -> Any: ...
+
+
+# chunk_id -> (본문 sha256, 페이지, 청크 인덱스)
+ManifestRows = dict[str, tuple[bytes, int, int]]
+
+
+@dataclass
+class Page:
+    source: Path
+    key: str
+    fingerprint: str
+    number: int
+    text: str
+    # 재개 시 이 페이지에서 이미 커밋된 마지막 청크 인덱스
+    skip_through: int = -1
+    # 증분 모드: 이 문서의 이전 매니페스트
+    previous: ManifestRows | None = None
+
+
+@dataclass
+class Chunk:
+    id: str
+    source: Path
+    key: str
+    fingerprint: str
+    page: int
+    index: int
+    text: str
+    vector: list[float] | None = None
+    digest: bytes = b""
+
+
+@dataclass
+class SourceDone:
+    """Marker following the last chunk of a source through the pipeline."""
+
+    source: Path
+    key: str
+    fingerprint: str
+    # 증분 모드: 이전 매니페스트와 이번에 나온 청크 id
+    previous: ManifestRows | None = None
+    seen: set[str] = field(default_factory=set)
+
+
+Item = Chunk | SourceDone
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    # 단계 자체의 작업 시간과, 앞/뒤 단계를 기다린 시간(병목 판단용)
+    busy_s: float = 0.0
+    waited_s: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        rate = self.items / self.busy_s if self.busy_s else None
+        return {**asdict(self), "items_per_s": round(rate, 1) if rate else None}
+
+
+@dataclass
+class IngestionStats:
+    sources: int = 0
+    skipped_sources: int = 0
+    skipped_chunks: int = 0
+    # 증분 모드: 그대로인 청크, 위치만 바뀐 청크, 지운 청크
+    unchanged_chunks: int = 0
+    moved_chunks: int = 0
+    deleted_chunks: int = 0
+    elapsed_s: float = 0.0
+    stages: dict[str, StageStats] = field(
+        default_factory=lambda: {
+            name: StageStats() for name in ("load", "split", "embed", "upsert")
+        }
+    )
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "sources": self.sources,
+            "skipped_sources": self.skipped_sources,
+            "skipped_chunks": self.skipped_chunks,
+            "unchanged_chunks": self.unchanged_chunks,
+            "moved_chunks": self.moved_chunks,
+            "deleted_chunks": self.deleted_chunks,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "stages": {name: stage.as_dict() for name, stage in self.stages.items()},
+        }
+
+
+def iter_sources(paths: Iterable[str | Path]) -> Iterator[Path]:
+    """Files as given, and supported files under directories, in a stable order."""
+
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(
+                child
+                for child in path.rglob("*")
+                if child.is_file() and child.suffix.lower() in SOURCE_SUFFIXES
+            )
+        else:
+            yield path
+
+
+def fingerprint(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def source_key(path: Path, root: str | Path | None = None) -> str:
+    """Stable document identity: the resolved path, relative to `root` when under it."""
+
+    resolved = path.resolve()
+    if root is not None:
+        try:
+            return resolved.relative_to(Path(root).resolve()).as_posix()
+        except ValueError:
+            pass
+    return resolved.as_posix()
+
+
+def chunk_id(key: str, page: int, index: int) -> str:
+    return str(uuid.uuid5(CHUNK_NAMESPACE, f"{key}#{page}#{index}"))
+
+
+def content_chunk_id(key: str, digest: bytes, occurrence: int) -> str:
+    """Id that survives edits elsewhere in the document; `occurrence` numbers repeated texts."""
+
+    return str(uuid.uuid5(CHUNK_NAMESPACE, f"{key}#{digest.hex()}#{occurrence}"))
+
+
+def _iter_text_blocks(path: Path) -> Iterator[str]:
+    block: list[str] = []
+    size = 0
+    with path.open(encoding="utf-8") as stream:
+        for line in stream:
+            block.append(line)
+            size += len(line)
+            # 경계를 줄 내용으로 정해(content-defined) 앞부분을 고쳐도 뒤 블록 경계는 그대로 둡니다.
+            if size >= TEXT_PAGE_CHARS and (
+                zlib.crc32(line.encode("utf-8")) % 16 == 0 or size >= 2 * TEXT_PAGE_CHARS
+            ):
+                yield "".join(block)
+                block, size = [], 0
+    if block:
+        yield "".join(block)
+
+
+def iter_page_texts(path: Path, start: int = 1) -> Iterator[tuple[int, str]]:
+    """(page number, text) from `start` on; PDF pages come from the parallel loader."""
+
+    if path.suffix.lower() == ".pdf":
+        yield from iter_pdf_pages(path, start=start)
+        return
+    for number, text in enumerate(_iter_text_blocks(path), start=1):
+        if number >= start:
+            yield number, text
+
+
+class Checkpoint:
+    """Last committed (page, chunk) per source, saved atomically as JSON.
+
+    Entries are keyed by source key and remember the file's size/mtime, so a
+    changed file is ingested again from the start.
+    """
+
+    def __init__(self, path: str | Path | None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.sources: dict[str, dict[str, Any]] = {}
+        if self.path is not None and self.path.exists():
+            self.sources = json.loads(self.path.read_text(encoding="utf-8"))["sources"]
+
+    def _entry(self, key: str, fingerprint: str) -> dict[str, Any] | None:
+        entry = self.sources.get(key)
+        return entry if entry is not None and entry["fingerprint"] == fingerprint else None
+
+    def is_done(self, key: str, fingerprint: str) -> bool:
+        entry = self._entry(key, fingerprint)
+        return bool(entry and entry["done"])
+
+    def position(self, key: str, fingerprint: str) -> tuple[int, int] | None:
+        entry = self._entry(key, fingerprint)
+        return (entry["page"], entry["chunk"]) if entry else None
+
+    def commit(self, key: str, fingerprint: str, page: int, chunk: int) -> None:
+        self.sources[key] = {
+            "fingerprint": fingerprint,
+            "page": page,
+            "chunk": chunk,
+            "done": False,
+        }
+
+    def finish(self, key: str, fingerprint: str) -> None:
+        entry = self._entry(key, fingerprint)
+        if entry is None:
+            # 청크가 하나도 없는 소스
+            entry = {"fingerprint": fingerprint, "page": 0, "chunk": -1}
+            self.sources[key] = entry
+        entry["done"] = True
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"sources": self.sources}, ensure_ascii=False), "utf-8")
+        os.replace(tmp, self.path)
+
+
+class ManifestStore:
+    """Chunk manifest per document of one collection (`ingestion_manifest` table)."""
+
+    def __init__(self, engine: Engine, collection: str) -> None:
+        self.engine = engine
+        self.collection = collection
+
+    @classmethod
+    def for_path(cls, path: str | Path, collection: str) -> "ManifestStore":
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        engine = create_engine(f"sqlite:///{path}")
+        _manifest.create(engine, checkfirst=True)
+        return cls(engine, collection)
+
+    def _where(self, key: str):
+        return (_manifest.c.collection == self.collection) & (_manifest.c.source == key)
+
+    def is_empty(self) -> bool:
+        """True when no document of the collection has been written incrementally."""
+
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(_manifest.c.chunk_id)
+                .where(_manifest.c.collection == self.collection)
+                .limit(1)
+            ).first()
+        return row is None
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(_manifest).where(_manifest.c.collection == self.collection))
+
+    def load(self, key: str) -> ManifestRows:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    _manifest.c.chunk_id,
+                    _manifest.c.content_sha256,
+                    _manifest.c.page,
+                    _manifest.c.chunk,
+                ).where(self._where(key))
+            )
+            return {chunk_id: (digest, page, chunk) for chunk_id, digest, page, chunk in rows}
+
+    def put(self, chunks: Sequence[Chunk]) -> None:
+        if not chunks:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "collection": self.collection,
+                "source": chunk.key,
+                "chunk_id": chunk.id,
+                "content_sha256": chunk.digest,
+                "page": chunk.page,
+                "chunk": chunk.index,
+                "updated_at": now,
+            }
+            for chunk in chunks
+        ]
+        if self.engine.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = pg_insert
+        statement = insert(_manifest)
+        statement = statement.on_conflict_do_update(
+            index_elements=["collection", "source", "chunk_id"],
+            set_={
+                "page": statement.excluded.page,
+                "chunk": statement.excluded.chunk,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement, rows)
+
+    def delete(self, key: str, chunk_ids: Sequence[str]) -> None:
+        with self.engine.begin() as conn:
+            for start in range(0, len(chunk_ids), DELETE_CHUNK_SIZE):
+                conn.execute(
+                    delete(_manifest).where(
+                        self._where(key),
+                        _manifest.c.chunk_id.in_(chunk_ids[start : start + DELETE_CHUNK_SIZE]),
+                    )
+                )
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_END = object()
+
+
+def prefetch(items: Iterator[T], depth: int, stats: StageStats | None = None) -> Iterator[T]:
+    """Run `items` in a worker thread at most `depth` results ahead of the consumer."""
+
+    if depth <= 0:
+        yield from items
+        return
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(value: object) -> bool:
+        started = time.perf_counter()
+        while not stop.is_set():
+            try:
+                buffer.put(value, timeout=0.1)
+            except queue.Full:
+                continue
+            if stats is not None:
+                stats.waited_s += time.perf_counter() - started
+            return True
+        return False
+
+    def produce() -> None:
+        try:
+            for value in items:
+                if not put(value):
+                    return
+            put(_END)
+        except BaseException as exc:
+            put(_Failure(exc))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    worker = threading.Thread(target=produce, name="ingestion-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            value = buffer.get()
+            if value is _END:
+                return
+            if isinstance(value, _Failure):
+                raise value.error
+            yield value
+    finally:
+        # 소비자가 중간에 멈추거나 실패하면 생산자도 멈춥니다.
+        stop.set()
+        worker.join()
+
+
+class DocumentIngestor:
+    """Streams files into a vector store with bounded memory and resumable progress."""
+
+    def __init__(
+        self,
+        sink: VectorSink,
+        embeddings: EmbeddingsClient,
+        splitter: Splitter | None = None,
+        *,
+        checkpoint: Checkpoint | None = None,
+        embed_batch_size: int = 256,
+        embed_concurrency: int = 1,
+        upsert_batch_size: int = 500,
+        prefetch: int = 2,
+        metadata: dict[str, Any] | None = None,
+        manifest: ManifestStore | None = None,
+        root: str | Path | None = None,
+    ) -> None:
+        self.sink = sink
+        self.embeddings = embeddings
+        self.splitter = splitter or require("langchain_text_splitters").TokenTextSplitter()
+        self.checkpoint = checkpoint or Checkpoint(None)
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = max(1, embed_concurrency)
+        self.upsert_batch_size = upsert_batch_size
+        self.prefetch = prefetch
+        self.metadata = metadata or {}
+        self.manifest = manifest
+        self.root = root
+        self.stats = IngestionStats()
+
+    def pages(self, sources: Iterable[Path]) -> Iterator[Page | SourceDone]:
+        stage = self.stats.stages["load"]
+        for source in sources:
+            version = fingerprint(source)
+            key = source_key(source, self.root)
+            self.stats.sources += 1
+            if self.checkpoint.is_done(key, version):
+                self.stats.skipped_sources += 1
+                continue
+            previous = None
+            if self.manifest is not None:
+                previous = self.manifest.load(key)
+                page, chunk = 1, -1
+            else:
+                page, chunk = self.checkpoint.position(key, version) or (1, -1)
+            texts = iter_page_texts(source, start=page)
+            while True:
+                started = time.perf_counter()
+                try:
+                    number, text = next(texts)
+                except StopIteration:
+                    break
+                finally:
+                    stage.busy_s += time.perf_counter() - started
+                stage.items += 1
+                skip_through = chunk if number == page else -1
+                yield Page(source, key, version, number, text, skip_through, previous)
+            yield SourceDone(source, key, version, previous)
+
+    def chunks(self, pages: Iterable[Page | SourceDone]) -> Iterator[Item]:
+        stage = self.stats.stages["split"]
+        # 증분 모드: 현재 문서에서 나온 청크 id와 같은 본문의 등장 횟수
+        seen: set[str] = set()
+        occurrences: Counter[bytes] = Counter()
+        for page in pages:
+            if isinstance(page, SourceDone):
+                page.seen = seen
+                seen, occurrences = set(), Counter()
+                yield page
+                continue
+            started = time.perf_counter()
+            texts = self.splitter.split_text(page.text) if page.text.strip() else []
+            stage.busy_s += time.perf_counter() - started
+            for index, text in enumerate(texts):
+                if index <= page.skip_through:
+                    self.stats.skipped_chunks += 1
+                    continue
+                stage.items += 1
+                if page.previous is None:
+                    yield Chunk(
+                        chunk_id(page.key, page.number, index),
+                        page.source,
+                        page.key,
+                        page.fingerprint,
+                        page.number,
+                        index,
+                        text,
+                    )
+                    continue
+                digest = hashlib.sha256(text.encode("utf-8")).digest()
+                identifier = content_chunk_id(page.key, digest, occurrences[digest])
+                occurrences[digest] += 1
+                seen.add(identifier)
+                known = page.previous.get(identifier)
+                if known == (digest, page.number, index):
+                    self.stats.unchanged_chunks += 1
+                    continue
+                if known is not None:
+                    self.stats.moved_chunks += 1
+                yield Chunk(
+                    identifier,
+                    page.source,
+                    page.key,
+                    page.fingerprint,
+                    page.number,
+                    index,
+                    text,
+                    digest=digest,
+                )
+
+    def embedded(self, items: Iterable[Item]) -> Iterator[list[Item]]:
+        """Micro-batches of `embed_batch_size` chunks in order; markers keep their position.
+
+        Up to `embed_concurrency` micro-batches are embedded at once in a thread
+        pool while the next ones are split.
+        """
+
+        stage = self.stats.stages["embed"]
+        batch: list[Item] = []
+        pending: list[Chunk] = []
+        in_flight: deque[tuple[list[Item], list[Chunk], Future | None]] = deque()
+        # 동시에 임베딩 중인 배치가 하나라도 있던 시간만 작업 시간으로 셉니다.
+        active = 0
+        active_since = 0.0
+        lock = threading.Lock()
+
+        def embed(chunks: list[Chunk]) -> list[list[float]]:
+            nonlocal active, active_since
+            with lock:
+                if active == 0:
+                    active_since = time.perf_counter()
+                active += 1
+            try:
+                return self.embeddings.embed_documents([chunk.text for chunk in chunks])
+            finally:
+                with lock:
+                    active -= 1
+                    if active == 0:
+                        stage.busy_s += time.perf_counter() - active_since
+
+        def submit() -> None:
+            nonlocal batch, pending
+            future = pool.submit(embed, pending) if pending else None
+            in_flight.append((batch, pending, future))
+            batch, pending = [], []
+
+        def collect() -> list[Item]:
+            done, chunks, future = in_flight.popleft()
+            if future is not None:
+                for chunk, vector in zip(chunks, future.result()):
+                    chunk.vector = vector
+                stage.items += len(chunks)
+            return done
+
+        pool = ThreadPoolExecutor(self.embed_concurrency, thread_name_prefix="ingestion-embed")
+        try:
+            for item in items:
+                batch.append(item)
+                if isinstance(item, Chunk):
+                    pending.append(item)
+                    if len(pending) >= self.embed_batch_size:
+                        submit()
+                        while len(in_flight) > self.embed_concurrency:
+                            yield collect()
+            if batch:
+                submit()
+            while in_flight:
+                yield collect()
+        finally:
+            for _, _, future in in_flight:
+                if future is not None:
+                    future.cancel()
+            pool.shutdown(wait=True)
+
+    def _write(self, chunks: list[Chunk], finished: list[SourceDone]) -> None:
+        stage = self.stats.stages["upsert"]
+        started = time.perf_counter()
+        if chunks:
+            self.sink.add_embeddings(
+                [chunk.text for chunk in chunks],
+                [chunk.vector for chunk in chunks],
+                metadatas=[
+                    {
+                        **self.metadata,
+                        "source": chunk.source.name,
+                        "page": chunk.page,
+                        "chunk": chunk.index,
+                    }
+                    for chunk in chunks
+                ],
+                ids=[chunk.id for chunk in chunks],
+            )
+        if self.manifest is not None:
+            self.manifest.put(chunks)
+            for marker in finished:
+                self._delete_stale(marker)
+        # 쓰기가 끝난 뒤에만 위치를 기록합니다(중간에 죽으면 이 배치부터 다시 씁니다).
+        for chunk in chunks:
+            self.checkpoint.commit(chunk.key, chunk.fingerprint, chunk.page, chunk.index)
+        for marker in finished:
+            self.checkpoint.finish(marker.key, marker.fingerprint)
+        self.checkpoint.save()
+        stage.busy_s += time.perf_counter() - started
+        stage.items += len(chunks)
+
+    def _delete_stale(self, marker: SourceDone) -> None:
+        stale = sorted(set(marker.previous or ()) - marker.seen)
+        if not stale:
+            return
+        # 벡터를 먼저 지우고 매니페스트를 지웁니다(중간에 죽어도 다음 실행이 다시 지웁니다).
+        self.sink.delete(ids=stale)
+        self.manifest.delete(marker.key, stale)
+        self.stats.deleted_chunks += len(stale)
+
+    def run(self, paths: Iterable[str | Path]) -> IngestionStats:
+        started = time.perf_counter()
+        stages = self.stats.stages
+        batches = prefetch(
+            self.embedded(self.chunks(self.pages(iter_sources(paths)))),
+            self.prefetch,
+            stats=stages["embed"],
+        )
+        chunks: list[Chunk] = []
+        finished: list[SourceDone] = []
+        try:
+            while True:
+                waited = time.perf_counter()
+                batch = next(batches, None)
+                stages["upsert"].waited_s += time.perf_counter() - waited
+                if batch is None:
+                    break
+                for item in batch:
+                    if isinstance(item, SourceDone):
+                        finished.append(item)
+                        continue
+                    chunks.append(item)
+                    if len(chunks) >= self.upsert_batch_size:
+                        self._write(chunks, finished)
+                        chunks, finished = [], []
+            if chunks or finished:
+                self._write(chunks, finished)
+        finally:
+            batches.close()
+            self.stats.elapsed_s += time.perf_counter() - started
+        logger.info("ingestion finished: %s", json.dumps(self.stats.as_dict()))
+        return self.stats
+
+
+def _has_vectors(store: Any, engine: Engine) -> bool:
+    """Whether the PGVector collection behind `store` holds any embedding."""
+
+    embedding, collection = store.EmbeddingStore, store.CollectionStore
+    query = (
+        select(embedding.id)
+        .join(collection, embedding.collection_id == collection.uuid)
+        .where(collection.name == store.collection_name)
+        .limit(1)
+    )
+    with engine.connect() as conn:
+        return conn.execute(query).first() is not None
+
+
+def build_ingestor(
+    collection: str,
+    checkpoint: str | Path | None = None,
+    incremental: bool = False,
+    recreate: bool = False,
+    **kwargs: Any,
+) -> DocumentIngestor:
+    """Ingestor writing to the PGVector `collection` through the cached embeddings client.
+
+    With `incremental`, the chunk manifest lives in the app database next to
+    the collection. `recreate` empties the collection, its manifest and the
+    checkpoint first.
+    """
+
+    from app.db.session import engine
+    from app.services.embedding import get_embeddings
+
+    pgvector = require("langchain_postgres.vectorstores", "langchain-postgres")
+    embeddings = get_embeddings()
+    sink = pgvector.PGVector(
+        embeddings=embeddings,
+        collection_name=collection,
+        connection=engine,
+        use_jsonb=True,
+    )
+    if checkpoint is None:
+        checkpoint = Path(settings.ingestion_checkpoint_dir) / f"{collection}.json"
+    manifest = ManifestStore(engine, collection)
+    if recreate:
+        sink.delete_collection()
+        sink.create_collection()
+        manifest.clear()
+        Path(checkpoint).unlink(missing_ok=True)
+    elif incremental and manifest.is_empty() and _has_vectors(sink, engine):
+        # 기본 모드의 위치 기반 id 행이 남아 내용 기반 id 행과 중복되지 않게 합니다.
+        raise ValueError(
+            f"collection {collection!r} was written without a manifest; rebuild it once "
+            "with recreate=True (--incremental --recreate) before incremental runs"
+        )
+    kwargs.setdefault("embed_batch_size", settings.ingestion_embed_batch_size)
+    kwargs.setdefault("embed_concurrency", settings.embedding_concurrency)
+    kwargs.setdefault("upsert_batch_size", settings.ingestion_upsert_batch_size)
+    kwargs.setdefault("prefetch", settings.ingestion_prefetch)
+    kwargs.setdefault("root", settings.ingestion_source_root)
+    if incremental:
+        kwargs["manifest"] = manifest
+    return DocumentIngestor(sink, embeddings, checkpoint=Checkpoint(checkpoint), **kwargs)
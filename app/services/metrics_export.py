@@ -0,0 +1,234 @@
+"""Collect worker-local metrics and aggregate them for the Prometheus endpoint."""
+import asyncio
+import logging
+
+from anyio import to_thread
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.prometheus import (
+    Families,
+    MetricFamilies,
+    SnapshotStore,
+    merge,
+    render,
+    request_metrics,
+    scaled_histogram,
+)
+from app.db.query_stats import route_db_metrics
+from app.db.session import pool_status
+from app.services.cache import get_cache
+from app.services.embedding import embeddings_stats
+
+logger = logging.getLogger(__name__)
+
+_POOL_COUNTERS = ("connects", "checkouts", "checkins", "invalidations", "timeouts")
+_POOL_GAUGES = ("size", "checked_out", "checked_in", "overflow")
+_CACHE_COUNTERS = ("hits", "misses", "sets", "invalidations", "expired")
+_EMBEDDING_COUNTERS = (
+    "texts",
+    "memory_hits",
+    "store_hits",
+    "misses",
+    "api_calls",
+    "memory_evictions",
+    "store_evictions",
+)
+
+
+def _collect_threadpool(out: MetricFamilies) -> None:
+    # 동기 핸들러는 anyio 기본 스레드풀에서 실행되므로 그 용량이 곧 동시 처리 한도입니다.
+    try:
+        limiter = to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        # 이벤트 루프 밖(예: CLI)에서는 스레드풀이 없습니다.
+        return
+    out.add(
+        "threadpool_threads_busy",
+        "gauge",
+        "Worker threads running sync handlers.",
+        limiter.borrowed_tokens,
+    )
+    out.add(
+        "threadpool_threads_limit",
+        "gauge",
+        "Worker thread capacity.",
+        limiter.total_tokens,
+    )
+    out.add(
+        "threadpool_tasks_waiting",
+        "gauge",
+        "Calls queued for a free worker thread.",
+        limiter.statistics().tasks_waiting,
+    )
+
+
+def _collect_pools(out: MetricFamilies) -> None:
+    for engine_name, pool in pool_status().items():
+        for name in _POOL_GAUGES:
+            out.add(
+                f"db_pool_{name}",
+                "gauge",
+                f"Connection pool {name.replace('_', ' ')}.",
+                pool[name],
+                engine=engine_name,
+            )
+        for name in _POOL_COUNTERS:
+            out.add(
+                f"db_pool_{name}_total",
+                "counter",
+                f"Connection pool {name}.",
+                pool[name],
+                engine=engine_name,
+            )
+        out.add(
+            "db_pool_wait_seconds",
+            "histogram",
+            "Time spent obtaining a pooled connection.",
+            scaled_histogram(pool["wait_ms"], 0.001),
+            engine=engine_name,
+        )
+
+
+def _collect_route_db(out: MetricFamilies) -> None:
+    for key, histograms in route_db_metrics.snapshot().items():
+        method, route = key.split(" ", 1)
+        out.add(
+            "http_request_db_statements",
+            "histogram",
+            "SQL statements per request.",
+            histograms["statements"],
+            method=method,
+            route=route,
+        )
+        out.add(
+            "http_request_db_seconds",
+            "histogram",
+            "Database time per request.",
+            scaled_histogram(histograms["db_ms"], 0.001),
+            method=method,
+            route=route,
+        )
+
+
+def _collect_cache(out: MetricFamilies) -> None:
+    stats = get_cache().stats()
+    backend = str(stats.get("backend", "none"))
+    for name in _CACHE_COUNTERS:
+        if name in stats:
+            out.add(
+                f"cache_{name}_total",
+                "counter",
+                f"Cache {name}.",
+                stats[name],
+                backend=backend,
+            )
+    if "evictions" not in stats:
+        return
+    if backend == "redis":
+        # Redis 서버 전역 값이라 워커 간 합산하지 않고 최댓값을 씁니다.
+        out.add(
+            "cache_server_evicted_keys",
+            "gauge",
+            "Keys evicted by the cache server.",
+            stats["evictions"],
+            agg="max",
+            backend=backend,
+        )
+    else:
+        out.add(
+            "cache_evictions_total",
+            "counter",
+            "Cache evictions.",
+            stats["evictions"],
+            backend=backend,
+        )
+    if "size" in stats:
+        out.add(
+            "cache_entries",
+            "gauge",
+            "Entries held in the worker-local cache.",
+            stats["size"],
+            backend=backend,
+        )
+
+
+def _collect_embeddings(out: MetricFamilies) -> None:
+    stats = embeddings_stats()
+    if stats is None:
+        return
+    model = str(stats["model"])
+    for name in _EMBEDDING_COUNTERS:
+        out.add(
+            f"embedding_cache_{name}_total",
+            "counter",
+            f"Embedding cache {name.replace('_', ' ')}.",
+            stats[name],
+            model=model,
+        )
+
+
+def collect_threadpool() -> Families:
+    """Thread pool gauges; must run on the event loop, not in a worker thread."""
+
+    out = MetricFamilies()
+    _collect_threadpool(out)
+    return out.families
+
+
+def collect_local(threadpool: Families | None = None) -> Families:
+    out = MetricFamilies()
+    out.families.update(threadpool or {})
+    request_metrics.collect(out)
+    _collect_pools(out)
+    _collect_route_db(out)
+    _collect_cache(out)
+    _collect_embeddings(out)
+    return out.families
+
+
+def _store() -> SnapshotStore | None:
+    if not settings.metrics_dir:
+        return None
+    # 몇 번의 기록 주기를 놓치면 종료된 워커로 봅니다.
+    return SnapshotStore(settings.metrics_dir, stale_after=settings.metrics_flush_interval * 3)
+
+
+def scrape(threadpool: Families | None = None) -> str:
+    """Prometheus exposition for every worker (or just this one without METRICS_DIR).
+
+    Blocking (snapshot files, cache server INFO); call it from a worker thread
+    and pass `collect_threadpool()` taken on the event loop.
+    """
+
+    local = collect_local(threadpool)
+    store = _store()
+    if store is None:
+        return render(local)
+    store.write(local)
+    return render(merge(store.read_all()))
+
+
+async def run_metrics_flusher(interval: float) -> None:
+    """Periodically publish this worker's snapshot so other workers' scrapes include it."""
+
+    store = _store()
+    if store is None:
+        return
+    # 같은 pid를 쓰던 이전 워커의 파일이 남아 있으면 덮어쓰기 전에 합산본으로 옮깁니다.
+    await run_in_threadpool(store.retire)
+    try:
+        while True:
+            try:
+                threadpool = collect_threadpool()
+                await run_in_threadpool(lambda: store.write(collect_local(threadpool)))
+            except Exception:
+                logger.exception("metrics snapshot write failed")
+            await asyncio.sleep(interval)
+    finally:
+        # 종료하는 워커의 카운터는 합산본에 남기고 게이지만 버립니다.
+        try:
+            store.write(collect_local())
+        except Exception:
+            logger.exception("final metrics snapshot write failed")
+        store.retire()
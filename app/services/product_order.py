@@ -1,58 +1,432 @@
 from collections.abc import Sequence
 
-from sqlalchemy import text
+from sqlalchemy import (
+    Integer,
+    Select,
+    String,
+    column,
+    delete,
+    func,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
 from app.models.product_order import ProductOrder
 from app.schemas.product_order import (
+    ProductOrderBulkItemResult,
+    ProductOrderBulkUpdate,
     ProductOrderCreate,
+    ProductOrderFilter,
     ProductOrderRead,
+    ProductOrderSort,
     ProductOrderUpdate,
 )
+from app.services.cache import entity_to_dict, get_cache
+from app.services.projection import read_columns
+
+
+def _cache_key(order_id: int) -> str:
+    return f"product_order:{order_id}"
+
+
+def _number_cache_key(order_number: str) -> str:
+    return f"product_order:number:{order_number}"
+
+
+def cached_order(order_id: int) -> ProductOrder | None:
+    """Detached `ProductOrder` built from the cache, or None on a miss."""
+
+    data = get_cache().get(_cache_key(order_id))
+    return ProductOrder(**data) if data is not None else None
+
+
+def cached_order_by_number(order_number: str) -> ProductOrder | None:
+    # 번호 키는 id만 가리키므로, 번호가 바뀐 주문은 id 항목과 비교해 걸러냅니다.
+    pointer = get_cache().get(_number_cache_key(order_number))
+    if pointer is None:
+        return None
+    order = cached_order(pointer["id"])
+    if order is None or order.order_number != order_number:
+        return None
+    return order
 
 
-def create_order(db: Session, order_in: ProductOrderCreate) -> ProductOrder:
-    order = ProductOrder(**order_in.model_dump())
-    db.add(order)
+def cache_order(order: ProductOrder) -> None:
+    cache = get_cache()
+    ttl = settings.product_order_cache_ttl
+    cache.set(_cache_key(order.id), entity_to_dict(order), ttl)
+    cache.set(_number_cache_key(order.order_number), {"id": order.id}, ttl)
+
+
+def invalidate_order(*order_ids: int) -> None:
+    get_cache().delete(*(_cache_key(order_id) for order_id in order_ids))
+
+
+def create_order(db: Session, order_in: ProductOrderCreate) -> ProductOrder | None:
+    """INSERT ... ON CONFLICT (order_number) DO NOTHING RETURNING *; None on conflict."""
+
+    order = db.scalars(
+        pg_insert(ProductOrder)
+        .values(**order_in.model_dump())
+        .on_conflict_do_nothing(index_elements=[ProductOrder.order_number])
+        .returning(ProductOrder)
+    ).first()
     db.commit()
-    db.refresh(order)
     return order
 
 
 def get_order(db: Session, order_id: int) -> ProductOrder | None:
-    return db.query(ProductOrder).filter(ProductOrder.id == order_id).first()
+    order = cached_order(order_id)
+    if order is not None:
+        return order
+    order = db.query(ProductOrder).filter(ProductOrder.id == order_id).first()
+    if order is not None:
+        cache_order(order)
+    return order
+
+
+def get_order_version(db: Session, order_id: int) -> int | None:
+    """Row version for conditional GETs, from the cache or a single-column lookup."""
+
+    order = cached_order(order_id)
+    if order is not None:
+        return order.version
+    return db.query(ProductOrder.version).filter(ProductOrder.id == order_id).scalar()
 
 
 def get_order_by_number(db: Session, order_number: str) -> ProductOrder | None:
-    return (
+    order = cached_order_by_number(order_number)
+    if order is not None:
+        return order
+    order = (
         db.query(ProductOrder)
         .filter(ProductOrder.order_number == order_number)
         .first()
     )
+    if order is not None:
+        cache_order(order)
+    return order
+
+
+CURSOR_KIND = "product_order"
+
+# 정렬 이름 -> (정렬 컬럼, 내림차순 여부). 동률은 항상 id로 끊어 키셋이 유일하게 이어집니다.
+ORDER_SORTS = {
+    "id": (ProductOrder.id, False),
+    "-id": (ProductOrder.id, True),
+    "product_name": (ProductOrder.product_name, False),
+    "-product_name": (ProductOrder.product_name, True),
+}
+
+
+def _cursor_kind(sort: ProductOrderSort) -> str:
+    # 정렬마다 키 모양이 달라 다른 정렬의 커서는 거부합니다.
+    return CURSOR_KIND if sort == "id" else f"{CURSOR_KIND}:{sort}"
+
+
+def encode_order_cursor(order: ProductOrder, sort: ProductOrderSort = "id") -> str:
+    sort_column, _ = ORDER_SORTS[sort]
+    if sort_column is ProductOrder.id:
+        return encode_cursor(_cursor_kind(sort), [order.id])
+    return encode_cursor(_cursor_kind(sort), [getattr(order, sort_column.key), order.id])
+
+
+def decode_order_cursor(token: str, sort: ProductOrderSort = "id") -> list[object]:
+    """Decode a cursor into the sort key of the last row: [id] or [value, id]."""
+
+    key = decode_cursor(token, _cursor_kind(sort))
+    sort_column, _ = ORDER_SORTS[sort]
+    size = 1 if sort_column is ProductOrder.id else 2
+    if len(key) != size or not isinstance(key[-1], int) or isinstance(key[-1], bool):
+        raise InvalidCursor("Malformed cursor")
+    if size == 2 and not isinstance(key[0], str):
+        raise InvalidCursor("Malformed cursor")
+    return key
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# 목록 조회용 투영: ProductOrderRead 필드 + ETag 계산에 쓰는 version.
+# 식별자 맵/변경 추적 없이 가벼운 Row 튜플만 만들어집니다.
+ORDER_ROW_COLUMNS = read_columns(ProductOrder, ProductOrderRead, ProductOrder.version)
+
+
+def order_search_statement(
+    filters: ProductOrderFilter | None = None,
+    after: Sequence[object] | None = None,
+    projected: bool = False,
+) -> Select:
+    """SELECT for a filtered, sorted page; `after` is a decoded cursor key.
+
+    With `projected`, rows of ORDER_ROW_COLUMNS are selected instead of entities.
+
+    Each filter maps onto an index on the model: status -> (shipping_status, id),
+    prefix -> text_pattern_ops, contains/address -> pg_trgm GIN.
+    """
+
+    filters = filters or ProductOrderFilter()
+    statement = select(*ORDER_ROW_COLUMNS) if projected else select(ProductOrder)
+    if filters.shipping_status is not None:
+        statement = statement.where(ProductOrder.shipping_status == filters.shipping_status)
+    if filters.product_name_prefix:
+        statement = statement.where(
+            ProductOrder.product_name.like(
+                _like_escape(filters.product_name_prefix) + "%", escape="\\"
+            )
+        )
+    if filters.product_name_contains:
+        statement = statement.where(
+            ProductOrder.product_name.ilike(
+                f"%{_like_escape(filters.product_name_contains)}%", escape="\\"
+            )
+        )
+    if filters.shipping_address:
+        statement = statement.where(
+            ProductOrder.shipping_address.ilike(
+                f"%{_like_escape(filters.shipping_address)}%", escape="\\"
+            )
+        )
 
+    sort_column, descending = ORDER_SORTS[filters.sort]
+    if sort_column is ProductOrder.id:
+        sort_key = ProductOrder.id
+        order_by = [ProductOrder.id.desc() if descending else ProductOrder.id]
+    else:
+        sort_key = tuple_(sort_column, ProductOrder.id)
+        order_by = (
+            [sort_column.desc(), ProductOrder.id.desc()]
+            if descending
+            else [sort_column, ProductOrder.id]
+        )
+    if after is not None:
+        bound = after[0] if sort_column is ProductOrder.id else tuple_(*after)
+        statement = statement.where(sort_key < bound if descending else sort_key > bound)
+    return statement.order_by(*order_by)
 
-def list_orders(db: Session, skip: int = 0, limit: int = 50) -> Sequence[ProductOrder]:
-    return db.query(ProductOrder).offset(skip).limit(limit).all()
+
+def list_orders(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    filters: ProductOrderFilter | None = None,
+    projected: bool = True,
+) -> Sequence[ProductOrder] | Sequence[Row]:
+    """Page of orders as plain rows; pass projected=False for tracked entities."""
+
+    statement = order_search_statement(filters, projected=projected).offset(skip).limit(limit)
+    return db.execute(statement).all() if projected else db.scalars(statement).all()
+
+
+def list_orders_after(
+    db: Session,
+    after: Sequence[object] | None,
+    limit: int = 50,
+    filters: ProductOrderFilter | None = None,
+    projected: bool = True,
+) -> Sequence[ProductOrder] | Sequence[Row]:
+    """Keyset page in `filters.sort` order, starting after the decoded cursor key."""
+
+    statement = order_search_statement(filters, after, projected).limit(limit)
+    return db.execute(statement).all() if projected else db.scalars(statement).all()
 
 
 def update_order(
-    db: Session, order: ProductOrder, order_in: ProductOrderUpdate
-) -> ProductOrder:
+    db: Session, order_id: int, order_in: ProductOrderUpdate
+) -> ProductOrder | None:
+    """UPDATE ... WHERE id = :id RETURNING *; None if the order does not exist.
+
+    A duplicate order_number surfaces as IntegrityError from the UPDATE itself.
+    """
+
     payload = order_in.model_dump(exclude_unset=True, exclude_none=True)
-    for field, value in payload.items():
-        setattr(order, field, value)
+    if not payload:
+        return get_order(db, order_id)
+    order = db.scalars(
+        update(ProductOrder)
+        .where(ProductOrder.id == order_id)
+        .values(**payload, version=ProductOrder.version + 1)
+        .returning(ProductOrder)
+        .execution_options(synchronize_session=False)
+    ).first()
     db.commit()
-    db.refresh(order)
+    invalidate_order(order_id)
     return order
 
 
-def delete_order(db: Session, order: ProductOrder) -> None:
-    db.delete(order)
+def delete_order(db: Session, order_id: int) -> bool:
+    deleted = db.execute(
+        delete(ProductOrder).where(ProductOrder.id == order_id).returning(ProductOrder.id)
+    ).first()
     db.commit()
+    invalidate_order(order_id)
+    return deleted is not None
+
+
+_order_table = ProductOrder.__table__
+_UPDATABLE_FIELDS = (
+    "order_number",
+    "product_name",
+    "shipping_address",
+    "shipping_status",
+    "remark",
+)
+
+
+def bulk_insert_statement():
+    """Multi-row INSERT ... ON CONFLICT (order_number) DO NOTHING RETURNING *.
+
+    Executed with a list of parameter sets, SQLAlchemy's insertmanyvalues
+    batches the rows into a handful of multi-VALUES statements.
+    """
+
+    return (
+        pg_insert(_order_table)
+        .on_conflict_do_nothing(index_elements=[_order_table.c.order_number])
+        .returning(*_order_table.c)
+    )
+
+
+def bulk_update_statement(items: Sequence[ProductOrderBulkUpdate]):
+    """UPDATE ... FROM (VALUES ...) RETURNING *; NULL in VALUES keeps the current value."""
+
+    columns = [column("id", Integer)] + [column(name, String) for name in _UPDATABLE_FIELDS]
+    rows = [
+        (item.id, *(getattr(item, name) for name in _UPDATABLE_FIELDS)) for item in items
+    ]
+    source = values(*columns, name="v").data(rows)
+    return (
+        update(_order_table)
+        .where(_order_table.c.id == source.c.id)
+        .values(
+            {
+                **{
+                    name: func.coalesce(source.c[name], _order_table.c[name])
+                    for name in _UPDATABLE_FIELDS
+                },
+                "version": _order_table.c.version + 1,
+            }
+        )
+        .returning(*_order_table.c)
+    )
+
+
+def bulk_delete_statement(order_ids: Sequence[int]):
+    return (
+        delete(_order_table)
+        .where(_order_table.c.id.in_(order_ids))
+        .returning(_order_table.c.id)
+    )
+
+
+def bulk_create_results(
+    orders_in: Sequence[ProductOrderCreate], rows: Sequence[Row]
+) -> list[ProductOrderBulkItemResult]:
+    inserted = {row.order_number: row for row in rows}
+    results = []
+    for index, order_in in enumerate(orders_in):
+        # 같은 배치 안의 중복 order_number는 첫 항목만 생성된 것으로 보고합니다.
+        row = inserted.pop(order_in.order_number, None)
+        if row is None:
+            results.append(ProductOrderBulkItemResult(index=index, status="conflict"))
+        else:
+            results.append(
+                ProductOrderBulkItemResult(
+                    index=index,
+                    status="created",
+                    id=row.id,
+                    order=ProductOrderRead.model_validate(row),
+                )
+            )
+    return results
+
+
+def bulk_update_results(
+    items: Sequence[ProductOrderBulkUpdate], rows: Sequence[Row]
+) -> list[ProductOrderBulkItemResult]:
+    updated = {row.id: row for row in rows}
+    results = []
+    for index, item in enumerate(items):
+        row = updated.get(item.id)
+        if row is None:
+            results.append(
+                ProductOrderBulkItemResult(index=index, status="not_found", id=item.id)
+            )
+        else:
+            results.append(
+                ProductOrderBulkItemResult(
+                    index=index,
+                    status="updated",
+                    id=row.id,
+                    order=ProductOrderRead.model_validate(row),
+                )
+            )
+    return results
+
+
+def bulk_delete_results(
+    order_ids: Sequence[int], deleted_ids: Sequence[int]
+) -> list[ProductOrderBulkItemResult]:
+    deleted = set(deleted_ids)
+    return [
+        ProductOrderBulkItemResult(
+            index=index,
+            status="deleted" if order_id in deleted else "not_found",
+            id=order_id,
+        )
+        for index, order_id in enumerate(order_ids)
+    ]
+
+
+def bulk_create_orders(
+    db: Session, orders_in: Sequence[ProductOrderCreate]
+) -> list[ProductOrderBulkItemResult]:
+    if not orders_in:
+        return []
+    rows = db.execute(
+        bulk_insert_statement(), [order_in.model_dump() for order_in in orders_in]
+    ).all()
+    db.commit()
+    return bulk_create_results(orders_in, rows)
+
+
+def bulk_update_orders(
+    db: Session, items: Sequence[ProductOrderBulkUpdate]
+) -> list[ProductOrderBulkItemResult]:
+    if not items:
+        return []
+    rows = db.execute(bulk_update_statement(items)).all()
+    db.commit()
+    invalidate_order(*(row.id for row in rows))
+    return bulk_update_results(items, rows)
+
+
+def bulk_delete_orders(
+    db: Session, order_ids: Sequence[int]
+) -> list[ProductOrderBulkItemResult]:
+    if not order_ids:
+        return []
+    deleted_ids = db.execute(bulk_delete_statement(order_ids)).scalars().all()
+    db.commit()
+    invalidate_order(*deleted_ids)
+    return bulk_delete_results(order_ids, deleted_ids)
 
 
 def fetch_complex_class_payload(db: Session, class_seq: int) -> list[dict[str, object]]:
-    """Execute a complex raw SQL example that joins many tables."""
+    """Execute a complex raw SQL example that joins many tables.
+
+    Returns the flat fan-out rows of one class; for nested, batched and cached
+    payloads use `app.services.class_catalog.get_class_payloads`.
+    """
 
     sql = text(
         """
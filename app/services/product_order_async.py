@@ -0,0 +1,164 @@
+from collections.abc import Sequence
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product_order import ProductOrder
+from app.schemas.product_order import (
+    ProductOrderBulkItemResult,
+    ProductOrderBulkUpdate,
+    ProductOrderCreate,
+    ProductOrderFilter,
+    ProductOrderUpdate,
+)
+from app.services.product_order import (  # noqa: F401  커서/벌크 SQL은 동기 서비스와 공유
+    bulk_create_results,
+    bulk_delete_results,
+    bulk_delete_statement,
+    bulk_insert_statement,
+    bulk_update_results,
+    bulk_update_statement,
+    cache_order,
+    cached_order,
+    cached_order_by_number,
+    decode_order_cursor,
+    encode_order_cursor,
+    invalidate_order,
+    order_search_statement,
+)
+
+
+async def create_order(
+    db: AsyncSession, order_in: ProductOrderCreate
+) -> ProductOrder | None:
+    result = await db.scalars(
+        pg_insert(ProductOrder)
+        .values(**order_in.model_dump())
+        .on_conflict_do_nothing(index_elements=[ProductOrder.order_number])
+        .returning(ProductOrder)
+    )
+    order = result.first()
+    await db.commit()
+    return order
+
+
+async def get_order(db: AsyncSession, order_id: int) -> ProductOrder | None:
+    order = cached_order(order_id)
+    if order is not None:
+        return order
+    order = await db.get(ProductOrder, order_id)
+    if order is not None:
+        cache_order(order)
+    return order
+
+
+async def get_order_version(db: AsyncSession, order_id: int) -> int | None:
+    order = cached_order(order_id)
+    if order is not None:
+        return order.version
+    return await db.scalar(select(ProductOrder.version).where(ProductOrder.id == order_id))
+
+
+async def get_order_by_number(db: AsyncSession, order_number: str) -> ProductOrder | None:
+    order = cached_order_by_number(order_number)
+    if order is not None:
+        return order
+    result = await db.execute(
+        select(ProductOrder).where(ProductOrder.order_number == order_number)
+    )
+    order = result.scalars().first()
+    if order is not None:
+        cache_order(order)
+    return order
+
+
+async def list_orders(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    filters: ProductOrderFilter | None = None,
+    projected: bool = True,
+) -> Sequence[ProductOrder] | Sequence[Row]:
+    statement = order_search_statement(filters, projected=projected).offset(skip).limit(limit)
+    if projected:
+        return (await db.execute(statement)).all()
+    return (await db.scalars(statement)).all()
+
+
+async def list_orders_after(
+    db: AsyncSession,
+    after: Sequence[object] | None,
+    limit: int = 50,
+    filters: ProductOrderFilter | None = None,
+    projected: bool = True,
+) -> Sequence[ProductOrder] | Sequence[Row]:
+    statement = order_search_statement(filters, after, projected).limit(limit)
+    if projected:
+        return (await db.execute(statement)).all()
+    return (await db.scalars(statement)).all()
+
+
+async def update_order(
+    db: AsyncSession, order_id: int, order_in: ProductOrderUpdate
+) -> ProductOrder | None:
+    payload = order_in.model_dump(exclude_unset=True, exclude_none=True)
+    if not payload:
+        return await get_order(db, order_id)
+    result = await db.scalars(
+        update(ProductOrder)
+        .where(ProductOrder.id == order_id)
+        .values(**payload, version=ProductOrder.version + 1)
+        .returning(ProductOrder)
+        .execution_options(synchronize_session=False)
+    )
+    order = result.first()
+    await db.commit()
+    invalidate_order(order_id)
+    return order
+
+
+async def delete_order(db: AsyncSession, order_id: int) -> bool:
+    result = await db.execute(
+        delete(ProductOrder).where(ProductOrder.id == order_id).returning(ProductOrder.id)
+    )
+    deleted = result.first()
+    await db.commit()
+    invalidate_order(order_id)
+    return deleted is not None
+
+
+async def bulk_create_orders(
+    db: AsyncSession, orders_in: Sequence[ProductOrderCreate]
+) -> list[ProductOrderBulkItemResult]:
+    if not orders_in:
+        return []
+    result = await db.execute(
+        bulk_insert_statement(), [order_in.model_dump() for order_in in orders_in]
+    )
+    rows = result.all()
+    await db.commit()
+    return bulk_create_results(orders_in, rows)
+
+
+async def bulk_update_orders(
+    db: AsyncSession, items: Sequence[ProductOrderBulkUpdate]
+) -> list[ProductOrderBulkItemResult]:
+    if not items:
+        return []
+    rows = (await db.execute(bulk_update_statement(items))).all()
+    await db.commit()
+    invalidate_order(*(row.id for row in rows))
+    return bulk_update_results(items, rows)
+
+
+async def bulk_delete_orders(
+    db: AsyncSession, order_ids: Sequence[int]
+) -> list[ProductOrderBulkItemResult]:
+    if not order_ids:
+        return []
+    deleted_ids = (await db.execute(bulk_delete_statement(order_ids))).scalars().all()
+    await db.commit()
+    invalidate_order(*deleted_ids)
+    return bulk_delete_results(order_ids, deleted_ids)
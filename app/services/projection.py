@@ -0,0 +1,13 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def read_columns(model: type, schema: type[BaseModel], *extra: Any) -> tuple[Any, ...]:
+    """Model columns for each field of a Read schema, in field order, followed by `extra`.
+
+    Selecting these instead of the entity yields plain rows that can be serialized
+    without building ORM objects or Pydantic models.
+    """
+
+    return tuple(getattr(model, name) for name in schema.model_fields) + extra
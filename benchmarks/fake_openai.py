@@ -0,0 +1,228 @@
+"""Local fake of the OpenAI embeddings endpoint with TPM/RPM rate limiting.
+
+Token buckets refill continuously like the real limits (the bucket size can
+be set below a full minute so short runs hit the limit), and every response
+carries `x-ratelimit-*` headers. Requests over budget get 429 with
+`retry-after-ms`. Vectors are deterministic per text (derived from its
+sha256), so cached and fresh embeddings can be compared.
+
+    uvicorn benchmarks.fake_openai:app --port 8900    # OPENAI_BASE_URL=http://localhost:8900/v1
+    python -m benchmarks.fake_openai --tpm 1000000 --texts 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import math
+import os
+import time
+from array import array
+from dataclasses import dataclass, field
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.services.embedding_pipeline import (
+    MAX_INPUTS_PER_REQUEST,
+    MAX_TOKENS_PER_INPUT,
+    MAX_TOKENS_PER_REQUEST,
+    utf8_token_bound,
+)
+
+
+class TokenBucket:
+    def __init__(
+        self, per_minute: float, capacity: float | None = None, clock=time.monotonic
+    ) -> None:
+        self.rate = per_minute / 60
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reset_s(self) -> float:
+        """Seconds until the bucket is full again (the API's `x-ratelimit-reset-*`)."""
+
+        return (self.capacity - self.level) / self.rate
+
+    def wait_s(self, amount: float) -> float:
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def try_take(self, amount: float) -> bool:
+        self._refill()
+        if self.level < amount:
+            return False
+        self.level -= amount
+        return True
+
+
+def _duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{math.ceil(seconds * 1000)}ms"
+    return f"{seconds:.3f}s"
+
+
+def fake_vector(text: str, dimensions: int) -> array:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return array("f", (digest[i % len(digest)] / 255 - 0.5 for i in range(dimensions)))
+
+
+@dataclass
+class FakeOpenAIStats:
+    requests: int = 0
+    throttled: int = 0
+    tokens: int = 0
+    inputs: int = 0
+    batch_sizes: list[int] = field(default_factory=list)
+
+
+def create_app(
+    tpm: float = 1_000_000,
+    rpm: float = 3_000,
+    token_burst: float | None = None,
+    request_burst: float | None = None,
+    dimensions: int = 1536,
+    latency_s: float = 0.0,
+    latency_per_1k_tokens_s: float = 0.0,
+    count_tokens=utf8_token_bound,
+    clock=time.monotonic,
+) -> Starlette:
+    """ASGI app serving POST /v1/embeddings; `app.state.stats` collects counters.
+
+    `clock` drives the token buckets, so tests can share a fake clock with the client.
+    """
+
+    tokens = TokenBucket(tpm, token_burst, clock)
+    requests = TokenBucket(rpm, request_burst, clock)
+    stats = FakeOpenAIStats()
+
+    def limit_headers() -> dict[str, str]:
+        return {
+            "x-ratelimit-limit-requests": str(int(rpm)),
+            "x-ratelimit-limit-tokens": str(int(tpm)),
+            "x-ratelimit-remaining-requests": str(int(requests.level)),
+            "x-ratelimit-remaining-tokens": str(int(tokens.level)),
+            "x-ratelimit-reset-requests": _duration(requests.reset_s()),
+            "x-ratelimit-reset-tokens": _duration(tokens.reset_s()),
+        }
+
+    def error(status: int, message: str, headers: dict[str, str] | None = None) -> JSONResponse:
+        return JSONResponse({"error": {"message": message}}, status_code=status, headers=headers)
+
+    async def embeddings(request: Request) -> JSONResponse:
+        body = await request.json()
+        inputs = body["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        counts = [count_tokens(text) for text in inputs]
+        total = sum(counts)
+        if len(inputs) > MAX_INPUTS_PER_REQUEST or total > MAX_TOKENS_PER_REQUEST:
+            return error(400, "too many inputs or tokens in one request")
+        if max(counts, default=0) > MAX_TOKENS_PER_INPUT:
+            return error(400, "input exceeds the model's context length")
+        if total > tokens.capacity:
+            return error(400, "request is larger than the token bucket")
+
+        requests._refill()
+        tokens._refill()
+        if requests.level < 1 or tokens.level < total:
+            stats.throttled += 1
+            wait = max(requests.wait_s(1), tokens.wait_s(total))
+            headers = {**limit_headers(), "retry-after-ms": str(math.ceil(wait * 1000))}
+            return error(429, "Rate limit reached", headers)
+        requests.try_take(1)
+        tokens.try_take(total)
+        stats.requests += 1
+        stats.tokens += total
+        stats.inputs += len(inputs)
+        stats.batch_sizes.append(len(inputs))
+        headers = limit_headers()
+
+        delay = latency_s + latency_per_1k_tokens_s * total / 1000
+        if delay:
+            await asyncio.sleep(delay)
+        size = body.get("dimensions") or dimensions
+        as_base64 = body.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(inputs):
+            vector = fake_vector(text, size)
+            if as_base64:
+                embedding: object = base64.b64encode(vector.tobytes()).decode()
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        payload = {
+            "object": "list",
+            "data": data,
+            "model": body["model"],
+            "usage": {"prompt_tokens": total, "total_tokens": total},
+        }
+        return JSONResponse(payload, headers=headers)
+
+    app = Starlette(routes=[Route("/v1/embeddings", embeddings, methods=["POST"])])
+    app.state.stats = stats
+    return app
+
+
+app = create_app(
+    tpm=float(os.getenv("FAKE_OPENAI_TPM", 1_000_000)),
+    rpm=float(os.getenv("FAKE_OPENAI_RPM", 3_000)),
+    latency_s=float(os.getenv("FAKE_OPENAI_LATENCY_S", 0.05)),
+)
+
+
+async def _throughput(args: argparse.Namespace) -> None:
+    import httpx
+
+    from app.services.embedding_pipeline import EmbeddingPipeline
+
+    # 버스트를 작게 잡아 정상 상태(분당 한도) 처리량을 봅니다.
+    fake = create_app(
+        tpm=args.tpm,
+        rpm=args.rpm,
+        token_burst=max(args.tpm / 30, args.batch_tokens),
+        latency_s=args.latency,
+        latency_per_1k_tokens_s=0.01,
+    )
+    pipeline = EmbeddingPipeline(
+        "text-embedding-3-small",
+        base_url="http://fake/v1",
+        concurrency=args.concurrency,
+        max_batch_tokens=args.batch_tokens,
+        token_counter=utf8_token_bound,
+        transport=httpx.ASGITransport(app=fake),
+    )
+    texts = [f"chunk {i} " + "본문 " * (50 + i % 200) for i in range(args.texts)]
+    await pipeline.embed_packed(texts)
+    await pipeline.aclose()
+    stats = pipeline.stats
+    print(f"texts          {stats.texts:>12,}")
+    print(f"tokens         {stats.tokens:>12,}  in {stats.requests} requests")
+    print(f"elapsed        {stats.elapsed_s:>12.2f} s  (waited {stats.waited_s:.2f} s)")
+    print(f"throughput     {stats.tokens_per_minute:>12,.0f} tokens/min  "
+          f"({stats.tokens_per_minute / args.tpm:.0%} of {args.tpm:,.0f} TPM)")
+    print(f"429 responses  {fake.state.stats.throttled:>12}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="embedding pipeline throughput vs. TPM limit")
+    parser.add_argument("--tpm", type=float, default=1_000_000)
+    parser.add_argument("--rpm", type=float, default=3_000)
+    parser.add_argument("--texts", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-tokens", type=int, default=20_000)
+    parser.add_argument("--latency", type=float, default=0.05, help="base seconds per request")
+    asyncio.run(_throughput(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Cold-start import-time budget for the API process.
+
+Imports `main` in fresh interpreters with `python -X importtime`, reports the
+median cumulative time and the slowest top-level imports, and fails if the
+budget is exceeded or a heavy AI/vector dependency is imported eagerly.
+
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --budget-ms 1500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 여유를 둔 기준값입니다. 의도적으로 무거운 의존성을 추가했다면 근거와 함께 올리세요.
+IMPORT_BUDGET_MS = 2500.0
+# 첫 사용 시점까지 미뤄야 하는(AI/벡터) 의존성의 최상위 모듈 이름
+LAZY_ONLY_MODULES = (
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_community",
+    "langchain_text_splitters",
+    "langchain_postgres",
+    "openai",
+    "tiktoken",
+    "faiss",
+    "numpy",
+    "pypdf",
+)
+
+
+@dataclass
+class ImportProfile:
+    total_us: int
+    # 모듈 이름 -> (self us, cumulative us)
+    modules: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    def eager_heavy_modules(self) -> list[str]:
+        return sorted(
+            name for name in self.modules if name.split(".")[0] in LAZY_ONLY_MODULES
+        )
+
+    def slowest(self, exclude: str, limit: int = 10) -> list[tuple[str, int]]:
+        top_level = {
+            name: cumulative
+            for name, (_, cumulative) in self.modules.items()
+            if "." not in name and name != exclude
+        }
+        return sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def profile_import(module: str = "main") -> ImportProfile:
+    """Import `module` in a fresh interpreter and parse its -X importtime output."""
+
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, tuple[int, int]] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return ImportProfile(total_us=modules[module][1], modules=modules)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    profile_import(args.module)  # 워밍업: .pyc 생성과 파일 캐시
+    profiles = [profile_import(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(profile.total_us for profile in profiles) / 1000
+    print(
+        f"import {args.module}: median {median_ms:.0f} ms over {args.runs} runs "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+    for name, cumulative_us in profiles[-1].slowest(exclude=args.module):
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    failed = False
+    eager = profiles[-1].eager_heavy_modules()
+    if eager:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(eager[:10])}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print("FAIL: import-time budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,496 @@
+"""CRUD load test: latency percentiles and throughput per scenario.
+
+Drives customer / product order endpoints with a fixed number of concurrent
+clients, either in-process (httpx ASGITransport, app settings and DATABASE_URL
+from the environment) or against a running server with --base-url. Each run
+is written to a JSON file so results can be diffed across commits.
+
+    python -m benchmarks.load_test run --concurrency 16 --requests 2000
+    python -m benchmarks.load_test run --scenarios customer-read,customer-read-cached
+    python -m benchmarks.load_test run --base-url http://localhost:8000 --output after.json
+    python -m benchmarks.load_test compare before.json after.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+# 캐시 적중 시나리오가 반복해서 읽는 행 수
+HOT_SET_SIZE = 16
+# 수정/조회 시나리오용으로 미리 만들어 두는 최대 행 수(요청마다 다른 행을 읽도록)
+MAX_SEED_ROWS = 20000
+SEED_BATCH_SIZE = 1000
+# 결과 파일에 함께 남기는 설정값(인프로세스 실행에서만 의미가 있습니다)
+RECORDED_SETTINGS = (
+    "db_async_mode",
+    "fast_json_responses",
+    "cache_backend",
+    "db_pool_size",
+    "db_max_overflow",
+    "db_request_stats",
+    "metrics_enabled",
+)
+
+Request = tuple[str, str, dict]
+
+
+@dataclass
+class Context:
+    """Per-run state shared by scenarios: unique tag and pre-created row ids."""
+
+    tag: str
+    bulk_size: int
+    customer_ids: list[int] = field(default_factory=list)
+    order_ids: list[int] = field(default_factory=list)
+
+    def customer_payload(self, i: int) -> dict:
+        return {"name": f"bench {i}", "email": f"bench-{self.tag}-{i}@example.com"}
+
+    def order_payload(self, i: int) -> dict:
+        return {
+            "order_number": f"BENCH-{self.tag}-{i:08d}",
+            "product_name": f"product {i % 97}",
+            "shipping_address": f"{i} Teheran-ro, Gangnam-gu, Seoul",
+            "shipping_status": "pending",
+        }
+
+    def chunk(self, ids: list[int], i: int) -> list[int]:
+        # 동시 요청끼리 서로 다른 구간을 잡아 벌크 UPDATE가 교착되지 않게 합니다.
+        chunks = len(ids) // self.bulk_size
+        start = (i % chunks) * self.bulk_size
+        return ids[start : start + self.bulk_size]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[Context, int], Request]
+    # 미리 만들어 둘 행: None | "customers" | "orders"
+    seed: str | None = None
+    # 요청마다 행을 소모(삭제)하면 요청 수만큼 새 행이 필요합니다.
+    consumes: bool = False
+    # 벌크 시나리오는 요청당 --bulk-size 행을 처리합니다.
+    bulk: bool = False
+    ok_status: tuple[int, ...] = (200, 201, 204)
+
+
+def _cycle(ids: list[int], i: int) -> int:
+    return ids[i % len(ids)]
+
+
+def _hot(ids: list[int], i: int) -> int:
+    return ids[i % min(HOT_SET_SIZE, len(ids))]
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "customer-create",
+            lambda ctx, i: ("POST", "/customers/", {"json": ctx.customer_payload(i)}),
+        ),
+        Scenario(
+            "customer-read",
+            lambda ctx, i: ("GET", f"/customers/{_cycle(ctx.customer_ids, i)}", {}),
+            seed="customers",
+        ),
+        Scenario(
+            "customer-read-cached",
+            lambda ctx, i: ("GET", f"/customers/{_hot(ctx.customer_ids, i)}", {}),
+            seed="customers",
+        ),
+        Scenario(
+            "customer-list",
+            lambda ctx, i: ("GET", "/customers/", {"params": {"limit": 50}}),
+            seed="customers",
+        ),
+        Scenario(
+            "customer-update",
+            lambda ctx, i: (
+                "PUT",
+                f"/customers/{_cycle(ctx.customer_ids, i)}",
+                {"json": {"phone": f"010-{i % 10000:04d}"}},
+            ),
+            seed="customers",
+        ),
+        Scenario(
+            "customer-delete",
+            lambda ctx, i: ("DELETE", f"/customers/{ctx.customer_ids[i]}", {}),
+            seed="customers",
+            consumes=True,
+        ),
+        Scenario(
+            "order-create",
+            lambda ctx, i: ("POST", "/product-orders/", {"json": ctx.order_payload(i)}),
+        ),
+        Scenario(
+            "order-read",
+            lambda ctx, i: ("GET", f"/product-orders/{_cycle(ctx.order_ids, i)}", {}),
+            seed="orders",
+        ),
+        Scenario(
+            "order-read-cached",
+            lambda ctx, i: ("GET", f"/product-orders/{_hot(ctx.order_ids, i)}", {}),
+            seed="orders",
+        ),
+        Scenario(
+            "order-list",
+            lambda ctx, i: ("GET", "/product-orders/", {"params": {"limit": 50}}),
+            seed="orders",
+        ),
+        Scenario(
+            "order-update",
+            lambda ctx, i: (
+                "PUT",
+                f"/product-orders/{_cycle(ctx.order_ids, i)}",
+                {"json": {"shipping_status": "shipped" if i % 2 else "pending"}},
+            ),
+            seed="orders",
+        ),
+        Scenario(
+            "order-delete",
+            lambda ctx, i: ("DELETE", f"/product-orders/{ctx.order_ids[i]}", {}),
+            seed="orders",
+            consumes=True,
+        ),
+        Scenario(
+            "order-bulk-create",
+            lambda ctx, i: (
+                "POST",
+                "/product-orders/bulk",
+                {"json": [ctx.order_payload(i * ctx.bulk_size + k) for k in range(ctx.bulk_size)]},
+            ),
+            bulk=True,
+        ),
+        Scenario(
+            "order-bulk-update",
+            lambda ctx, i: (
+                "PATCH",
+                "/product-orders/bulk",
+                {
+                    "json": [
+                        {"id": order_id, "shipping_status": "shipped" if i % 2 else "pending"}
+                        for order_id in ctx.chunk(ctx.order_ids, i)
+                    ]
+                },
+            ),
+            seed="orders",
+            bulk=True,
+        ),
+        Scenario(
+            "order-bulk-delete",
+            lambda ctx, i: (
+                "DELETE",
+                "/product-orders/bulk",
+                {"json": ctx.order_ids[i * ctx.bulk_size : (i + 1) * ctx.bulk_size]},
+            ),
+            seed="orders",
+            consumes=True,
+            bulk=True,
+        ),
+    )
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    latencies_ms: list[float], errors: int, elapsed_s: float, rows_per_request: int = 1
+) -> dict[str, float]:
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    summary = {
+        "requests": count,
+        "errors": errors,
+        "elapsed_s": round(elapsed_s, 3),
+        "rps": round(count / elapsed_s, 1) if elapsed_s else 0.0,
+        "mean_ms": round(sum(ordered) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+    if rows_per_request > 1:
+        summary["rows_per_s"] = round(summary["rps"] * rows_per_request, 1)
+    return summary
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    requests: list[Request],
+    concurrency: int,
+    ok_status: tuple[int, ...],
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    position = 0
+
+    async def worker() -> None:
+        nonlocal errors, position
+        while position < len(requests):
+            method, url, kwargs = requests[position]
+            position += 1
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code not in ok_status:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def _seed(client: httpx.AsyncClient, ctx: Context, kind: str, rows: int) -> list[int]:
+    """Create rows outside the measured phase; returns their ids."""
+
+    if kind == "orders":
+        ids: list[int] = []
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            batch = [
+                ctx.order_payload(10**7 + start + k)
+                for k in range(min(SEED_BATCH_SIZE, rows - start))
+            ]
+            response = await client.post("/product-orders/bulk", json=batch)
+            response.raise_for_status()
+            ids.extend(item["id"] for item in response.json() if item["status"] == "created")
+        return ids
+
+    # 고객에는 벌크 API가 없으므로 동시 단건 생성으로 채웁니다.
+    requests = [
+        ("POST", "/customers/", {"json": ctx.customer_payload(10**7 + i)}) for i in range(rows)
+    ]
+    ids = []
+    semaphore = asyncio.Semaphore(32)
+
+    async def create(request: Request) -> None:
+        method, url, kwargs = request
+        async with semaphore:
+            response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+
+    await asyncio.gather(*(create(request) for request in requests))
+    return sorted(ids)
+
+
+def _seed_rows(scenario: Scenario, total: int, bulk_size: int, concurrency: int) -> int:
+    rows_per_request = bulk_size if scenario.bulk else 1
+    if scenario.consumes:
+        return total * rows_per_request
+    if scenario.bulk:
+        return bulk_size * max(2 * concurrency, 4)
+    return min(total, MAX_SEED_ROWS)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    *,
+    requests: int,
+    warmup: int,
+    concurrency: int,
+    bulk_size: int,
+) -> dict[str, float]:
+    ctx = Context(tag=uuid.uuid4().hex[:8], bulk_size=bulk_size)
+    total = warmup + requests
+    if scenario.seed is not None:
+        ids = await _seed(
+            client, ctx, scenario.seed, _seed_rows(scenario, total, bulk_size, concurrency)
+        )
+        setattr(ctx, f"{scenario.seed[:-1]}_ids", ids)
+
+    built = [scenario.build(ctx, i) for i in range(total)]
+    # 워밍업: 커넥션 풀·캐시·JIT 경로를 채우고 측정에서는 제외합니다.
+    await _drive(client, built[:warmup], concurrency, scenario.ok_status)
+    latencies, errors, elapsed = await _drive(
+        client, built[warmup:], concurrency, scenario.ok_status
+    )
+    return summarize(latencies, errors, elapsed, bulk_size if scenario.bulk else 1)
+
+
+def _git_revision() -> dict[str, object]:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, check=False
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD") or None,
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+@asynccontextmanager
+async def _client(base_url: str | None):
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    from main import app
+
+    # ASGITransport는 lifespan을 실행하지 않으므로 직접 열어 스키마 점검 등을 수행합니다.
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            yield client
+
+
+async def run(
+    scenarios: list[str],
+    *,
+    requests: int,
+    warmup: int,
+    concurrency: int,
+    bulk_size: int,
+    base_url: str | None = None,
+) -> dict[str, object]:
+    """Run the given scenarios in order and return the result document."""
+
+    meta: dict[str, object] = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **_git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": base_url or "in-process",
+        "requests": requests,
+        "warmup": warmup,
+        "concurrency": concurrency,
+        "bulk_size": bulk_size,
+        "settings": None,
+    }
+    if base_url is None:
+        from app.core.config import settings
+
+        meta["settings"] = {name: getattr(settings, name) for name in RECORDED_SETTINGS}
+
+    results: dict[str, dict[str, float]] = {}
+    async with _client(base_url) as client:
+        for name in scenarios:
+            results[name] = await run_scenario(
+                client,
+                SCENARIOS[name],
+                requests=requests,
+                warmup=warmup,
+                concurrency=concurrency,
+                bulk_size=bulk_size,
+            )
+            print(_format_row(name, results[name]), flush=True)
+    return {"meta": meta, "scenarios": results}
+
+
+def _format_row(name: str, summary: dict[str, float]) -> str:
+    return (
+        f"{name:<22} {summary['rps']:>9,.1f} req/s  p50 {summary['p50_ms']:>8.2f}  "
+        f"p95 {summary['p95_ms']:>8.2f}  p99 {summary['p99_ms']:>8.2f} ms  "
+        f"errors {summary['errors']}"
+    )
+
+
+COMPARED_FIELDS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def compare(before: dict, after: dict) -> list[str]:
+    """Per-scenario change of throughput and latency percentiles between two runs."""
+
+    lines = [f"{'scenario':<22} " + "  ".join(f"{name:>30}" for name in COMPARED_FIELDS)]
+    for name, new in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if old is None:
+            continue
+        cells = []
+        for metric in COMPARED_FIELDS:
+            change = (new[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+            cells.append(f"{old[metric]:>9.1f} -> {new[metric]:>9.1f} {change:+6.1f}%")
+        lines.append(f"{name:<22} " + "  ".join(cells))
+    return lines
+
+
+def _default_output(result: dict) -> Path:
+    meta = result["meta"]
+    stamp = meta["created_at"].replace(":", "").replace("-", "")[:15]
+    return RESULTS_DIR / f"{meta['commit'] or 'nogit'}-{stamp}.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run scenarios and save results as JSON")
+    run_parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"comma separated subset of: {', '.join(SCENARIOS)}",
+    )
+    run_parser.add_argument(
+        "--requests", type=int, default=1000, help="measured requests per scenario"
+    )
+    run_parser.add_argument("--warmup", type=int, default=50)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--bulk-size", type=int, default=100, help="items per bulk request")
+    run_parser.add_argument("--base-url", help="benchmark a running server instead of in-process")
+    run_parser.add_argument(
+        "--output", type=Path, help="result file (default: benchmarks/results/)"
+    )
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("before", type=Path)
+    compare_parser.add_argument("after", type=Path)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        before, after = (json.loads(path.read_text()) for path in (args.before, args.after))
+        print("\n".join(compare(before, after)))
+        return 0
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(names) - SCENARIOS.keys())
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    result = asyncio.run(
+        run(
+            names,
+            requests=args.requests,
+            warmup=args.warmup,
+            concurrency=args.concurrency,
+            bulk_size=args.bulk_size,
+            base_url=args.base_url,
+        )
+    )
+    output = args.output or _default_output(result)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+    print(f"saved {output}")
+    errors = sum(summary["errors"] for summary in result["scenarios"].values())
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""PDF text extraction time by worker count.
+
+Generates a text-only PDF (or uses --pdf) and times `iter_pdf_pages` with 1..N
+worker processes. Extraction is CPU-bound, so the speed-up should track the
+number of physical cores until pages per task get too small.
+
+    python -m benchmarks.pdf_extract --pages 2000 --workers 1 2 4 8
+    python -m benchmarks.pdf_extract --pdf manual.pdf
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.lazy import require
+
+
+def write_sample_pdf(path: str | Path, pages: int, lines_per_page: int = 40) -> Path:
+    """PDF whose page N holds lines `page N line M ...` in Helvetica."""
+
+    pypdf = require("pypdf")
+    generic = require("pypdf.generic")
+    name = generic.NameObject
+    writer = pypdf.PdfWriter()
+    font = writer._add_object(
+        generic.DictionaryObject(
+            {
+                name("/Type"): name("/Font"),
+                name("/Subtype"): name("/Type1"),
+                name("/BaseFont"): name("/Helvetica"),
+            }
+        )
+    )
+    resources = generic.DictionaryObject(
+        {name("/Font"): generic.DictionaryObject({name("/F1"): font})}
+    )
+    for number in range(1, pages + 1):
+        page = writer.add_blank_page(612, 792)
+        page[name("/Resources")] = resources
+        lines = " 0 -14 Td ".join(
+            f"(page {number} line {line} lorem ipsum dolor sit amet) Tj"
+            for line in range(lines_per_page)
+        )
+        content = generic.DecodedStreamObject()
+        content.set_data(f"BT /F1 10 Tf 72 740 Td {lines} ET".encode())
+        page[name("/Contents")] = writer._add_object(content)
+    path = Path(path)
+    writer.write(path)
+    return path
+
+
+def main() -> None:
+    from app.services.document_loader import iter_pdf_pages, shutdown_pools
+
+    parser = argparse.ArgumentParser(description="PDF extraction time by worker count")
+    parser.add_argument("--pdf", type=Path, default=None)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--pages-per-task", type=int, default=8)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = args.pdf or write_sample_pdf(Path(directory) / "sample.pdf", args.pages)
+        baseline = None
+        print(f"{'workers':>8} {'pages':>7} {'seconds':>9} {'pages/s':>9} {'speed-up':>9}")
+        for workers in args.workers:
+            # 풀 기동 시간은 제외하도록 한 번 데워 둡니다.
+            next(iter_pdf_pages(pdf, workers=workers, pages_per_task=args.pages_per_task))
+            started = time.perf_counter()
+            pages = sum(
+                1 for _ in iter_pdf_pages(pdf, workers=workers, pages_per_task=args.pages_per_task)
+            )
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(
+                f"{workers:>8} {pages:>7} {elapsed:>9.2f} {pages / elapsed:>9.1f} "
+                f"{baseline / elapsed:>8.2f}x"
+            )
+        shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""List-response serialization benchmark: response_model path vs. FAST_JSON_RESPONSES.
+
+Runs the real product order list route in-process against a throwaway SQLite
+database so that only query + serialization cost is measured.
+
+    python -m benchmarks.serialization --rows 500 --requests 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies import get_db
+from app.core.config import settings
+from app.db.base import Base
+from app.models.product_order import ProductOrder
+from main import app
+
+
+def _seed(engine, rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(ProductOrder),
+            [
+                {
+                    "order_number": f"BENCH-{i:07d}",
+                    "product_name": f"product {i % 97}",
+                    "shipping_address": f"{i} Teheran-ro, Gangnam-gu, Seoul",
+                    "shipping_status": "delivered",
+                    "remark": None if i % 3 else "leave at the door",
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+async def _run(rows: int, requests: int, fast: bool) -> float:
+    settings.fast_json_responses = fast
+    params = {"limit": rows}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 워밍업 겸 응답 확인; 측정 루프에서는 클라이언트 쪽 JSON 파싱을 하지 않습니다.
+        assert len((await client.get("/product-orders/", params=params)).json()) == rows
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/product-orders/", params=params)
+            assert response.status_code == 200
+        return rows * requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="rows per list response")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        _seed(engine, args.rows)
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+        def _get_db():
+            with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _get_db
+        try:
+            baseline = asyncio.run(_run(args.rows, args.requests, fast=False))
+            fast = asyncio.run(_run(args.rows, args.requests, fast=True))
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+    print(f"response_model : {baseline:>12,.0f} rows/s")
+    print(f"fast json      : {fast:>12,.0f} rows/s  ({fast / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
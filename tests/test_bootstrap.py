@@ -0,0 +1,50 @@
+"""Schema bootstrap tests (SQLite file database)."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+
+from app.db import bootstrap
+from app.models.customer import Customer
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bootstrap.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _count_statements(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+# 새 DB는 한 번 마이그레이션되고, 이후 기동은 버전 행 조회 한 번으로 끝
+def test_check_mode_migrates_once_then_only_reads_version(engine) -> None:
+    assert bootstrap.bootstrap_schema(engine, "check") == bootstrap.SCHEMA_VERSION
+    assert {"customer", "product_order", "schema_version"} <= set(
+        inspect(engine).get_table_names()
+    )
+
+    statements = _count_statements(engine)
+    assert bootstrap.bootstrap_schema(engine, "check") == bootstrap.SCHEMA_VERSION
+    assert len(statements) == 1
+
+
+# create_all로 만들어진 기존 DB도 버전 0에서 최신으로 올라감
+def test_existing_database_without_version_row_is_upgraded(engine) -> None:
+    Customer.__table__.create(engine)
+    assert bootstrap.current_version(engine) == 0
+
+    assert bootstrap.migrate(engine) == bootstrap.SCHEMA_VERSION
+    assert bootstrap.current_version(engine) == bootstrap.SCHEMA_VERSION
+    indexes = {index["name"] for index in inspect(engine).get_indexes("customer")}
+    assert "ix_customer_created_at_id" in indexes
+
+
+# 알 수 없는 모드는 기동을 막습니다.
+def test_unknown_mode_is_rejected(engine) -> None:
+    with pytest.raises(ValueError):
+        bootstrap.bootstrap_schema(engine, "auto")
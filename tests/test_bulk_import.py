@@ -0,0 +1,60 @@
+"""COPY-based bulk import: encoding helpers and end-to-end import."""
+from __future__ import annotations
+
+import io
+import os
+import uuid
+
+import pytest
+
+from app.services.bulk_import import _copy_value, _CopyStream
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+# COPY text 형식 이스케이프
+def test_copy_value_escapes_text_format() -> None:
+    assert _copy_value(None) == r"\N"
+    assert _copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+    assert _copy_value(3) == "3"
+
+
+# 줄 단위 생성기를 고정 크기 read()로 제공
+def test_copy_stream_reads_in_requested_sizes() -> None:
+    lines = (f"{i}\tvalue\n" for i in range(1000))
+    stream = _CopyStream(lines)
+    chunks = iter(lambda: stream.read(100), b"")
+    data = b"".join(chunks)
+
+    assert data == "".join(f"{i}\tvalue\n" for i in range(1000)).encode()
+
+
+@pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+# 잘못된 행은 개별 거부, 중복은 첫 줄만 반영
+def test_import_orders_reports_rejects_and_duplicates() -> None:
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.services.bulk_import import import_records
+
+    Base.metadata.create_all(bind=engine)
+    prefix = uuid.uuid4().hex[:8]
+    body = "\n".join(
+        [
+            "order_number,product_name,shipping_address,shipping_status,remark",
+            f"{prefix}-1,desk,Seoul,pending,",
+            f"{prefix}-2,chair,Seoul,pending,fragile",
+            f"{prefix}-1,desk again,Seoul,pending,",
+            f"{prefix}-3,,Seoul,pending,",
+        ]
+    )
+
+    report = import_records("product_order", io.BytesIO(body.encode()), fmt="csv")
+
+    assert report.inserted == 2
+    assert report.duplicates == 1
+    assert report.rejected == 1
+    assert report.rejects[0].line == 5
+
+    again = import_records("product_order", io.BytesIO(body.encode()), mode="upsert")
+    assert again.updated == 2
+    assert again.inserted == 0
@@ -0,0 +1,81 @@
+"""Read-through cache backends (in-process LRU+TTL and Redis protocol)."""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from app.services.cache import MemoryCache, RedisCache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis-py client surface we use."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, tuple[float, bytes]] = {}
+
+    def get(self, key: str) -> bytes | None:
+        entry = self.store.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.store.pop(key, None)
+            return None
+        return entry[1]
+
+    def set(self, key: str, value: str, px: int) -> None:
+        self.store[key] = (time.monotonic() + px / 1000, value.encode())
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.store.pop(key, None)
+
+    def info(self, section: str) -> dict[str, int]:
+        return {"evicted_keys": 3}
+
+
+# LRU 용량 초과 시 가장 오래 사용하지 않은 항목 축출
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", {"id": 1}, ttl=60)
+    cache.set("b", {"id": 2}, ttl=60)
+    assert cache.get("a") == {"id": 1}
+    cache.set("c", {"id": 3}, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"id": 1}
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+# TTL 만료와 무효화
+def test_memory_cache_expires_and_invalidates() -> None:
+    cache = MemoryCache()
+    cache.set("short", {"id": 1}, ttl=0.01)
+    cache.set("long", {"id": 2}, ttl=60)
+    time.sleep(0.02)
+    cache.delete("long")
+
+    assert cache.get("short") is None
+    assert cache.get("long") is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["invalidations"] == 1
+
+
+# Redis 백엔드는 datetime 값을 보존
+def test_redis_cache_round_trips_datetimes() -> None:
+    cache = RedisCache(FakeRedis())
+    created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    cache.set("customer:1", {"id": 1, "created_at": created_at}, ttl=60)
+
+    assert cache.get("customer:1") == {"id": 1, "created_at": created_at}
+    cache.delete("customer:1")
+    assert cache.get("customer:1") is None
+    assert cache.stats() == {
+        "backend": "redis",
+        "hits": 1,
+        "misses": 1,
+        "sets": 1,
+        "invalidations": 1,
+        "evictions": 3,
+        "expired": 0,
+    }
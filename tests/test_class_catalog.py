@@ -0,0 +1,89 @@
+"""Class catalog payload folding and cache tests (no SQL Server required)."""
+from __future__ import annotations
+
+import pytest
+
+from app.services import class_catalog
+
+
+def _row(**overrides):
+    row = dict.fromkeys(
+        (
+            "community_seq",
+            "community_title",
+            "content_provider_seq",
+            "content_provider_name",
+            "media_content_key",
+            "training_file_name",
+            "expression_media_content_key",
+            "mission_name",
+            "tutor_seq",
+            "tutor_file_name",
+            "attach_file_seq",
+            "attach_file_name",
+        )
+    )
+    row.update(
+        class_seq=1,
+        class_name="영어회화",
+        class_hashtags="초급,회화",
+        lecture_seq=10,
+        lecture_title="1강",
+        teacher_names="Audrey,Tom",
+        asset_type="MEDIA",
+        asset_seq=100,
+    )
+    row.update(overrides)
+    return row
+
+
+# 강의 x 자산 x 첨부파일 팬아웃을 중복 없이 중첩 구조로 접기
+def test_fold_removes_fan_out_duplicates() -> None:
+    rows = [
+        _row(media_content_key="k1", attach_file_seq=1, attach_file_name="a.pdf"),
+        _row(media_content_key="k1", attach_file_seq=2, attach_file_name="b.pdf"),
+        _row(asset_type="MISSION", asset_seq=200, mission_name="m", attach_file_seq=1),
+        _row(asset_type="MISSION", asset_seq=200, mission_name="m", attach_file_seq=2),
+        _row(lecture_seq=11, lecture_title="2강", teacher_names=None, asset_seq=101),
+    ]
+
+    payload = class_catalog.fold_class_rows(rows)[1]
+
+    assert payload["hashtags"] == ["초급", "회화"]
+    assert payload["communities"] == []
+    first, second = payload["lectures"]
+    assert first["teachers"] == ["Audrey", "Tom"]
+    assert first["assets"] == [
+        {"type": "MEDIA", "seq": 100, "media_content_key": "k1"},
+        {"type": "MISSION", "seq": 200, "mission_name": "m"},
+    ]
+    assert [item["seq"] for item in first["attachments"]] == [1, 2]
+    assert second["teachers"] == [] and len(second["assets"]) == 1
+
+
+@pytest.fixture
+def fetch_calls(monkeypatch):
+    calls: list[list[int]] = []
+
+    def _fetch(db, class_seqs):
+        calls.append(list(class_seqs))
+        return class_catalog.fold_class_rows(
+            _row(class_seq=seq) for seq in class_seqs if seq != 404
+        )
+
+    monkeypatch.setattr(class_catalog, "fetch_class_payloads", _fetch)
+    class_catalog.invalidate_catalog()
+    return calls
+
+
+# 캐시 미스만 한 번에 조회하고, 무효화 이후에는 다시 조회
+def test_cached_payloads_fetch_only_misses(fetch_calls) -> None:
+    assert list(class_catalog.get_class_payloads(None, [1, 2])) == [1, 2]
+    assert list(class_catalog.get_class_payloads(None, [3, 2, 1, 404])) == [3, 2, 1]
+    assert fetch_calls == [[1, 2], [3, 404]]
+
+    class_catalog.invalidate_class(2)
+    class_catalog.get_class_payloads(None, [1, 2])
+    class_catalog.invalidate_catalog()
+    class_catalog.get_class_payload(None, 1)
+    assert fetch_calls[2:] == [[2], [1]]
@@ -0,0 +1,72 @@
+"""Class catalog snapshot refresh tests against SQLite loaded with fixture rows."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.class_catalog import ClassCatalogSnapshot
+from app.services import class_catalog_snapshot as snapshots
+
+FIXTURE = Path(__file__).parent / "fixtures" / "class_catalog_rows.json"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[ClassCatalogSnapshot.__table__])
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def source():
+    payloads = snapshots.load_fixture(FIXTURE)
+    calls: list[list[int]] = []
+    fetch = snapshots.static_fetcher(payloads)
+
+    def _fetch(class_seqs):
+        calls.append(list(class_seqs))
+        return fetch(class_seqs)
+
+    return payloads, _fetch, calls
+
+
+# 픽스처 적재 후 단건 조회는 저장된 페이로드를 그대로 반환
+def test_fixture_load_and_lookup(db: Session, source) -> None:
+    payloads, fetch, _ = source
+
+    result = snapshots.refresh_snapshots(db, fetch, class_seqs=list(payloads))
+
+    assert result == {"refreshed": 2, "removed": 0}
+    snapshot = snapshots.get_class_snapshot(db, 101)
+    assert snapshot == payloads[101]
+    assert [len(lecture["assets"]) for lecture in snapshot["lectures"]] == [2, 1]
+    assert snapshots.get_class_snapshot(db, 999) is None
+
+
+# 변경 표시된 클래스만 다시 계산하고, 원본에서 사라진 클래스는 제거
+def test_incremental_refresh_only_touches_marked(db: Session, source) -> None:
+    payloads, fetch, calls = source
+    snapshots.refresh_snapshots(db, fetch, class_seqs=list(payloads))
+
+    snapshots.mark_stale(db, 102, 404)
+    result = snapshots.refresh_snapshots(db, fetch)
+
+    assert sorted(calls[-1]) == [102, 404]
+    assert result == {"refreshed": 1, "removed": 1}
+    assert snapshots.refresh_snapshots(db, fetch) == {"refreshed": 0, "removed": 0}
+
+
+# 변경 표시가 없어도 허용 지연을 넘긴 스냅샷은 다시 계산
+def test_staleness_bound_refreshes_old_snapshots(db: Session, source) -> None:
+    payloads, fetch, calls = source
+    snapshots.refresh_snapshots(db, fetch, class_seqs=list(payloads))
+
+    assert snapshots.refresh_snapshots(db, fetch, max_staleness=3600)["refreshed"] == 0
+    assert snapshots.refresh_snapshots(db, fetch, max_staleness=0)["refreshed"] == 2
+    assert sorted(calls[-1]) == [101, 102]
@@ -0,0 +1,107 @@
+"""Customer / product order CRUD API tests against a live database."""
+from __future__ import annotations
+
+import os
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import event
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def statements() -> Iterator[list[str]]:
+    from app.db.session import engine
+
+    captured: list[str] = []
+
+    def _capture(_conn, _cursor, statement, *_args) -> None:
+        captured.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+
+# 쓰기 요청은 RETURNING 한 번의 SQL로 처리
+def test_customer_writes_use_single_statement(client, statements: list[str]) -> None:
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+
+    created = client.post("/customers/", json={"name": "kim", "email": email})
+    assert created.status_code == 201
+    assert statements == ["INSERT"]
+
+    statements.clear()
+    duplicate = client.post("/customers/", json={"name": "lee", "email": email})
+    assert duplicate.status_code == 409
+    assert statements == ["INSERT"]
+
+    statements.clear()
+    customer_id = created.json()["id"]
+    updated = client.put(f"/customers/{customer_id}", json={"phone": "010"})
+    assert updated.json()["phone"] == "010"
+    assert statements == ["UPDATE"]
+
+    statements.clear()
+    assert client.delete(f"/customers/{customer_id}").status_code == 204
+    assert client.delete(f"/customers/{customer_id}").status_code == 404
+    assert statements == ["DELETE", "DELETE"]
+
+
+# 수정 시 order_number 중복은 409
+def test_order_update_conflict_returns_409(client) -> None:
+    prefix = uuid.uuid4().hex[:8]
+    orders = [
+        client.post(
+            "/product-orders/",
+            json={
+                "order_number": f"{prefix}-{i}",
+                "product_name": "mouse",
+                "shipping_address": "Busan",
+                "shipping_status": "pending",
+            },
+        ).json()
+        for i in range(2)
+    ]
+
+    response = client.put(
+        f"/product-orders/{orders[0]['id']}",
+        json={"order_number": orders[1]["order_number"]},
+    )
+    assert response.status_code == 409
+    assert client.put("/product-orders/0", json={"remark": "x"}).status_code == 404
+
+
+# 버전이 같으면 304, 수정 후에는 새 ETag
+def test_conditional_get_uses_row_version(client, statements: list[str]) -> None:
+    created = client.post(
+        "/customers/",
+        json={"name": "park", "email": f"{uuid.uuid4().hex[:8]}@example.com"},
+    ).json()
+    first = client.get(f"/customers/{created['id']}")
+    etag = first.headers["ETag"]
+
+    statements.clear()
+    cached = client.get(f"/customers/{created['id']}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert statements == []
+
+    client.put(f"/customers/{created['id']}", json={"name": "choi"})
+    changed = client.get(f"/customers/{created['id']}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
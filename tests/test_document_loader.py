@@ -0,0 +1,72 @@
+"""Parallel PDF loader tests (real worker processes on a generated PDF)."""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services import document_loader
+from app.services.document_loader import iter_pdf_pages, load_pdf, page_count, shutdown_pools
+from benchmarks.pdf_extract import write_sample_pdf
+
+pytest.importorskip("pypdf")
+
+
+@pytest.fixture(scope="module")
+def sample_pdf(tmp_path_factory) -> Path:
+    return write_sample_pdf(tmp_path_factory.mktemp("pdf") / "manual.pdf", 23, lines_per_page=3)
+
+
+@pytest.fixture
+def pool_teardown():
+    yield
+    shutdown_pools()
+
+
+# 프로세스 풀로 나눠 추출해도 페이지 순서와 내용은 한 프로세스에서 읽은 것과 같습니다.
+def test_parallel_extraction_matches_serial(sample_pdf: Path, monkeypatch, pool_teardown) -> None:
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 1)
+    serial = list(iter_pdf_pages(sample_pdf, workers=1))
+    parallel = list(iter_pdf_pages(sample_pdf, workers=2, pages_per_task=4))
+
+    assert [number for number, _ in parallel] == list(range(1, 24))
+    assert parallel == serial
+    assert parallel[16][1].startswith("page 17 line 0")
+    assert 2 in document_loader._pools
+
+
+# 시작 페이지를 주면 그 앞 페이지는 추출하지 않습니다(적재 재개용).
+def test_extraction_from_start_page(sample_pdf: Path, monkeypatch, pool_teardown) -> None:
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 1)
+    pages = list(iter_pdf_pages(sample_pdf, start=21, workers=2, pages_per_task=2))
+
+    assert [number for number, _ in pages] == [21, 22, 23]
+    assert pages[0][1].startswith("page 21 line 0")
+
+
+# 기존 _read_pdf_asset과 같은 source/page 메타데이터를 가진 Document를 돌려줍니다.
+def test_load_pdf_documents(sample_pdf: Path) -> None:
+    documents = load_pdf(sample_pdf, workers=1)
+
+    assert len(documents) == 23
+    assert documents[4].metadata == {"source": "manual.pdf", "page": 5}
+    assert "page 5 line 2" in documents[4].page_content
+
+
+# 호출한 프로세스에서는 읽기마다 리더를 따로 열어, 스레드끼리 mmap을 닫아 버리지 않습니다.
+def test_serial_reads_in_threads_do_not_share_a_reader(tmp_path: Path) -> None:
+    paths = [write_sample_pdf(tmp_path / f"manual{n}.pdf", 40, lines_per_page=1) for n in range(2)]
+
+    def read(path: Path) -> list[tuple[int, str]]:
+        return list(iter_pdf_pages(path, workers=1, pages_per_task=1))
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(read, paths * 4))
+
+    assert all(len(pages) == 40 for pages in results)
+    assert results[0][39][1].startswith("page 40 line 0")
+    # 워커 프로세스가 아니면 마지막 PDF를 열어 둔 채 캐시하지 않습니다.
+    assert document_loader._open_pdf is None
+    assert page_count(paths[1]) == 40 and document_loader._open_pdf is None
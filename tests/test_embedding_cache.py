@@ -0,0 +1,155 @@
+"""Content-addressed embedding cache tests (fake client, SQLite / Postgres store)."""
+from __future__ import annotations
+
+import json
+import os
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.services.embedding import (
+    CachedEmbeddings,
+    EmbeddingStore,
+    pack_vector,
+    text_digest,
+    unpack_vector,
+)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+class FakeEmbeddings:
+    """Deterministic 4-dimensional vectors; records every batch sent to the "API"."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(text)), 0.5, -1.25, float(ord(text[0]))] for text in texts]
+
+
+@pytest.fixture
+def store(tmp_path) -> EmbeddingStore:
+    return EmbeddingStore.for_path(tmp_path / "embeddings.sqlite3", max_entries=1000)
+
+
+def _count(store: EmbeddingStore) -> int:
+    with store.engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(EmbeddingCacheEntry))
+
+
+# float32 리틀 엔디언으로 저장하고 그대로 복원합니다.
+def test_vector_packing_roundtrip() -> None:
+    vector = [0.5, -1.25, 3.0, 1e-3]
+    packed = pack_vector(vector)
+
+    assert len(packed) == 4 * len(vector)
+    assert unpack_vector(packed) == pytest.approx(vector, rel=1e-6)
+    assert len(text_digest("뉴스")) == 32
+
+
+# 같은 텍스트는 배치 안에서도, 다음 호출에서도 API로 다시 보내지 않습니다.
+def test_unchanged_texts_never_hit_the_api_twice(store: EmbeddingStore) -> None:
+    client = FakeEmbeddings()
+    embeddings = CachedEmbeddings(client, "test-model", store=store, batch_size=2)
+
+    first = embeddings.embed_documents(["a", "bb", "a", "ccc"])
+    assert client.batches == [["a", "bb"], ["ccc"]]
+    assert first[0] == first[2]
+    assert first[1] == [2.0, 0.5, -1.25, 98.0]
+
+    second = embeddings.embed_documents(["ccc", "a", "dddd"])
+    assert client.batches[2:] == [["dddd"]]
+    assert second[:2] == [first[3], first[0]]
+
+    # 새 프로세스(빈 메모리 캐시)에서도 저장소에서 찾습니다.
+    fresh_client = FakeEmbeddings()
+    fresh = CachedEmbeddings(fresh_client, "test-model", store=store)
+    assert fresh.embed_query("bb") == first[1]
+    assert fresh_client.batches == []
+
+    stats = embeddings.stats()
+    assert (stats["texts"], stats["misses"], stats["api_calls"]) == (7, 4, 3)
+    assert stats["memory_hits"] == 2
+    assert fresh.stats()["store_hits"] == 1
+    assert fresh.stats()["hit_rate"] == 1.0
+
+
+# 모델·차원이 다르면 같은 텍스트라도 따로 캐시합니다.
+def test_cache_key_includes_model_and_dimensions(store: EmbeddingStore) -> None:
+    client = FakeEmbeddings()
+    CachedEmbeddings(client, "model-a", store=store).embed_query("x")
+    CachedEmbeddings(client, "model-a", dimensions=256, store=store).embed_query("x")
+    CachedEmbeddings(client, "model-b", store=store).embed_query("x")
+
+    assert len(client.batches) == 3
+    assert _count(store) == 3
+
+
+# 메모리 LRU와 저장소 LRU 모두 상한을 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+def test_lru_eviction(tmp_path) -> None:
+    store = EmbeddingStore.for_path(tmp_path / "lru.sqlite3", max_entries=3)
+    embeddings = CachedEmbeddings(FakeEmbeddings(), "m", store=store, memory_entries=2)
+
+    for text in ("a", "b", "c", "d", "e"):
+        embeddings.embed_query(text)
+
+    assert embeddings.stats()["memory_size"] == 2
+    assert embeddings.stats()["memory_evictions"] == 3
+    assert store.evict() == 2
+    assert _count(store) == 3
+    with store.engine.connect() as conn:
+        kept = set(conn.scalars(select(EmbeddingCacheEntry.text_sha256)))
+    assert kept == {text_digest(text) for text in ("c", "d", "e")}
+
+
+# 실제 OpenAIEmbeddings 클라이언트를 감싸도 두 번째 실행에서는 HTTP 요청이 없습니다.
+def test_wraps_openai_embeddings_client(store: EmbeddingStore) -> None:
+    langchain_openai = pytest.importorskip("langchain_openai")
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        data = [
+            {"object": "embedding", "index": i, "embedding": [0.25, float(i)]}
+            for i, _ in enumerate(body["input"])
+        ]
+        usage = {"prompt_tokens": 1, "total_tokens": 1}
+        return httpx.Response(
+            200, json={"object": "list", "data": data, "model": body["model"], "usage": usage}
+        )
+
+    client = langchain_openai.OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        api_key="test",
+        check_embedding_ctx_length=False,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    embeddings = CachedEmbeddings(client, "text-embedding-3-small", store=store)
+
+    assert embeddings.embed_documents(["첫 번째", "두 번째"]) == [[0.25, 0.0], [0.25, 1.0]]
+    assert embeddings.embed_documents(["두 번째", "첫 번째"]) == [[0.25, 1.0], [0.25, 0.0]]
+    assert len(requests) == 1
+
+
+# Postgres 저장소: 동시에 같은 텍스트를 저장해도 충돌 없이 한 행만 남습니다.
+@pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+def test_postgres_store_roundtrip() -> None:
+    from app.db.bootstrap import migrate
+    from app.db.session import engine
+
+    migrate(engine)
+    store = EmbeddingStore(engine, max_entries=1_000_000)
+    model = f"test-{uuid.uuid4().hex[:8]}"
+    digest = text_digest("pg")
+    vector = pack_vector([1.0, 2.0])
+
+    store.put_many(model, 0, {digest: vector})
+    store.put_many(model, 0, {digest: pack_vector([9.0, 9.0])})
+
+    assert store.get_many(model, 0, [digest, text_digest("missing")]) == {digest: vector}
@@ -0,0 +1,219 @@
+"""Embedding pipeline tests against the local fake OpenAI server (no network)."""
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import httpx
+import pytest
+
+from app.services.embedding import CachedEmbeddings, unpack_vector
+from app.services.embedding_pipeline import (
+    EmbeddingAPIError,
+    EmbeddingPipeline,
+    RateLimiter,
+    pack_batches,
+    parse_reset,
+    parse_retry_after,
+    utf8_token_bound,
+)
+from benchmarks.fake_openai import create_app, fake_vector
+
+
+def _pipeline(transport: httpx.AsyncBaseTransport, **kwargs) -> EmbeddingPipeline:
+    kwargs.setdefault("token_counter", utf8_token_bound)
+    return EmbeddingPipeline(
+        "text-embedding-3-small",
+        base_url="http://fake/v1",
+        backoff_base_s=0.01,
+        transport=transport,
+        **kwargs,
+    )
+
+
+# x-ratelimit-reset-* 값은 "6m0s", "20ms" 같은 Go duration 형식입니다.
+def test_parse_reset_durations() -> None:
+    assert parse_reset("1s") == 1.0
+    assert parse_reset("6m0s") == 360.0
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("1m30.5s") == pytest.approx(90.5)
+    assert parse_reset("2.5") == 2.5
+    assert parse_reset(None) is None
+    assert parse_reset("soon") is None
+
+
+# Retry-After는 초 또는 HTTP-date이며, 읽을 수 없으면 None(지수 백오프로 대체)입니다.
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+    responses = iter(
+        [
+            httpx.Response(503, headers={"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+            httpx.Response(503, headers={"retry-after": "later"}),
+            httpx.Response(200, json={"data": [{"index": 0, "embedding": ""}]}),
+        ]
+    )
+    pipeline = _pipeline(httpx.MockTransport(lambda _: next(responses)))
+    assert asyncio.run(pipeline.embed_packed(["hello"])) == [b""]
+    assert pipeline.stats.retries == 2
+
+
+# 배치는 입력 수·토큰 수 상한을 넘지 않고 순서를 유지합니다.
+def test_pack_batches_respects_limits() -> None:
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 10, "e" * 10, "f" * 10, "g"]
+    batches = pack_batches(texts, utf8_token_bound, max_inputs=3, max_tokens=90)
+
+    assert [batch.indices for batch in batches] == [[0, 1], [2, 3, 4], [5, 6]]
+    assert all(batch.tokens <= 90 and len(batch.texts) <= 3 for batch in batches)
+    assert [text for batch in batches for text in batch.texts] == texts
+
+    with pytest.raises(ValueError, match="split it first"):
+        pack_batches(["x" * 9000], utf8_token_bound)
+
+
+# 남은 토큰이 부족하면 한도/60 속도로 채워질 때까지만 기다립니다.
+def test_rate_limiter_waits_for_refill() -> None:
+    now = [100.0]
+    limiter = RateLimiter(clock=lambda: now[0])
+    assert limiter.delay(10_000) == 0
+
+    limiter.update(
+        {
+            "x-ratelimit-limit-tokens": "60000",
+            "x-ratelimit-remaining-tokens": "500",
+            "x-ratelimit-reset-tokens": "59.5s",
+        }
+    )
+    assert limiter.delay(500) == 0
+    assert limiter.delay(1500) == pytest.approx(1.0)
+    now[0] += 0.5
+    assert limiter.remaining("tokens") == pytest.approx(1000)
+
+    limiter.pause(2)
+    assert limiter.delay(1) == pytest.approx(2)
+
+
+# 5xx는 재시도하고 4xx는 바로 실패시킵니다.
+def test_pipeline_retries_server_errors() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503, json={"error": {"message": "overloaded"}})
+        vector = base64.b64encode(fake_vector("hello", 4).tobytes()).decode()
+        return httpx.Response(200, json={"data": [{"index": 0, "embedding": vector}]})
+
+    pipeline = _pipeline(httpx.MockTransport(handler))
+    assert pipeline.embed_query("hello") == pytest.approx(fake_vector("hello", 4).tolist())
+    assert len(calls) == 2 and pipeline.stats.retries == 1
+
+    rejected = _pipeline(httpx.MockTransport(lambda _: httpx.Response(401, json={})))
+    with pytest.raises(EmbeddingAPIError, match="401"):
+        rejected.embed_query("hello")
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the limiter sleeps (no wall-clock timing)."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        # 부동소수점 오차로 버킷이 한도에 살짝 못 미치지 않게 1ms 더 갑니다.
+        self.now += seconds + 0.001
+        await asyncio.sleep(0)
+
+
+def _clocked(fake_kwargs: dict, **pipeline_kwargs) -> tuple[FakeClock, object, EmbeddingPipeline]:
+    clock = FakeClock()
+    fake = create_app(clock=clock, **fake_kwargs)
+    pipeline = _pipeline(
+        httpx.ASGITransport(app=fake),
+        limiter=RateLimiter(clock=clock, sleep=clock.sleep),
+        **pipeline_kwargs,
+    )
+    return clock, fake, pipeline
+
+
+# 초당 1만 토큰으로 제한된 가짜 서버에서 429를 견디며 한도 가까이 처리하고 순서를 지킵니다.
+def test_pipeline_against_rate_limited_fake_server() -> None:
+    clock, fake, pipeline = _clocked(
+        {"tpm": 600_000, "rpm": 6_000, "token_burst": 4_000, "dimensions": 8},
+        dimensions=8,
+        concurrency=4,
+        max_batch_tokens=2_000,
+    )
+    texts = [f"문서 {i} " + "x" * (i % 97) for i in range(400)]
+
+    started = clock.now
+    vectors = asyncio.run(pipeline.embed(texts))
+
+    assert vectors[123] == pytest.approx(fake_vector(texts[123], 8).tolist())
+    assert len(vectors) == len(texts)
+    assert max(fake.state.stats.batch_sizes) > 1
+    stats = pipeline.stats
+    assert stats.tokens == fake.state.stats.tokens == sum(map(utf8_token_bound, texts))
+    assert stats.batches == stats.requests - stats.throttled
+    # 처음 버스트(4천 토큰)를 빼면 가짜 시계 기준 속도가 분당 한도 근처여야 합니다.
+    steady_tpm = (stats.tokens - 4_000) / (clock.now - started) * 60
+    assert 0.9 * 600_000 < steady_tpm <= 600_000
+    assert stats.waited_s == pytest.approx(clock.now - started, rel=0.05)
+    assert fake.state.stats.throttled <= stats.requests // 2
+
+
+# 호출이 나뉘어도 앞선 응답 헤더로 알게 된 남은 예산을 이어 써서 429 대신 기다립니다.
+def test_pipeline_keeps_rate_limit_budget_across_calls() -> None:
+    # 초당 1천 토큰, 버스트 1,500 토큰
+    _, fake, pipeline = _clocked(
+        {"tpm": 60_000, "rpm": 6_000, "token_burst": 1_500, "dimensions": 4}, dimensions=4
+    )
+
+    async def two_calls() -> tuple[float, float]:
+        await pipeline.embed(["x" * 1_400])
+        first_wait = pipeline.stats.waited_s
+        await pipeline.embed(["y" * 1_000])
+        await pipeline.aclose()
+        return first_wait, pipeline.stats.waited_s - first_wait
+
+    first_wait, second_wait = asyncio.run(two_calls())
+
+    assert first_wait == 0
+    # 남은 100 토큰이 1,000 토큰으로 찰 때까지(0.9초) 기다립니다.
+    assert second_wait == pytest.approx(0.9)
+    assert fake.state.stats.requests == 2 and fake.state.stats.throttled == 0
+
+
+# 동기 호출은 백그라운드 루프 하나와 그 연결 풀을 함께 씁니다.
+def test_sync_calls_share_one_client() -> None:
+    fake = create_app(dimensions=4)
+    pipeline = _pipeline(httpx.ASGITransport(app=fake), dimensions=4)
+
+    pipeline.embed_documents(["a"])
+    client = next(iter(pipeline._clients.values()))
+    pipeline.embed_documents(["b"])
+
+    assert list(pipeline._clients.values()) == [client]
+    pipeline.close()
+    assert client.is_closed and pipeline._clients == {}
+
+
+# 캐시 뒤에 파이프라인을 두면 처음 보는 텍스트만 서버로 갑니다.
+def test_cached_embeddings_over_pipeline() -> None:
+    fake = create_app(dimensions=4)
+    pipeline = _pipeline(httpx.ASGITransport(app=fake), dimensions=4)
+    embeddings = CachedEmbeddings(pipeline, "text-embedding-3-small", 4, batch_size=None)
+
+    first = embeddings.embed_documents(["a", "b", "a"])
+    second = embeddings.embed_documents(["b", "c"])
+
+    assert first[0] == first[2] == pytest.approx(fake_vector("a", 4).tolist())
+    assert second[0] == first[1]
+    assert fake.state.stats.inputs == 3
+    assert unpack_vector(fake_vector("c", 4).tobytes()) == pytest.approx(second[1])
@@ -0,0 +1,22 @@
+"""ETag helpers for conditional GETs."""
+from __future__ import annotations
+
+from app.api.etag import entity_etag, etag_matches, list_etag
+
+
+# If-None-Match는 약한 비교를 사용하고 여러 값을 허용
+def test_etag_matches_weak_and_multiple_candidates() -> None:
+    etag = entity_etag(7, 3)
+    assert etag == '"7-3"'
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"7-2"', etag)
+    assert not etag_matches(None, etag)
+
+
+# 목록 ETag는 행 버전과 다음 커서에 따라 달라짐
+def test_list_etag_depends_on_versions_and_cursor() -> None:
+    base = list_etag([(1, 1), (2, 1)], "cursor")
+    assert base == list_etag([(1, 1), (2, 1)], "cursor")
+    assert base != list_etag([(1, 1), (2, 2)], "cursor")
+    assert base != list_etag([(1, 1), (2, 1)], "")
@@ -0,0 +1,49 @@
+"""Streaming export encoders (NDJSON / CSV)."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from app.services import export
+
+
+ROWS = [
+    (1, "kim", "a,\"b\"", datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    (2, "이", None, datetime(2024, 1, 2, tzinfo=timezone.utc)),
+]
+NAMES = ["id", "name", "phone", "created_at"]
+
+
+# NDJSON: 행마다 한 줄, datetime은 ISO 8601
+def test_encode_rows_ndjson() -> None:
+    body = b"".join(export.encode_rows(ROWS, NAMES, "ndjson")).decode()
+    records = [json.loads(line) for line in body.splitlines()]
+
+    assert records[1] == {
+        "id": 2,
+        "name": "이",
+        "phone": None,
+        "created_at": "2024-01-02T00:00:00+00:00",
+    }
+    assert len(records) == 2
+
+
+# CSV: 헤더 + 따옴표 이스케이프
+def test_encode_rows_csv() -> None:
+    body = b"".join(export.encode_rows(ROWS, NAMES, "csv")).decode()
+    parsed = list(csv.reader(io.StringIO(body)))
+
+    assert parsed[0] == NAMES
+    assert parsed[1][2] == 'a,"b"'
+    assert parsed[2][2] == ""
+
+
+# 큰 결과는 CHUNK_BYTES 단위로 나누어 내보냄
+def test_encode_rows_yields_bounded_chunks() -> None:
+    rows = ((i, "x" * 100, None, None) for i in range(5000))
+    chunks = list(export.encode_rows(rows, NAMES, "ndjson"))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < export.CHUNK_BYTES + 1024 for chunk in chunks)
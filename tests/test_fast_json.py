@@ -0,0 +1,66 @@
+"""FAST_JSON_RESPONSES must not change what list endpoints return."""
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.dependencies import get_db
+from app.api.responses import FastJSONResponse
+from app.core.config import settings
+from app.db.base import Base
+from app.models.product_order import ProductOrder
+from main import app
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with session_factory() as session:
+        session.add_all(
+            ProductOrder(
+                order_number=f"N{i}",
+                product_name=f"상품 {i}",
+                shipping_address="Seoul",
+                shipping_status="pending",
+                remark=None if i % 2 else "문 앞",
+            )
+            for i in range(5)
+        )
+        session.commit()
+
+    def _get_db():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
+
+
+# 빠른 경로와 response_model 경로의 본문/헤더가 같아야 합니다.
+def test_fast_list_matches_response_model_path(client, monkeypatch) -> None:
+    params = {"limit": 3, "sort": "-product_name"}
+    monkeypatch.setattr(settings, "fast_json_responses", False)
+    slow = client.get("/product-orders/", params=params)
+    monkeypatch.setattr(settings, "fast_json_responses", True)
+    fast = client.get("/product-orders/", params=params)
+
+    assert fast.status_code == 200
+    assert fast.json() == slow.json()
+    assert fast.headers["etag"] == slow.headers["etag"]
+    assert fast.headers["x-next-cursor"] == slow.headers["x-next-cursor"]
+
+
+# orjson과 표준 json 대체 경로의 출력 형식 일치
+def test_fast_json_response_renders_compact_utf8() -> None:
+    body = FastJSONResponse([{"name": "상품", "remark": None}]).body
+
+    assert body == '[{"name":"상품","remark":null}]'.encode()
@@ -0,0 +1,25 @@
+"""Cold-start import budget for `main` (see benchmarks/import_time.py)."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.core.lazy import require
+from benchmarks.import_time import IMPORT_BUDGET_MS, profile_import
+
+
+# AI/벡터 의존성은 기동 시 불러오지 않고, 전체 import 시간은 예산 안에 있어야 합니다.
+def test_main_import_stays_lazy_and_within_budget() -> None:
+    profile = profile_import("main")
+    budget_ms = float(os.getenv("IMPORT_TIME_BUDGET_MS", IMPORT_BUDGET_MS))
+
+    assert profile.eager_heavy_modules() == []
+    assert profile.total_us / 1000 <= budget_ms
+
+
+# 설치되지 않은 의존성은 설치할 패키지 이름과 함께 실패
+def test_require_reports_missing_package() -> None:
+    assert require("json").dumps([]) == "[]"
+    with pytest.raises(ImportError, match="install 'not-installed-pkg'"):
+        require("not_installed_pkg.sub")
@@ -0,0 +1,360 @@
+"""Streaming ingestion tests with fake embeddings and an in-memory vector sink."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.services.ingestion import (
+    Checkpoint,
+    DocumentIngestor,
+    ManifestStore,
+    chunk_id,
+    prefetch,
+    source_key,
+)
+from benchmarks.pdf_extract import write_sample_pdf
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+class LineSplitter:
+    """One chunk per non-empty line; counts chunks produced so far."""
+
+    def __init__(self) -> None:
+        self.produced = 0
+
+    def split_text(self, text: str) -> list[str]:
+        lines = [line for line in text.splitlines() if line.strip()]
+        self.produced += len(lines)
+        return lines
+
+
+class FakeEmbeddings:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class MemorySink:
+    """Upserts by id; records how many chunks were in flight at each write."""
+
+    def __init__(self, splitter: LineSplitter, fail_on_call: int | None = None) -> None:
+        self.splitter = splitter
+        self.fail_on_call = fail_on_call
+        self.rows: dict[str, tuple[str, list[float], dict]] = {}
+        self.calls = 0
+        self.deletes: list[list[str]] = []
+        self.max_in_flight = 0
+
+    def add_embeddings(self, texts, embeddings, metadatas=None, ids=None, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("vector store went away")
+        in_flight = self.splitter.produced - len(self.rows)
+        self.max_in_flight = max(self.max_in_flight, in_flight)
+        for row in zip(ids, texts, embeddings, metadatas):
+            self.rows[row[0]] = row[1:]
+        return ids
+
+    def delete(self, ids=None, **kwargs):
+        self.deletes.append(list(ids))
+        for identifier in ids:
+            del self.rows[identifier]
+
+
+def _write_texts(directory: Path, files: int, lines: int) -> None:
+    directory.mkdir()
+    for number in range(files):
+        body = "\n".join(f"file {number} line {line}" for line in range(lines))
+        (directory / f"doc{number}.txt").write_text(body, encoding="utf-8")
+
+
+def _ingestor(
+    sink, splitter, checkpoint: Checkpoint | None = None, embeddings=None, manifest=None
+):
+    return DocumentIngestor(
+        sink,
+        embeddings or FakeEmbeddings(),
+        splitter,
+        checkpoint=checkpoint,
+        embed_batch_size=16,
+        embed_concurrency=2,
+        upsert_batch_size=40,
+        prefetch=2,
+        manifest=manifest,
+    )
+
+
+# 청크를 만들어 둔 채 쌓아 두지 않습니다: 처리 중인 청크 수는 배치 크기로 제한됩니다.
+def test_ingestion_streams_with_bounded_memory(tmp_path: Path, monkeypatch) -> None:
+    # 텍스트 파일을 25~50줄짜리 "페이지"로 나눠 읽게 합니다.
+    monkeypatch.setattr("app.services.ingestion.TEXT_PAGE_CHARS", 400)
+    _write_texts(tmp_path / "docs", files=5, lines=400)
+    splitter = LineSplitter()
+    sink = MemorySink(splitter)
+
+    stats = _ingestor(sink, splitter).run([tmp_path / "docs"])
+
+    assert len(sink.rows) == 2000
+    # 쓰기 배치 + 큐의 임베딩 배치 2개 + 임베딩 중이거나 기다리는 배치 3개
+    # + 채우는 중인 배치 + 분할 중인 한 페이지
+    assert sink.max_in_flight <= 40 + 16 * (2 + 3 + 1) + 50
+    assert stats.stages["embed"].items == stats.stages["upsert"].items == 2000
+    assert stats.stages["load"].items > 5 * 10
+    assert stats.as_dict()["stages"]["split"]["items"] == 2000
+    text, vector, metadata = sink.rows[chunk_id(source_key(tmp_path / "docs" / "doc3.txt"), 2, 1)]
+    assert text.startswith("file 3 line ")
+    assert metadata == {"source": "doc3.txt", "page": 2, "chunk": 1}
+    assert vector == [float(len(text)), 1.0]
+
+
+class SlowEmbeddings(FakeEmbeddings):
+    """Takes 20 ms per call and records how many calls overlapped."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return super().embed_documents(texts)
+
+
+# 마이크로배치를 동시에 임베딩하면서도 쓰기 순서와 벡터 짝은 그대로입니다.
+def test_micro_batches_are_embedded_concurrently(tmp_path: Path) -> None:
+    _write_texts(tmp_path / "docs", files=2, lines=100)
+    splitter = LineSplitter()
+    sink = MemorySink(splitter)
+    embeddings = SlowEmbeddings()
+    ingestor = _ingestor(sink, splitter, Checkpoint(tmp_path / "c.json"), embeddings)
+    ingestor.embed_concurrency = 4
+
+    stats = ingestor.run([tmp_path / "docs"])
+
+    assert embeddings.max_running > 1
+    assert len(sink.rows) == 200 and stats.stages["embed"].items == 200
+    assert all(vector == [float(len(text)), 1.0] for text, vector, _ in sink.rows.values())
+
+
+# 쓰기 실패 후 다시 실행하면 마지막으로 커밋된 청크 다음부터 이어서 적재합니다.
+def test_ingestion_resumes_from_last_committed_chunk(tmp_path: Path) -> None:
+    _write_texts(tmp_path / "docs", files=3, lines=50)
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    splitter = LineSplitter()
+    failing = MemorySink(splitter, fail_on_call=3)
+    with pytest.raises(ConnectionError):
+        _ingestor(failing, splitter, Checkpoint(checkpoint_path)).run([tmp_path / "docs"])
+    saved = json.loads(checkpoint_path.read_text(encoding="utf-8"))["sources"]
+    assert [entry["done"] for entry in saved.values()] == [True, False]
+
+    embeddings = FakeEmbeddings()
+    resumed = MemorySink(LineSplitter())
+    resumed.rows = dict(failing.rows)
+    stats = _ingestor(resumed, LineSplitter(), Checkpoint(checkpoint_path), embeddings).run(
+        [tmp_path / "docs"]
+    )
+
+    assert len(resumed.rows) == 150
+    assert len(embeddings.texts) == 150 - 80
+    assert stats.skipped_sources == 1 and stats.skipped_chunks == 30
+
+    again = _ingestor(resumed, LineSplitter(), Checkpoint(checkpoint_path)).run([tmp_path / "docs"])
+    assert again.skipped_sources == 3 and again.stages["embed"].items == 0
+
+
+# 같은 파일을 상대 경로, ./ 경로, 절대 경로로 적재해도 같은 문서로 봅니다.
+def test_path_spelling_does_not_duplicate_chunks(tmp_path: Path, monkeypatch) -> None:
+    _write_texts(tmp_path / "docs", files=2, lines=10)
+    monkeypatch.chdir(tmp_path)
+    checkpoint_path = tmp_path / "checkpoint.json"
+    sink = MemorySink(LineSplitter())
+    _ingestor(sink, LineSplitter(), Checkpoint(checkpoint_path)).run(["docs"])
+
+    # 체크포인트가 없어도 같은 id로 덮어써서 행이 늘지 않습니다.
+    _ingestor(sink, LineSplitter()).run(["./docs"])
+    stats = _ingestor(sink, LineSplitter(), Checkpoint(checkpoint_path)).run([tmp_path / "docs"])
+
+    assert len(sink.rows) == 20
+    assert stats.skipped_sources == 2 and stats.stages["embed"].items == 0
+    saved = json.loads(checkpoint_path.read_text(encoding="utf-8"))["sources"]
+    assert sorted(saved) == [source_key(tmp_path / "docs" / f"doc{n}.txt") for n in range(2)]
+
+    # 기준 디렉터리를 주면 그 아래 상대 경로가 키가 되어 트리를 옮겨도 유지됩니다.
+    assert source_key(Path("docs/doc0.txt"), root=tmp_path) == "docs/doc0.txt"
+    assert source_key(Path("docs/doc0.txt"), root=tmp_path / "other").startswith("/")
+
+
+# 파일이 바뀌면 체크포인트를 무시하고 처음부터 다시 적재합니다.
+def test_changed_source_is_ingested_again(tmp_path: Path) -> None:
+    _write_texts(tmp_path / "docs", files=1, lines=10)
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json")
+    splitter = LineSplitter()
+    _ingestor(MemorySink(splitter), splitter, checkpoint).run([tmp_path / "docs"])
+
+    (tmp_path / "docs" / "doc0.txt").write_text("rewritten\nfile", encoding="utf-8")
+    splitter = LineSplitter()
+    sink = MemorySink(splitter)
+    stats = _ingestor(sink, splitter, checkpoint).run([tmp_path / "docs"])
+
+    assert stats.skipped_sources == 0
+    assert sorted(text for text, _, _ in sink.rows.values()) == ["file", "rewritten"]
+
+
+# 증분 재적재: 바뀐 청크만 임베딩하고, 사라진 청크는 한 번에 지웁니다.
+def test_incremental_reingest_embeds_only_changed_chunks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("app.services.ingestion.TEXT_PAGE_CHARS", 400)
+    _write_texts(tmp_path / "docs", files=2, lines=300)
+    manifest = ManifestStore.for_path(tmp_path / "manifest.sqlite3", "manuals")
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json")
+    sink = MemorySink(LineSplitter())
+    first = _ingestor(sink, LineSplitter(), checkpoint, manifest=manifest).run([tmp_path / "docs"])
+    assert len(sink.rows) == 600 and first.stages["embed"].items == 600
+
+    manual = tmp_path / "docs" / "doc1.txt"
+    lines = manual.read_text(encoding="utf-8").splitlines()
+    lines[100] = "file 1 line 100 (revised)"
+    del lines[200]
+    lines.append("file 1 appendix")
+    manual.write_text("\n".join(lines), encoding="utf-8")
+
+    embeddings = FakeEmbeddings()
+    stats = _ingestor(sink, LineSplitter(), checkpoint, embeddings, manifest).run(
+        [tmp_path / "docs"]
+    )
+
+    # 줄을 지운 페이지에서는 뒤따르는 줄의 위치만 바뀌어 메타데이터 때문에 다시 씁니다.
+    assert set(embeddings.texts) >= {"file 1 line 100 (revised)", "file 1 appendix"}
+    assert stats.skipped_sources == 1
+    assert stats.moved_chunks == len(embeddings.texts) - 2 < 50
+    assert stats.unchanged_chunks == len(lines) - 2 - stats.moved_chunks
+    assert stats.deleted_chunks == 2
+    assert sink.deletes and len(sink.deletes) == 1
+    texts = [text for text, _, metadata in sink.rows.values() if metadata["source"] == "doc1.txt"]
+    assert sorted(texts) == sorted(lines)
+    assert len(manifest.load(source_key(manual))) == len(lines)
+
+
+# 증분 모드에서도 다른 경로 표기로 다시 적재하면 같은 문서로 보고 바뀐 청크만 씁니다.
+def test_incremental_reingest_under_other_path_spelling(tmp_path: Path, monkeypatch) -> None:
+    _write_texts(tmp_path / "docs", files=1, lines=20)
+    monkeypatch.chdir(tmp_path)
+    manifest = ManifestStore.for_path(tmp_path / "manifest.sqlite3", "manuals")
+    sink = MemorySink(LineSplitter())
+    _ingestor(sink, LineSplitter(), manifest=manifest).run(["docs"])
+
+    manual = tmp_path / "docs" / "doc0.txt"
+    lines = manual.read_text(encoding="utf-8").splitlines()
+    lines[5] = "file 0 line 5 (revised)"
+    manual.write_text("\n".join(lines), encoding="utf-8")
+    embeddings = FakeEmbeddings()
+    stats = _ingestor(sink, LineSplitter(), embeddings=embeddings, manifest=manifest).run(
+        [tmp_path / "docs"]
+    )
+
+    assert len(sink.rows) == 20
+    assert embeddings.texts == ["file 0 line 5 (revised)"]
+    assert stats.unchanged_chunks == 19 and stats.deleted_chunks == 1
+
+
+# PDF는 페이지 단위로 추출하고 페이지 번호를 메타데이터로 남깁니다.
+def test_pdf_pages_are_streamed(tmp_path: Path) -> None:
+    pytest.importorskip("pypdf")
+    pdf_path = write_sample_pdf(tmp_path / "manual.pdf", 3, lines_per_page=1)
+
+    splitter = LineSplitter()
+    sink = MemorySink(splitter)
+    _ingestor(sink, splitter).run([pdf_path])
+
+    rows = sorted(sink.rows.values(), key=lambda row: row[2]["page"])
+    assert [(text, metadata["page"]) for text, _, metadata in rows] == [
+        ("page 1 line 0 lorem ipsum dolor sit amet", 1),
+        ("page 2 line 0 lorem ipsum dolor sit amet", 2),
+        ("page 3 line 0 lorem ipsum dolor sit amet", 3),
+    ]
+
+
+# Postgres 매니페스트: 같은 청크를 다시 쓰면 위치만 갱신됩니다.
+@pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+def test_postgres_manifest_roundtrip() -> None:
+    from app.db.bootstrap import migrate
+    from app.db.session import engine
+    from app.services.ingestion import Chunk
+
+    migrate(engine)
+    manifest = ManifestStore(engine, f"test-{uuid.uuid4().hex[:8]}")
+    source = "docs/manual.pdf"
+    chunk = Chunk("chunk-a", Path(source), source, "1:1", 3, 0, "본문", digest=b"\x01" * 32)
+
+    manifest.put([chunk])
+    chunk.page = 4
+    manifest.put([chunk])
+    assert manifest.load(source) == {"chunk-a": (b"\x01" * 32, 4, 0)}
+
+    assert not manifest.is_empty()
+
+    manifest.delete(source, ["chunk-a"])
+    assert manifest.load(source) == {}
+    assert manifest.is_empty()
+
+
+# 매니페스트 없이 채운 컬렉션에는 증분 모드를 거부하고, --recreate로 한 번 다시 만들게 합니다.
+@pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+def test_incremental_refuses_collection_without_manifest() -> None:
+    pytest.importorskip("langchain_postgres")
+    from app.db.bootstrap import migrate
+    from app.db.session import engine
+    from app.services.ingestion import _has_vectors, build_ingestor
+
+    migrate(engine)
+    collection = f"test-{uuid.uuid4().hex[:8]}"
+    splitter = LineSplitter()
+    ingestor = build_ingestor(collection, splitter=splitter)
+    try:
+        ingestor.sink.add_embeddings(["본문"], [[0.1, 0.2]], metadatas=[{}], ids=["chunk-a"])
+        with pytest.raises(ValueError, match="recreate"):
+            build_ingestor(collection, incremental=True, splitter=splitter)
+
+        rebuilt = build_ingestor(collection, incremental=True, recreate=True, splitter=splitter)
+        assert rebuilt.manifest is not None
+        assert not _has_vectors(rebuilt.sink, engine)
+    finally:
+        ingestor.sink.delete_collection()
+
+
+# 소비자가 실패하면 미리 읽던 생산자 스레드도 멈춥니다.
+def test_prefetch_propagates_errors_and_stops_producer() -> None:
+    produced = []
+
+    def numbers():
+        for number in range(1000):
+            produced.append(number)
+            yield number
+
+    stream = prefetch(numbers(), depth=2)
+    assert [next(stream), next(stream)] == [0, 1]
+    stream.close()
+    assert len(produced) <= 5
+
+    def failing():
+        yield 1
+        raise ValueError("broken page")
+
+    with pytest.raises(ValueError, match="broken page"):
+        list(prefetch(failing(), depth=2))
@@ -0,0 +1,61 @@
+"""Load-test harness tests (see benchmarks/load_test.py)."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from benchmarks.load_test import SCENARIOS, compare, main, percentile, run, summarize
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+# nearest-rank 백분위수와 처리량 계산
+def test_summarize_percentiles() -> None:
+    summary = summarize([float(ms) for ms in range(100, 0, -1)], errors=2, elapsed_s=2.0)
+
+    assert percentile([], 99) == 0.0
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert summary["max_ms"] == 100.0
+    assert summary["rps"] == 50.0
+    assert summary["errors"] == 2
+    assert "rows_per_s" not in summary
+    assert summarize([1.0], 0, 1.0, rows_per_request=100)["rows_per_s"] == 100.0
+
+
+# 두 실행 결과를 시나리오별로 비교하고, 한쪽에만 있는 시나리오는 건너뜁니다.
+def test_compare_reports_relative_change(tmp_path) -> None:
+    def result(rps: float, p99: float) -> dict:
+        summary = {"rps": rps, "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": p99}
+        return {"scenarios": {"order-read": summary}}
+
+    before, after = result(100.0, 10.0), result(150.0, 5.0)
+    after["scenarios"]["order-list"] = after["scenarios"]["order-read"]
+    lines = compare(before, after)
+
+    assert len(lines) == 2
+    assert "+50.0%" in lines[1] and "-50.0%" in lines[1]
+
+    paths = []
+    for name, data in (("before", before), ("after", after)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(data))
+        paths.append(str(path))
+    assert main(["compare", *paths]) == 0
+
+
+# 모든 CRUD·벌크 시나리오가 인프로세스로 오류 없이 돌고 결과에 설정·커밋 정보가 남습니다.
+@pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+def test_run_all_scenarios_in_process() -> None:
+    result = asyncio.run(
+        run(list(SCENARIOS), requests=6, warmup=2, concurrency=3, bulk_size=5)
+    )
+
+    assert result["meta"]["target"] == "in-process"
+    assert "db_async_mode" in result["meta"]["settings"]
+    assert set(result["scenarios"]) == set(SCENARIOS)
+    for name, summary in result["scenarios"].items():
+        assert summary["requests"] == 6, name
+        assert summary["errors"] == 0, name
@@ -0,0 +1,82 @@
+"""Filtered product order search tests (in-memory SQLite)."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.pagination import InvalidCursor
+from app.db.base import Base
+from app.models.product_order import ProductOrder
+from app.schemas.product_order import ProductOrderFilter
+from app.services import product_order as service
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.add_all(
+            ProductOrder(
+                order_number=f"N{i}",
+                product_name=name,
+                shipping_address=f"Seoul {i}",
+                shipping_status="returned" if i % 3 == 0 else "delivered",
+            )
+            for i, name in enumerate(
+                ["desk", "desk_lamp", "deskXlamp", "chair", "lamp", "sofa", "desk 50%"]
+            )
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _names(orders) -> list[str]:
+    return [order.product_name for order in orders]
+
+
+# 접두어/포함 검색은 %, _ 를 문자 그대로 취급
+def test_like_filters_escape_wildcards(db: Session) -> None:
+    by_prefix = service.list_orders(db, filters=ProductOrderFilter(product_name_prefix="desk_"))
+    by_contains = service.list_orders(db, filters=ProductOrderFilter(product_name_contains="0%"))
+
+    assert _names(by_prefix) == ["desk_lamp"]
+    assert _names(by_contains) == ["desk 50%"]
+
+
+# 필터 + 정렬 조합을 커서로 끝까지 순회
+def test_keyset_pages_follow_sort(db: Session) -> None:
+    filters = ProductOrderFilter(product_name_prefix="desk", sort="-product_name")
+    page = service.list_orders_after(db, None, limit=2, filters=filters)
+    seen = list(page)
+    while len(page) == 2:
+        cursor = service.encode_order_cursor(page[-1], filters.sort)
+        after = service.decode_order_cursor(cursor, filters.sort)
+        page = service.list_orders_after(db, after, limit=2, filters=filters)
+        seen += page
+
+    assert _names(seen) == ["desk_lamp", "deskXlamp", "desk 50%", "desk"]
+
+
+# 다른 정렬로 발급된 커서 거부
+def test_cursor_is_bound_to_sort(db: Session) -> None:
+    order = service.list_orders(db, limit=1)[0]
+    cursor = service.encode_order_cursor(order, "product_name")
+
+    assert service.decode_order_cursor(cursor, "product_name") == [order.product_name, order.id]
+    with pytest.raises(InvalidCursor):
+        service.decode_order_cursor(cursor, "id")
+
+
+# 기본 목록 조회는 ORM 인스턴스를 만들지 않고 Row 튜플만 반환
+def test_list_orders_skips_identity_map(db: Session) -> None:
+    db.expunge_all()
+    rows = service.list_orders(db, filters=ProductOrderFilter(sort="product_name"))
+
+    assert len(db.identity_map) == 0
+    assert not isinstance(rows[0], ProductOrder)
+    assert rows[0].product_name == "chair"
+    entities = service.list_orders(db, projected=False)
+    assert isinstance(entities[0], ProductOrder)
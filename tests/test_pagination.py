@@ -0,0 +1,40 @@
+"""Signed keyset cursor tests."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.services.customer import decode_customer_cursor, encode_customer_cursor
+from app.models.customer import Customer
+
+
+# 커서 왕복 인코딩
+def test_cursor_round_trip() -> None:
+    token = encode_cursor("product_order", [42])
+    assert decode_cursor(token, "product_order") == [42]
+
+
+# 변조된 커서 거부
+def test_cursor_rejects_tampering() -> None:
+    token = encode_cursor("product_order", [42])
+    forged = encode_cursor("product_order", [43]).split(".")[0]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(f"{forged}.{token.split('.')[1]}", "product_order")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "product_order")
+
+
+# 다른 리소스의 커서 거부
+def test_cursor_rejects_other_resource() -> None:
+    token = encode_cursor("product_order", [42])
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "customer")
+
+
+# 고객 커서는 (created_at, id) 키를 보존
+def test_customer_cursor_keeps_timestamp_precision() -> None:
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    token = encode_customer_cursor(Customer(id=7, created_at=created_at))
+    assert decode_customer_cursor(token) == (created_at, 7)
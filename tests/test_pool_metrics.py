@@ -0,0 +1,66 @@
+"""Connection pool instrumentation tests (no external database required)."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import Histogram
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class
+
+
+@pytest.fixture
+def instrumented_engine(tmp_path):
+    metrics = PoolMetrics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    metrics.attach(engine)
+    try:
+        yield engine, metrics
+    finally:
+        engine.dispose()
+
+
+# 히스토그램 누적 버킷 계산
+def test_histogram_cumulative_buckets() -> None:
+    histogram = Histogram(buckets=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 56.5
+    assert snapshot["buckets"] == {"1": 2, "10": 3, "+Inf": 4}
+
+
+# 체크아웃/체크인 카운터와 대기 시간 기록
+def test_pool_metrics_counts_checkouts(instrumented_engine) -> None:
+    engine, metrics = instrumented_engine
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["checkouts"] == 3
+    assert snapshot["checkins"] == 3
+    assert snapshot["connects"] == 1
+    assert snapshot["checked_out"] == 0
+    assert snapshot["wait_ms"]["count"] == 3
+    assert snapshot["checkout_ms"]["count"] == 3
+
+
+# 풀 고갈 시 타임아웃 카운트
+def test_pool_metrics_counts_timeouts(instrumented_engine) -> None:
+    engine, metrics = instrumented_engine
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["timeouts"] == 1
+    assert snapshot["checked_out"] == 0
@@ -0,0 +1,73 @@
+"""Bulk product order endpoints: per-item result mapping and API round trip."""
+from __future__ import annotations
+
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.product_order import ProductOrderBulkUpdate, ProductOrderCreate
+from app.services.product_order import (
+    bulk_create_results,
+    bulk_delete_results,
+    bulk_update_results,
+)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+def _order_in(order_number: str) -> ProductOrderCreate:
+    return ProductOrderCreate(
+        order_number=order_number,
+        product_name="keyboard",
+        shipping_address="Seoul",
+        shipping_status="pending",
+    )
+
+
+def _row(order_id: int, order_number: str) -> SimpleNamespace:
+    return SimpleNamespace(id=order_id, **_order_in(order_number).model_dump())
+
+
+# RETURNING 결과를 요청 순서대로 항목별 결과에 매핑
+def test_bulk_create_results_marks_conflicts_and_batch_duplicates() -> None:
+    orders_in = [_order_in("A"), _order_in("B"), _order_in("A")]
+    results = bulk_create_results(orders_in, [_row(1, "A")])
+
+    assert [result.status for result in results] == ["created", "conflict", "conflict"]
+    assert results[0].order.order_number == "A"
+
+
+def test_bulk_update_and_delete_results_report_missing_ids() -> None:
+    items = [ProductOrderBulkUpdate(id=1, remark="x"), ProductOrderBulkUpdate(id=2)]
+    updated = bulk_update_results(items, [_row(2, "B")])
+    deleted = bulk_delete_results([1, 2], [1])
+
+    assert [result.status for result in updated] == ["not_found", "updated"]
+    assert [result.status for result in deleted] == ["deleted", "not_found"]
+
+
+@pytest.mark.skipif(not DATABASE_URL, reason="requires DATABASE_URL")
+# 벌크 생성/수정/삭제 API 왕복
+def test_bulk_endpoints_round_trip() -> None:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    prefix = uuid.uuid4().hex[:8]
+    payload = [_order_in(f"{prefix}-{i}").model_dump() for i in range(3)]
+    with TestClient(app) as client:
+        created = client.post("/product-orders/bulk", json=payload + payload[:1]).json()
+        assert [item["status"] for item in created] == ["created"] * 3 + ["conflict"]
+
+        ids = [item["id"] for item in created[:3]]
+        updated = client.patch(
+            "/product-orders/bulk",
+            json=[{"id": ids[0], "shipping_status": "shipped"}],
+        ).json()
+        assert updated[0]["order"]["shipping_status"] == "shipped"
+        assert updated[0]["order"]["product_name"] == "keyboard"
+
+        deleted = client.request("DELETE", "/product-orders/bulk", json=ids).json()
+        assert {item["status"] for item in deleted} == {"deleted"}
@@ -0,0 +1,105 @@
+"""Request / per-route stack-sampling profiler tests."""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import ProfilingMiddleware
+from app.core.config import settings
+from app.core.profiling import (
+    RouteProfiler,
+    capture_stack,
+    categorize,
+    folded,
+    is_idle,
+    to_speedscope,
+)
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+# 스택은 바깥→안쪽 순서이고, 가장 안쪽의 라이브러리 프레임으로 분류합니다.
+def test_capture_and_categorize_stack() -> None:
+    stack = capture_stack(sys._getframe())
+
+    assert stack[-1][0] == "test_capture_and_categorize_stack"
+    assert not is_idle(stack)
+    app_frame = ("main", "/app/x.py", 1)
+    orm_frame = ("execute", "/site/sqlalchemy/a.py", 1)
+    db_frame = ("send", "/site/psycopg/c.py", 1)
+    assert categorize((app_frame, orm_frame)) == "orm"
+    assert categorize((app_frame, orm_frame, db_frame)) == "db"
+    assert categorize((app_frame,)) == "app"
+    assert is_idle((("run", "/lib/threading.py", 1), ("get", "/lib/queue.py", 1)))
+
+
+# speedscope 파일은 프레임을 공유하고 샘플 수 x 간격을 가중치로 씁니다.
+def test_speedscope_document_shares_frames() -> None:
+    a, b = ("a", "/x.py", 1), ("b", "/x.py", 5)
+    profiles = {"t1": Counter({(a, b): 3}), "t2": Counter({(a,): 1})}
+    document = to_speedscope(profiles, "req", interval_s=0.001)
+
+    assert document["shared"]["frames"] == [
+        {"name": "a", "file": "/x.py", "line": 1},
+        {"name": "b", "file": "/x.py", "line": 5},
+    ]
+    assert document["profiles"][0]["samples"] == [[0, 1]]
+    assert document["profiles"][0]["weights"] == [0.003]
+    assert document["profiles"][1]["samples"] == [[0]]
+    assert folded(Counter({(a, b): 2})).strip() == "a (/x.py:1);b (/x.py:5) 2"
+
+
+# 토큰이 맞는 X-Profile 요청만 샘플링하고, 저장한 id를 응답 헤더로 돌려줍니다.
+def test_profiling_middleware_stores_speedscope(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/slow")
+    def slow() -> dict[str, bool]:
+        _busy(0.05)
+        return {"ok": True}
+
+    with TestClient(app) as client:
+        assert "x-profile-id" not in client.get("/slow").headers
+        assert "x-profile-id" not in client.get("/slow", headers={"X-Profile": "nope"}).headers
+        response = client.get("/slow", headers={"X-Profile": "secret"})
+
+    profile_id = response.headers["x-profile-id"]
+    document = json.loads((tmp_path / f"{profile_id}.speedscope.json").read_text())
+    assert document["name"].startswith("GET /slow ")
+    names = {frame["name"] for frame in document["shared"]["frames"]}
+    assert {"slow", "_busy"} <= names
+
+
+# 상시 샘플링은 엔드포인트 함수가 스택에 있는 샘플을 해당 라우트로 묶습니다.
+def test_route_profiler_attributes_samples_to_endpoint() -> None:
+    def endpoint() -> None:
+        _busy(0.1)
+
+    profiler = RouteProfiler()
+    profiler.register_endpoints([(endpoint, "GET /busy")])
+    profiler.start(0.002)
+    worker = threading.Thread(target=endpoint)
+    worker.start()
+    worker.join()
+    profiler.stop()
+
+    summary = profiler.summary()
+    assert summary["GET /busy"]["samples"] > 0
+    assert summary["GET /busy"]["categories"] == {"app": summary["GET /busy"]["samples"]}
+    assert all(
+        any(frame[0] == "endpoint" for frame in stack) for stack in profiler.stacks("GET /busy")
+    )
@@ -0,0 +1,154 @@
+"""Prometheus exposition and multi-worker aggregation tests."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import MetricsMiddleware
+from app.api.routers.metrics import router as metrics_router
+from app.core.config import settings
+from app.core.prometheus import MetricFamilies, SnapshotStore, merge, render, request_metrics
+from app.services.metrics_export import run_metrics_flusher
+
+
+def _worker(requests: int, in_flight: int, latency: float) -> dict:
+    out = MetricFamilies()
+    out.add("http_requests_total", "counter", "Requests.", requests, route="/a", status="200")
+    out.add("http_requests_in_flight", "gauge", "In flight.", in_flight)
+    out.add(
+        "http_request_duration_seconds",
+        "histogram",
+        "Latency.",
+        {"count": 1, "sum": latency, "buckets": {"0.1": int(latency <= 0.1), "+Inf": 1}},
+        route="/a",
+    )
+    out.add("cache_server_evicted_keys", "gauge", "Evicted.", requests, agg="max")
+    return out.families
+
+
+# 워커별 스냅샷을 합산: 카운터·게이지·히스토그램 버킷은 더하고, 서버 전역 값은 최댓값
+def test_merge_sums_workers():
+    text = render(merge([_worker(3, 1, 0.05), _worker(4, 2, 0.5)]))
+
+    assert 'http_requests_total{route="/a",status="200"} 7' in text
+    assert "http_requests_in_flight 3" in text
+    assert 'http_request_duration_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'http_request_duration_seconds_bucket{route="/a",le="+Inf"} 2' in text
+    assert 'http_request_duration_seconds_count{route="/a"} 2' in text
+    assert "cache_server_evicted_keys 4" in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+
+
+# 라벨 값의 따옴표·역슬래시·줄바꿈은 이스케이프합니다.
+def test_render_escapes_label_values():
+    out = MetricFamilies()
+    out.add("x_total", "counter", "X.", 1, route='a"b\\c\nd')
+
+    assert 'x_total{route="a\\"b\\\\c\\nd"} 1' in render(out.families)
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+# 종료된 워커의 오래된 파일은 지우되, 카운터·히스토그램은 합산본에 남기고 게이지만 버립니다.
+def test_snapshot_store_folds_dead_workers(tmp_path):
+    store = SnapshotStore(tmp_path, stale_after=30)
+    store.write(_worker(1, 0, 0.01))
+    stale = tmp_path / f"worker-{_dead_pid()}.json"
+    stale.write_text(json.dumps(_worker(100, 5, 0.01)))
+    old = time.time() - 60
+    os.utime(stale, (old, old))
+
+    text = render(merge(store.read_all()))
+
+    assert not stale.exists()
+    assert 'http_requests_total{route="/a",status="200"} 101' in text
+    assert 'http_request_duration_seconds_count{route="/a"} 2' in text
+    assert "http_requests_in_flight 0" in text
+    assert "cache_server_evicted_keys 1" in text
+
+
+# 워커가 바뀌어도 전체 카운터는 줄지 않습니다(Prometheus rate()가 리셋으로 보지 않게).
+def test_counters_survive_worker_recycling(tmp_path):
+    first = SnapshotStore(tmp_path, stale_after=30)
+    first.write(_worker(7, 2, 0.01))
+    first.retire()
+    second = SnapshotStore(tmp_path, stale_after=30)
+    second.path = tmp_path / "worker-2.json"
+    second.write(_worker(3, 1, 0.01))
+    second.retire()
+
+    text = render(merge(first.read_all()))
+
+    assert 'http_requests_total{route="/a",status="200"} 10' in text
+    assert "http_requests_in_flight" not in text
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["aggregate.json"]
+
+
+# 기록이 밀렸을 뿐 살아 있는 워커의 파일은 합산본으로 옮기지 않습니다(이중 집계 방지).
+def test_stale_but_alive_worker_is_kept(tmp_path):
+    store = SnapshotStore(tmp_path, stale_after=30)
+    store.write(_worker(4, 1, 0.01))
+    old = time.time() - 60
+    os.utime(store.path, (old, old))
+
+    assert len(store.read_all()) == 1
+    assert store.path.exists() and not store.aggregate_path.exists()
+
+
+# 미들웨어는 라우트 템플릿 기준으로 집계하고, /metrics는 다른 워커 파일까지 합산합니다.
+def test_metrics_endpoint_aggregates_worker_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_dir", str(tmp_path))
+    other = tmp_path / "worker-999999.json"
+    other.write_text(json.dumps(_worker(5, 0, 0.01)))
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    before = request_metrics.in_flight
+    with TestClient(app) as client:
+        client.get("/items/1")
+        client.get("/items/2")
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'route="/items/{item_id}",status="200"} 2' in text
+    # 다른 워커의 카운터가 함께 노출됩니다.
+    assert 'http_requests_total{route="/a",status="200"} 5' in text
+    assert "threadpool_threads_limit" in text
+    assert "db_pool_size" in text
+    assert request_metrics.in_flight == before
+    assert (tmp_path / f"worker-{os.getpid()}.json").exists()
+
+
+# 워커가 정상 종료하면 마지막 카운터를 합산본에 남기고 자기 파일을 지웁니다.
+def test_flusher_retires_worker_on_shutdown(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_dir", str(tmp_path))
+
+    async def run_briefly() -> None:
+        task = asyncio.create_task(run_metrics_flusher(0.01))
+        await asyncio.sleep(0.1)
+        assert (tmp_path / f"worker-{os.getpid()}.json").exists()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run_briefly())
+
+    assert not (tmp_path / f"worker-{os.getpid()}.json").exists()
+    aggregate = json.loads((tmp_path / "aggregate.json").read_text(encoding="utf-8"))
+    assert "http_requests_in_flight" not in aggregate
+    assert all(family["type"] != "gauge" for family in aggregate.values())
@@ -0,0 +1,64 @@
+"""Per-request SQL instrumentation tests (in-memory SQLite)."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.api.middleware import DBStatsMiddleware
+from app.core.config import settings
+from app.db.query_stats import attach_query_stats, route_db_metrics
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    attach_query_stats(engine)
+    app = FastAPI()
+    app.add_middleware(DBStatsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, repeat: int = 1) -> dict[str, int]:
+        with engine.connect() as conn:
+            for _ in range(repeat):
+                conn.execute(text("SELECT :id"), {"id": item_id})
+        return {"id": item_id}
+
+    yield TestClient(app)
+    engine.dispose()
+
+
+def _timing(header: str) -> dict[str, str]:
+    return {part.split(";")[0].strip(): part for part in header.split(",")}
+
+
+# 동기 라우트(스레드풀)에서 실행된 SQL도 요청 단위로 집계
+def test_server_timing_counts_statements(client) -> None:
+    response = client.get("/items/7", params={"repeat": 3})
+
+    timing = _timing(response.headers["server-timing"])
+    assert 'desc="3 stmt"' in timing["db"]
+    assert {"db-slowest", "db-pool", "app"} <= set(timing)
+    histograms = route_db_metrics.snapshot()["GET /items/{item_id}"]
+    assert histograms["statements"]["buckets"]["3"] >= 1
+
+
+# 문장 수 초과와 같은 SQL 반복(N+1 의심)은 경고 로그
+def test_warns_on_statement_count_and_repeats(client, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(settings, "db_statement_warn_threshold", 4)
+    monkeypatch.setattr(settings, "db_repeated_statement_warn_threshold", 5)
+
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware"):
+        client.get("/items/1", params={"repeat": 2})
+        assert caplog.records == []
+        client.get("/items/1", params={"repeat": 6})
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("issued 6 SQL statements" in message for message in messages)
+    assert any("possible N+1" in message for message in messages)